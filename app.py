@@ -4,6 +4,10 @@ Flask-based AI agent API with Azure integrations, Microsoft Graph, SharePoint, D
 Version: 1.0.0 | Updated: 2026-01-10
 """
 
+# Imported first so the startup report covers the imports below too
+from boot_profile import BootProfiler
+boot_profiler = BootProfiler()
+
 import os
 import json
 import re
@@ -11,10 +15,14 @@ import logging
 import uuid
 import sqlite3
 import hashlib
+import math
 import hmac
 import threading
 import subprocess
-from flask import Flask, request, jsonify, g, send_from_directory, redirect
+import socket
+import weakref
+import atexit
+from flask import Flask, request, jsonify, g, send_from_directory, redirect, has_request_context
 from flask_cors import CORS
 from datetime import datetime, timedelta, timezone
 import time
@@ -24,14 +32,23 @@ from functools import wraps
 from requests.exceptions import Timeout, RequestException
 from werkzeug.exceptions import HTTPException
 from werkzeug.security import generate_password_hash, check_password_hash
+from outbound_http import get_http
+from llm_cache import LLMResponseCache
+from llm_router import AllProvidersFailed, CircuitOpenError, ProviderRouter, RouterPolicy
+from rate_limiter import RateLimiter, RatePolicy, MemoryBucketBackend, SQLiteBucketBackend
+from realtime import DashboardEmitter, EventHub, format_sse
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsRegistry
+from sql_profiler import ProfiledConnection, attach as profile_connection, connect as profiled_connect, get_profiler
 try:
     import jwt as pyjwt
     PYJWT_AVAILABLE = True
 except ImportError:
     pyjwt = None
     PYJWT_AVAILABLE = False
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from io import BytesIO
+boot_profiler.mark('imports')
 
 # --- Real-time Dashboard Integration ---
 # Emit events to Lamby Command Center Socket.IO server
@@ -40,25 +57,12 @@ DASHBOARD_URL = os.environ.get('DASHBOARD_URL', 'http://localhost:3015').rstrip(
 
 def emit_to_dashboard(event_type, message, data=None):
     """
-    POST to dashboard's /api/realtime/emit endpoint.
-    Runs in background thread so it never blocks Flask.
+    Queue an event for the dashboard's /api/realtime/emit endpoint and publish it
+    to /api/stream subscribers. A single background dispatcher batches delivery
+    so this never blocks Flask.
     """
-    def _emit():
-        try:
-            resp = requests.post(
-                f"{DASHBOARD_URL}/api/realtime/emit",
-                json={"event_type": event_type, "message": message, "data": data or {}},
-                timeout=3,
-            )
-            if resp.status_code == 200:
-                logger.debug(f"[Realtime Emit] {event_type}: {message}")
-            else:
-                logger.warning(f"[Realtime Emit] Failed ({resp.status_code}): {event_type}")
-        except RequestException as e:
-            # Non-blocking: dashboard might not be running locally
-            logger.debug(f"[Realtime Emit] Dashboard unreachable: {e}")
-
-    threading.Thread(target=_emit, daemon=True).start()
+    dashboard_emitter.emit(event_type, message, data)
+    event_hub.publish(event_type, {'message': message, **(data or {})})
 
 # --- API Key Authentication Middleware ---
 INTERNAL_API_KEY = os.environ.get('INTERNAL_API_KEY', '')
@@ -79,45 +83,33 @@ def require_api_key(f):
     return decorated
 
 # --- Rate Limiting ---
-_rate_store = defaultdict(list)
+# Token buckets per (policy, client IP); see rate_limiter.py and the RATE LIMITING section below
 RATE_LIMIT_PER_MINUTE = int(os.environ.get('RATE_LIMIT_PER_MINUTE', '60'))
 
-def rate_limit(f):
-    """Decorator: limit requests per IP to prevent Claude API cost abuse."""
-    @wraps(f)
-    def decorated(*args, **kwargs):
-        ip = request.remote_addr or 'unknown'
-        now = time.time()
-        window = [t for t in _rate_store[ip] if now - t < 60]
-        if len(window) >= RATE_LIMIT_PER_MINUTE:
-            return jsonify({
-                'error': 'Rate limit exceeded. Try again in a minute.',
-                'code': 'rate_limit'
-            }), 429
-        window.append(now)
-        _rate_store[ip] = window
-        return f(*args, **kwargs)
-    return decorated
+def rate_limit(policy='default'):
+    """Decorator: limit requests per IP to prevent Claude API cost abuse.
 
-# Azure SDK imports (optional - not needed for local dev)
-try:
-    from azure.identity import DefaultAzureCredential, ClientSecretCredential
-    from azure.keyvault.secrets import SecretClient
-    AZURE_SDK_AVAILABLE = True
-except (ImportError, ModuleNotFoundError):
-    AZURE_SDK_AVAILABLE = False
-    DefaultAzureCredential = None
-    ClientSecretCredential = None
-    SecretClient = None
-
-# Application Insights
-try:
-    from opencensus.ext.azure.log_exporter import AzureLogHandler
-    from opencensus.ext.flask.flask_middleware import FlaskMiddleware
-    from opencensus.trace.samplers import ProbabilitySampler
-    APPINSIGHTS_AVAILABLE = True
-except ImportError:
-    APPINSIGHTS_AVAILABLE = False
+    Use bare (@rate_limit) for the default policy or @rate_limit('chat') for a named one.
+    """
+    def wrap(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            ip = request.remote_addr or 'unknown'
+            allowed, _, retry_after = rate_limiter.check(policy_name, ip)
+            if not allowed:
+                resp = jsonify({
+                    'error': 'Rate limit exceeded. Try again in a minute.',
+                    'code': 'rate_limit'
+                })
+                resp.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+                return resp, 429
+            return f(*args, **kwargs)
+        return decorated
+    if callable(policy):
+        policy_name = 'default'
+        return wrap(policy)
+    policy_name = policy
+    return wrap
 
 # Load environment variables
 # Detect local vs Azure: Azure App Service sets WEBSITE_SITE_NAME automatically
@@ -137,6 +129,7 @@ else:
     if os.path.exists(env_local_path):
         load_dotenv(env_local_path)
     load_dotenv(env_path)  # Won't override already-set vars from .env.local
+boot_profiler.mark('dotenv')
 
 # =============================================================================
 # APP INITIALIZATION
@@ -167,6 +160,7 @@ try:
     logger.info("Content drafts API registered at /api/content")
 except Exception as _e:
     logger.warning(f"Failed to register content_api blueprint: {_e}")
+boot_profiler.mark('flask_app')
 
 # --- Dashboard (served from Flask in production) ---
 @app.route('/dashboard')
@@ -183,11 +177,36 @@ def serve_dashboard_assets(filename):
 DEFAULT_OUTBOUND_TIMEOUT = int(os.environ.get('DEFAULT_OUTBOUND_TIMEOUT', '15'))  # seconds
 MAX_MESSAGE_LENGTH = int(os.environ.get('MAX_MESSAGE_LENGTH', '2000'))
 
+# Process-wide metrics, exposed in Prometheus text format at /metrics
+metrics_registry = MetricsRegistry()
+HTTP_REQUEST_SECONDS = metrics_registry.histogram(
+    'http_request_duration_seconds', 'Request latency by endpoint, method and status', ('endpoint', 'method', 'status'))
+HTTP_REQUESTS_IN_FLIGHT = metrics_registry.gauge('http_requests_in_flight', 'Requests currently being handled')
+SQLITE_QUERY_SECONDS = metrics_registry.histogram(
+    'sqlite_query_duration_seconds', 'SQLite statement execution time by database', ('db',),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0))
+OUTBOUND_REQUEST_SECONDS = metrics_registry.histogram(
+    'outbound_http_request_duration_seconds', 'Outbound HTTP latency by upstream host', ('host', 'method', 'status'))
+LLM_REQUESTS = metrics_registry.counter('llm_requests_total', 'LLM provider calls', ('provider', 'mode', 'outcome'))
+LLM_REQUEST_SECONDS = metrics_registry.histogram(
+    'llm_request_duration_seconds', 'LLM completion latency (whole call, or whole stream)', ('provider', 'mode'))
+LLM_TTFT_SECONDS = metrics_registry.histogram(
+    'llm_time_to_first_token_seconds', 'Streaming time to first token', ('route', 'provider'))
+LLM_TOKENS = metrics_registry.counter('llm_tokens_total', 'Tokens reported by provider usage blocks', ('provider', 'direction'))
+
+# Every SQLite statement (lead store, oil & gas, content drafts) is profiled per fingerprint
+sql_profiler = get_profiler()
+sql_profiler.route_fn = lambda: request.endpoint if has_request_context() else None
+sql_profiler.observer = lambda db, seconds: SQLITE_QUERY_SECONDS.observe(seconds, db)
+
+
 # Request ID + timing middleware
 @app.before_request
 def attach_request_id_and_timer():
     g.request_id = str(uuid.uuid4())
     g.start_time = time.time()
+    g.metrics_started = time.perf_counter()
+    HTTP_REQUESTS_IN_FLIGHT.inc()
 
 @app.after_request
 def add_request_id_header(response):
@@ -214,20 +233,35 @@ def add_request_id_header(response):
 
     logger.info(json.dumps(log_payload))
 
+    if 'metrics_started' in g:
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - g.metrics_started,
+                                     request.endpoint or 'unmatched', request.method, str(response.status_code))
+
     return response
 
+
+@app.teardown_request
+def finish_request_metrics(exc=None):
+    if g.pop('metrics_started', None) is not None:
+        HTTP_REQUESTS_IN_FLIGHT.dec()
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Application Insights integration
-if APPINSIGHTS_AVAILABLE and os.environ.get('APPLICATIONINSIGHTS_CONNECTION_STRING'):
+# Application Insights integration (opencensus is only imported when it is configured)
+if os.environ.get('APPLICATIONINSIGHTS_CONNECTION_STRING'):
     try:
+        from opencensus.ext.azure.log_exporter import AzureLogHandler
+        from opencensus.ext.flask.flask_middleware import FlaskMiddleware
+        from opencensus.trace.samplers import ProbabilitySampler
         middleware = FlaskMiddleware(app, sampler=ProbabilitySampler(rate=1.0))
         logger.addHandler(AzureLogHandler(
             connection_string=os.environ.get('APPLICATIONINSIGHTS_CONNECTION_STRING')
         ))
         logger.info("Application Insights enabled")
+    except ImportError:
+        logger.warning("APPLICATIONINSIGHTS_CONNECTION_STRING set but opencensus is not installed")
     except Exception as e:
         logger.warning(f"Application Insights setup failed: {e}")
 
@@ -261,6 +295,9 @@ class Config:
     GODADDY_LIVE_SYNC_ENABLED = os.environ.get('GODADDY_LIVE_SYNC_ENABLED', '1' if not IS_AZURE else '0') == '1'
     GODADDY_LIVE_SYNC_MAX_PAGES = max(1, int(os.environ.get('GODADDY_LIVE_SYNC_MAX_PAGES', '2')))
     GODADDY_LIVE_SYNC_PAGE_SIZE = min(max(int(os.environ.get('GODADDY_LIVE_SYNC_PAGE_SIZE', '30')), 1), 100)
+    GODADDY_LIVE_SYNC_INTERVAL = int(os.environ.get('GODADDY_LIVE_SYNC_INTERVAL', '0'))  # seconds; 0 = refresh on demand when stale
+    GODADDY_LIVE_SYNC_MAX_AGE = int(os.environ.get('GODADDY_LIVE_SYNC_MAX_AGE', '300'))
+    GODADDY_LIVE_SYNC_FULL_EVERY = int(os.environ.get('GODADDY_LIVE_SYNC_FULL_EVERY', '10'))
     GODADDY_REAMAZE_BRAND_URL = os.environ.get('GODADDY_REAMAZE_BRAND_URL', '296192a1-995f-4939-9ee8-40270af7aaa5')
     GODADDY_BROWSER_USER_DATA_DIR = os.environ.get(
         'GODADDY_BROWSER_USER_DATA_DIR',
@@ -277,12 +314,27 @@ class Config:
     _default_db_dir = '/home/data' if bool(os.environ.get('WEBSITE_SITE_NAME')) else os.path.dirname(os.path.abspath(__file__))
     LEAD_DB_PATH = os.environ.get('LEAD_DB_PATH', os.path.join(_default_db_dir, 'lead_pipeline.db'))
     OIL_GAS_LEAD_DB_PATH = os.environ.get('OIL_GAS_LEAD_DB_PATH', os.path.join(_default_db_dir, 'oil_gas_leads.db'))
+    LEAD_DB_BUSY_TIMEOUT = float(os.environ.get('LEAD_DB_BUSY_TIMEOUT', '5'))  # seconds
+    LEAD_DB_MMAP_SIZE = int(os.environ.get('LEAD_DB_MMAP_SIZE', str(64 * 1024 * 1024)))  # bytes
+    LEAD_DB_CACHE_SIZE = int(os.environ.get('LEAD_DB_CACHE_SIZE', '-16000'))  # negative = KiB
     LEAD_PROMPT_VERSION = os.environ.get('LEAD_PROMPT_VERSION', 'lead-intake-v1')
     LEAD_DRAFT_CONFIDENCE_THRESHOLD = float(os.environ.get('LEAD_DRAFT_CONFIDENCE_THRESHOLD', '0.70'))
+    LEAD_DRAFT_CONCURRENCY = int(os.environ.get('LEAD_DRAFT_CONCURRENCY', '4'))
+    LEAD_DRAFT_COMMIT_BATCH = int(os.environ.get('LEAD_DRAFT_COMMIT_BATCH', '10'))
+    LEAD_AUTO_DRAFT_BATCH = int(os.environ.get('LEAD_AUTO_DRAFT_BATCH', '40'))
     LEAD_AUTO_DRAFT_ON_INGEST = os.environ.get('LEAD_AUTO_DRAFT_ON_INGEST', '0') == '1'
+    # Webhook ingest: verify + dedupe + enqueue, return 202, process on worker threads
+    LEAD_WEBHOOK_ASYNC = os.environ.get('LEAD_WEBHOOK_ASYNC', '0') == '1'
+    LEAD_INGEST_WORKERS = max(1, int(os.environ.get('LEAD_INGEST_WORKERS', '2')))
+    LEAD_INGEST_MAX_ATTEMPTS = max(1, int(os.environ.get('LEAD_INGEST_MAX_ATTEMPTS', '5')))
+    LEAD_INGEST_RETENTION_DAYS = int(os.environ.get('LEAD_INGEST_RETENTION_DAYS', '7'))
     OUTLOOK_SENDER_UPN = os.environ.get('OUTLOOK_SENDER_UPN', '')
     OUTLOOK_FORM_WEBHOOK_TOKEN = os.environ.get('OUTLOOK_FORM_WEBHOOK_TOKEN', '')
 
+    # Google Sheets lead tracker: seconds to coalesce writes, and row-index refresh interval
+    SHEETS_FLUSH_INTERVAL = float(os.environ.get('SHEETS_FLUSH_INTERVAL', '2'))
+    SHEETS_INDEX_TTL = float(os.environ.get('SHEETS_INDEX_TTL', '300'))
+
     # Notifications
     TELEGRAM_BOT_TOKEN = os.environ.get('TELEGRAM_BOT_TOKEN', '')
     TELEGRAM_CHAT_ID = os.environ.get('TELEGRAM_CHAT_ID', '')
@@ -310,18 +362,105 @@ class Config:
 
     # Provider routing, first available key wins unless explicitly set.
     LLM_PROVIDER_ORDER = os.environ.get('LLM_PROVIDER_ORDER', 'openrouter,openai,anthropic')
+    LLM_CACHE_ENABLED = os.environ.get('LLM_CACHE_ENABLED', '1') == '1'
+    LLM_CACHE_DB_PATH = os.environ.get('LLM_CACHE_DB_PATH', os.path.join(_default_db_dir, 'llm_cache.db'))
+    LLM_CACHE_TTL = int(os.environ.get('LLM_CACHE_TTL', '86400'))
+    LLM_CACHE_MAX_ENTRIES = int(os.environ.get('LLM_CACHE_MAX_ENTRIES', '5000'))
+    LLM_TTFT_SAMPLES = int(os.environ.get('LLM_TTFT_SAMPLES', '500'))
+    # Circuit breaker + optional hedging across LLM_PROVIDER_ORDER
+    LLM_ROUTER_WINDOW = int(os.environ.get('LLM_ROUTER_WINDOW', '50'))
+    LLM_ROUTER_FAILURE_THRESHOLD = int(os.environ.get('LLM_ROUTER_FAILURE_THRESHOLD', '3'))
+    LLM_ROUTER_ERROR_RATE = float(os.environ.get('LLM_ROUTER_ERROR_RATE', '0.5'))
+    LLM_ROUTER_COOLDOWN = float(os.environ.get('LLM_ROUTER_COOLDOWN', '30'))
+    LLM_ROUTER_HEDGE = os.environ.get('LLM_ROUTER_HEDGE', '0') == '1'
+    LLM_ROUTER_HEDGE_MIN_DELAY = float(os.environ.get('LLM_ROUTER_HEDGE_MIN_DELAY', '1.0'))
+    LLM_ROUTER_HEDGE_MAX_DELAY = float(os.environ.get('LLM_ROUTER_HEDGE_MAX_DELAY', '8.0'))
+    # JSON {provider: max in-flight calls}, e.g. {"openrouter": 4, "anthropic": 2}
+    LLM_PROVIDER_CONCURRENCY = os.environ.get('LLM_PROVIDER_CONCURRENCY', '')
 
     # App
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-key-change-in-production')
     SKILL_DIR = os.environ.get('SKILL_DIR', 'Assets/skills')
+    SKILL_CONTEXT_TOP_K = int(os.environ.get('SKILL_CONTEXT_TOP_K', '6'))
+    SKILL_CONTEXT_TOKEN_BUDGET = int(os.environ.get('SKILL_CONTEXT_TOKEN_BUDGET', '2000'))
     API_KEY = os.environ.get('TRIFECTA_API_KEY', '')
 
     # Portal JWT Auth
     PORTAL_JWT_SECRET = os.environ.get('PORTAL_JWT_SECRET', 'dev-portal-jwt-secret-change-in-production')
     PORTAL_JWT_EXPIRY_HOURS = int(os.environ.get('PORTAL_JWT_EXPIRY_HOURS', '24'))
 
+    # Real-time dashboard emitter
+    DASHBOARD_EMIT_QUEUE_SIZE = int(os.environ.get('DASHBOARD_EMIT_QUEUE_SIZE', '1000'))
+    DASHBOARD_EMIT_MAX_BATCH = int(os.environ.get('DASHBOARD_EMIT_MAX_BATCH', '50'))
+    DASHBOARD_EMIT_FLUSH_MS = int(os.environ.get('DASHBOARD_EMIT_FLUSH_MS', '50'))
+    # Rate limiting (token buckets; sqlite backend shares limits across gunicorn workers)
+    RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'memory').lower()
+    RATE_LIMIT_DB_PATH = os.environ.get('RATE_LIMIT_DB_PATH', os.path.join(_default_db_dir, 'rate_limits.db'))
+    RATE_LIMIT_MAX_KEYS = int(os.environ.get('RATE_LIMIT_MAX_KEYS', '10000'))
+    RATE_LIMIT_CHAT_PER_MINUTE = int(os.environ.get('RATE_LIMIT_CHAT_PER_MINUTE', str(RATE_LIMIT_PER_MINUTE)))
+    RATE_LIMIT_CHAT_BURST = int(os.environ.get('RATE_LIMIT_CHAT_BURST', str(RATE_LIMIT_CHAT_PER_MINUTE)))
+    RATE_LIMIT_RECOVERY_BUDDY_PER_MINUTE = int(os.environ.get('RATE_LIMIT_RECOVERY_BUDDY_PER_MINUTE', '20'))
+    RATE_LIMIT_RECOVERY_BUDDY_BURST = int(os.environ.get('RATE_LIMIT_RECOVERY_BUDDY_BURST', '8'))
+
+    # Scheduler leader election (lets gunicorn run more than one worker)
+    SCHEDULER_LEADER_ELECTION = os.environ.get('SCHEDULER_LEADER_ELECTION', '1') == '1'
+    SCHEDULER_LEASE_TTL = int(os.environ.get('SCHEDULER_LEASE_TTL', '60'))
+
+    STREAM_HISTORY = int(os.environ.get('STREAM_HISTORY', '256'))
+    STREAM_HEARTBEAT_SECONDS = int(os.environ.get('STREAM_HEARTBEAT_SECONDS', '15'))
+    STREAM_MAX_CLIENTS = int(os.environ.get('STREAM_MAX_CLIENTS', '4'))  # each open stream holds a gunicorn thread
+
+    # Fast boot: skills, schema checks and the scheduler load after import (background thread / first request)
+    FAST_BOOT = os.environ.get('FAST_BOOT', '0') == '1'
+
 app.config.from_object(Config)
 app.secret_key = Config.SECRET_KEY
+boot_profiler.fast = Config.FAST_BOOT
+
+# =============================================================================
+# OUTBOUND HTTP (shared keep-alive sessions, per-host timeout/retry policy)
+# =============================================================================
+outbound_http = get_http()
+for _llm_base in (Config.OPENROUTER_BASE_URL, Config.OPENAI_BASE_URL, 'https://api.anthropic.com'):
+    # Replay a POST only when it was never processed (connect error, 429, 503); a read timeout
+    # means the completion may be running (and billed) already, and retrying doubles the tail
+    outbound_http.configure_host(_llm_base, timeout=DEFAULT_OUTBOUND_TIMEOUT, retries=1, read_retries=0,
+                                 status_forcelist=(429, 503), retry_post=True)
+outbound_http.configure_host('login.microsoftonline.com', timeout=30, retry_post=True)
+outbound_http.configure_host('graph.microsoft.com', timeout=60)
+outbound_http.configure_host('dialpad.com', timeout=30)
+outbound_http.configure_host('quickbooks.api.intuit.com', timeout=30)
+outbound_http.configure_host('api.telegram.org', timeout=DEFAULT_OUTBOUND_TIMEOUT)
+outbound_http.configure_host(DASHBOARD_URL, timeout=3, retries=0, pool_maxsize=4)
+outbound_http.add_observer(
+    lambda host, method, status, seconds: OUTBOUND_REQUEST_SECONDS.observe(seconds, host, method, status))
+if os.environ.get('DISCORD_WEBHOOK_URL'):
+    outbound_http.configure_host(os.environ['DISCORD_WEBHOOK_URL'], timeout=10)
+
+dashboard_emitter = DashboardEmitter(
+    DASHBOARD_URL,
+    http=outbound_http,
+    capacity=Config.DASHBOARD_EMIT_QUEUE_SIZE,
+    max_batch=Config.DASHBOARD_EMIT_MAX_BATCH,
+    flush_interval=Config.DASHBOARD_EMIT_FLUSH_MS / 1000.0,
+)
+atexit.register(dashboard_emitter.close, 2.0)
+event_hub = EventHub(history=Config.STREAM_HISTORY)
+
+# =============================================================================
+# RATE LIMITING (token buckets per policy + client IP)
+# =============================================================================
+if Config.RATE_LIMIT_BACKEND == 'sqlite':
+    _rate_backend = SQLiteBucketBackend(Config.RATE_LIMIT_DB_PATH, max_keys=Config.RATE_LIMIT_MAX_KEYS)
+else:
+    _rate_backend = MemoryBucketBackend(max_keys=Config.RATE_LIMIT_MAX_KEYS)
+rate_limiter = RateLimiter(_rate_backend, default_policy=RatePolicy(per_minute=RATE_LIMIT_PER_MINUTE))
+rate_limiter.configure('chat', per_minute=Config.RATE_LIMIT_CHAT_PER_MINUTE, burst=Config.RATE_LIMIT_CHAT_BURST)
+rate_limiter.configure(
+    'recovery_buddy',
+    per_minute=Config.RATE_LIMIT_RECOVERY_BUDDY_PER_MINUTE,
+    burst=Config.RATE_LIMIT_RECOVERY_BUDDY_BURST,
+)
 
 LEAD_STATUS = {
     'INQUIRY_RECEIVED': 'INQUIRY_RECEIVED',
@@ -442,18 +581,125 @@ def sha256_json(payload):
     return hashlib.sha256(encoded).hexdigest()
 
 
+class _PooledConnection(ProfiledConnection):
+    """sqlite3 connection owned by a pool; close() hands it back instead of closing."""
+
+    def close(self):
+        if self.in_transaction:
+            self.rollback()
+
+    def close_physical(self):
+        super().close()
+
+
+class SQLiteConnectionPool:
+    """Thread-local SQLite connection pool.
+
+    Each thread keeps one long-lived connection per database file, so pragmas
+    (WAL, synchronous, mmap/cache sizing) are applied once per connection
+    instead of once per query.
+    """
+
+    def __init__(self, db_path, timeout=5.0, mmap_size=0, cache_size=-2000):
+        self.db_path = db_path
+        self.timeout = timeout
+        self.mmap_size = mmap_size
+        self.cache_size = cache_size
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._connections = weakref.WeakSet()
+        self._opens = 0
+        self._reuses = 0
+        self._wait_ms_total = 0.0
+        self._wait_ms_max = 0.0
+
+    def _open(self):
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, factory=_PooledConnection)
+        profile_connection(conn, os.path.splitext(os.path.basename(self.db_path))[0], db_path=self.db_path)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        conn.execute(f"PRAGMA cache_size={int(self.cache_size)}")
+        return conn
+
+    def acquire(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            with self._stats_lock:
+                self._reuses += 1
+            return conn
+
+        started = time.perf_counter()
+        conn = self._open()
+        waited_ms = (time.perf_counter() - started) * 1000
+        self._local.conn = conn
+        with self._stats_lock:
+            self._opens += 1
+            self._wait_ms_total += waited_ms
+            self._wait_ms_max = max(self._wait_ms_max, waited_ms)
+            self._connections.add(conn)
+        return conn
+
+    def release(self):
+        """Roll back anything left open on this thread's connection."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and conn.in_transaction:
+            conn.rollback()
+
+    def close_all(self):
+        with self._stats_lock:
+            connections = list(self._connections)
+            self._connections = weakref.WeakSet()
+        for conn in connections:
+            try:
+                conn.close_physical()
+            except sqlite3.ProgrammingError:
+                # Connections are bound to their creating thread; the owner thread
+                # will drop it when it exits.
+                pass
+        self._local = threading.local()
+
+    def stats(self):
+        with self._stats_lock:
+            acquires = self._opens + self._reuses
+            return {
+                'db_path': self.db_path,
+                'open_connections': len(self._connections),
+                'opens': self._opens,
+                'reuses': self._reuses,
+                'reuse_ratio': round(self._reuses / acquires, 4) if acquires else 0.0,
+                'wait_ms_total': round(self._wait_ms_total, 3),
+                'wait_ms_avg': round(self._wait_ms_total / self._opens, 3) if self._opens else 0.0,
+                'wait_ms_max': round(self._wait_ms_max, 3),
+            }
+
+
 class LeadPipelineStore:
     """SQLite-backed persistence for lead intake pipeline."""
 
     def __init__(self, db_path):
         self.db_path = db_path
         self._lock = threading.Lock()
+        self._pool = SQLiteConnectionPool(
+            db_path,
+            timeout=Config.LEAD_DB_BUSY_TIMEOUT,
+            mmap_size=Config.LEAD_DB_MMAP_SIZE,
+            cache_size=Config.LEAD_DB_CACHE_SIZE,
+        )
         self._ensure_schema()
 
     def _connect(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return self._pool.acquire()
+
+    def release_connection(self):
+        self._pool.release()
+
+    def pool_stats(self):
+        return self._pool.stats()
+
+    def close(self):
+        self._pool.close_all()
 
     def _ensure_schema(self):
         with self._connect() as conn:
@@ -595,7 +841,108 @@ class LeadPipelineStore:
                 FOREIGN KEY(client_id) REFERENCES clients(id)
             );
             CREATE INDEX IF NOT EXISTS idx_appointments_client_id ON appointments(client_id);
+
+            CREATE TABLE IF NOT EXISTS ingest_queue (
+                id TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                source_event_id TEXT NOT NULL,
+                normalized_json TEXT NOT NULL,
+                payload_json TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                claim_token TEXT,
+                last_error TEXT,
+                result_json TEXT,
+                enqueued_at TEXT NOT NULL,
+                enqueued_ts REAL NOT NULL,
+                available_ts REAL NOT NULL,
+                started_ts REAL,
+                finished_ts REAL
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_ingest_queue_source_event
+            ON ingest_queue(source, source_event_id);
+            CREATE INDEX IF NOT EXISTS idx_ingest_queue_status ON ingest_queue(status, available_ts);
+
+            CREATE TABLE IF NOT EXISTS sent_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ts TEXT NOT NULL,
+                day TEXT,
+                type TEXT,
+                channel TEXT,
+                lead_id TEXT,
+                entry_json TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_sent_log_lead_id ON sent_log(lead_id);
+            CREATE INDEX IF NOT EXISTS idx_sent_log_ts ON sent_log(ts);
+
+            CREATE TABLE IF NOT EXISTS sent_log_daily_counts (
+                day TEXT NOT NULL,
+                type TEXT NOT NULL,
+                channel TEXT,
+                count INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_sent_log_daily_counts_key
+            ON sent_log_daily_counts(day, type, IFNULL(channel, ''));
+            CREATE TABLE IF NOT EXISTS sent_log_lead_counts (
+                lead_id TEXT PRIMARY KEY,
+                count INTEGER NOT NULL DEFAULT 0,
+                last_ts TEXT
+            );
+            CREATE TABLE IF NOT EXISTS sent_log_imports (
+                source_path TEXT PRIMARY KEY,
+                entries INTEGER NOT NULL,
+                imported_at TEXT NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS scheduler_leases (
+                name TEXT PRIMARY KEY,
+                holder TEXT NOT NULL,
+                acquired_at REAL NOT NULL,
+                renewed_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            );
+
+            -- Materialized pipeline counters. Kept in step by triggers so every writer
+            -- (store methods, ingest scripts, direct UPDATEs) updates them in the same transaction.
+            CREATE TABLE IF NOT EXISTS lead_counters (
+                dimension TEXT NOT NULL,
+                value TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (dimension, value)
+            );
+            CREATE TRIGGER IF NOT EXISTS trg_lead_counters_insert AFTER INSERT ON leads
+            BEGIN
+                INSERT INTO lead_counters (dimension, value, count) VALUES ('total', '', 1)
+                    ON CONFLICT(dimension, value) DO UPDATE SET count = count + 1;
+                INSERT INTO lead_counters (dimension, value, count) VALUES ('status', NEW.status, 1)
+                    ON CONFLICT(dimension, value) DO UPDATE SET count = count + 1;
+                INSERT INTO lead_counters (dimension, value, count) VALUES ('source', NEW.source, 1)
+                    ON CONFLICT(dimension, value) DO UPDATE SET count = count + 1;
+            END;
+            CREATE TRIGGER IF NOT EXISTS trg_lead_counters_delete AFTER DELETE ON leads
+            BEGIN
+                UPDATE lead_counters SET count = count - 1 WHERE dimension = 'total' AND value = '';
+                UPDATE lead_counters SET count = count - 1 WHERE dimension = 'status' AND value = OLD.status;
+                UPDATE lead_counters SET count = count - 1 WHERE dimension = 'source' AND value = OLD.source;
+            END;
+            CREATE TRIGGER IF NOT EXISTS trg_lead_counters_status AFTER UPDATE OF status ON leads
+            WHEN OLD.status IS NOT NEW.status
+            BEGIN
+                UPDATE lead_counters SET count = count - 1 WHERE dimension = 'status' AND value = OLD.status;
+                INSERT INTO lead_counters (dimension, value, count) VALUES ('status', NEW.status, 1)
+                    ON CONFLICT(dimension, value) DO UPDATE SET count = count + 1;
+            END;
+            CREATE TRIGGER IF NOT EXISTS trg_lead_counters_source AFTER UPDATE OF source ON leads
+            WHEN OLD.source IS NOT NEW.source
+            BEGIN
+                UPDATE lead_counters SET count = count - 1 WHERE dimension = 'source' AND value = OLD.source;
+                INSERT INTO lead_counters (dimension, value, count) VALUES ('source', NEW.source, 1)
+                    ON CONFLICT(dimension, value) DO UPDATE SET count = count + 1;
+            END;
             """)
+            if not self._fetchone(conn, "SELECT 1 FROM lead_counters WHERE dimension = 'total'"):
+                # First start on an existing database: seed counters from the leads table
+                self._rebuild_lead_counters(conn)
 
     def _fetchone(self, conn, sql, params=()):
         row = conn.execute(sql, params).fetchone()
@@ -690,14 +1037,17 @@ class LeadPipelineStore:
 
     def set_lead_status(self, lead_id, next_status):
         with self._connect() as conn:
-            lead = self._fetchone(conn, "SELECT * FROM leads WHERE id = ?", (lead_id,))
-            if not lead:
-                return None, 'not_found'
-            current = lead['status']
-            if next_status != current and next_status not in VALID_LEAD_TRANSITIONS.get(current, set()):
-                return None, 'invalid_transition'
-            conn.execute("UPDATE leads SET status = ?, updated_at = ? WHERE id = ?", (next_status, utcnow_iso(), lead_id))
-            return self._fetchone(conn, "SELECT * FROM leads WHERE id = ?", (lead_id,)), None
+            return self._set_lead_status(conn, lead_id, next_status)
+
+    def _set_lead_status(self, conn, lead_id, next_status):
+        lead = self._fetchone(conn, "SELECT * FROM leads WHERE id = ?", (lead_id,))
+        if not lead:
+            return None, 'not_found'
+        current = lead['status']
+        if next_status != current and next_status not in VALID_LEAD_TRANSITIONS.get(current, set()):
+            return None, 'invalid_transition'
+        conn.execute("UPDATE leads SET status = ?, updated_at = ? WHERE id = ?", (next_status, utcnow_iso(), lead_id))
+        return self._fetchone(conn, "SELECT * FROM leads WHERE id = ?", (lead_id,)), None
 
     def insert_event(self, lead_id, source, source_event_id, event_type, payload, occurred_at):
         event_id = str(uuid.uuid4())
@@ -765,20 +1115,56 @@ class LeadPipelineStore:
             )
 
     def create_draft(self, lead_id, model, prompt_version, subject, html, text, confidence, risk_flags, citations):
+        with self._connect() as conn:
+            return self._insert_draft(conn, lead_id, model, prompt_version, subject, html, text, confidence, risk_flags, citations)
+
+    def _insert_draft(self, conn, lead_id, model, prompt_version, subject, html, text, confidence, risk_flags, citations):
         draft_id = str(uuid.uuid4())
         now = utcnow_iso()
+        conn.execute(
+            """INSERT INTO email_drafts (
+                id, lead_id, model, prompt_version, subject, html, text, confidence,
+                risk_flags_json, citations_json, state, created_at, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                draft_id, lead_id, model, prompt_version, subject, html, text, float(confidence),
+                json.dumps(risk_flags), json.dumps(citations), 'drafted', now, now
+            )
+        )
+        return self._fetchone(conn, "SELECT * FROM email_drafts WHERE id = ?", (draft_id,))
+
+    def commit_draft_batch(self, items):
+        """Persist generated drafts, their status transitions and audit rows in one transaction.
+
+        `items` is a list of (lead, generated, next_status); returns [(draft, lead_after, err)].
+        """
+        results = []
         with self._connect() as conn:
-            conn.execute(
-                """INSERT INTO email_drafts (
-                    id, lead_id, model, prompt_version, subject, html, text, confidence,
-                    risk_flags_json, citations_json, state, created_at, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    draft_id, lead_id, model, prompt_version, subject, html, text, float(confidence),
-                    json.dumps(risk_flags), json.dumps(citations), 'drafted', now, now
+            for lead, generated, next_status in items:
+                draft = self._insert_draft(
+                    conn, lead['id'], generated['model'], generated['prompt_version'], generated['subject'],
+                    generated['body_html'], generated['body_text'], generated['confidence'],
+                    generated['risk_flags'], generated['citations_used']
                 )
+                lead_after, err = self._set_lead_status(conn, lead['id'], next_status)
+                self._insert_audit(conn, 'system', 'draft_created', 'lead', lead['id'], lead, lead_after or lead)
+                results.append((draft, lead_after, err))
+        return results
+
+    def latest_draft_states(self, lead_ids):
+        """Map lead_id -> state of its newest draft, for the leads that have one."""
+        if not lead_ids:
+            return {}
+        placeholders = ','.join('?' for _ in lead_ids)
+        with self._connect() as conn:
+            rows = self._fetchall(
+                conn,
+                f"""SELECT lead_id, state FROM email_drafts d
+                    WHERE lead_id IN ({placeholders})
+                      AND created_at = (SELECT MAX(created_at) FROM email_drafts WHERE lead_id = d.lead_id)""",
+                tuple(lead_ids)
             )
-            return self._fetchone(conn, "SELECT * FROM email_drafts WHERE id = ?", (draft_id,))
+        return {row['lead_id']: row['state'] for row in rows}
 
     def update_draft_state(self, draft_id, state, approved_by=None, rejected_by=None, rejected_reason=None, sent_message_id=None):
         now = utcnow_iso()
@@ -833,20 +1219,23 @@ class LeadPipelineStore:
 
     def add_audit(self, actor, action, object_type, object_id, before_obj, after_obj):
         with self._connect() as conn:
-            conn.execute(
-                """INSERT INTO audit_log (id, actor, action, object_type, object_id, before_json, after_json, timestamp)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    str(uuid.uuid4()),
-                    actor or 'system',
-                    action,
-                    object_type,
-                    object_id,
-                    json.dumps(before_obj) if before_obj is not None else None,
-                    json.dumps(after_obj) if after_obj is not None else None,
-                    utcnow_iso()
-                )
+            self._insert_audit(conn, actor, action, object_type, object_id, before_obj, after_obj)
+
+    def _insert_audit(self, conn, actor, action, object_type, object_id, before_obj, after_obj):
+        conn.execute(
+            """INSERT INTO audit_log (id, actor, action, object_type, object_id, before_json, after_json, timestamp)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                str(uuid.uuid4()),
+                actor or 'system',
+                action,
+                object_type,
+                object_id,
+                json.dumps(before_obj) if before_obj is not None else None,
+                json.dumps(after_obj) if after_obj is not None else None,
+                utcnow_iso()
             )
+        )
 
     def update_lead(self, lead_id, **fields):
         allowed = {
@@ -910,22 +1299,60 @@ class LeadPipelineStore:
                 (source, source_event_id)
             )
 
+    def _live_lead_counts(self, conn):
+        counts = {('total', ''): self._fetchone(conn, "SELECT COUNT(*) AS count FROM leads")['count']}
+        for dimension in ('status', 'source'):
+            for row in self._fetchall(conn, f"SELECT {dimension} AS value, COUNT(*) AS count FROM leads GROUP BY {dimension}"):
+                counts[(dimension, row['value'])] = row['count']
+        return counts
+
+    def _rebuild_lead_counters(self, conn):
+        counts = self._live_lead_counts(conn)
+        conn.execute("DELETE FROM lead_counters")
+        conn.executemany(
+            "INSERT INTO lead_counters (dimension, value, count) VALUES (?, ?, ?)",
+            [(dimension, value, count) for (dimension, value), count in counts.items()]
+        )
+        return counts
+
+    def rebuild_lead_counters(self):
+        """Recompute lead_counters from a full scan of leads. Returns the number of counter rows."""
+        with self._lock:
+            with self._connect() as conn:
+                return len(self._rebuild_lead_counters(conn))
+
+    def verify_lead_counters(self):
+        """Compare lead_counters with live GROUP BY counts; returns any drift found."""
+        with self._connect() as conn:
+            live = self._live_lead_counts(conn)
+            stored = {
+                (row['dimension'], row['value']): row['count']
+                for row in self._fetchall(conn, "SELECT dimension, value, count FROM lead_counters")
+            }
+        drift = []
+        for key in sorted(set(live) | set(stored)):
+            expected = live.get(key, 0)
+            actual = stored.get(key, 0)
+            if expected != actual:
+                drift.append({'dimension': key[0], 'value': key[1], 'counter': actual, 'actual': expected})
+        return {'ok': not drift, 'checked': len(live), 'drift': drift}
+
     def status_metrics(self):
         with self._connect() as conn:
-            by_status = self._fetchall(conn, "SELECT status, COUNT(*) as count FROM leads GROUP BY status")
-            by_source = self._fetchall(conn, "SELECT source, COUNT(*) as count FROM leads GROUP BY source")
-            total = self._fetchone(conn, "SELECT COUNT(*) AS count FROM leads")['count']
-            sent = self._fetchone(
+            rows = self._fetchall(
                 conn,
-                "SELECT COUNT(*) AS count FROM leads WHERE status = ?",
-                (LEAD_STATUS['PROGRAM_INFO_SENT'],)
-            )['count']
-            return {
-                'total_leads': total,
-                'by_status': by_status,
-                'by_source': by_source,
-                'conversion_rate': round((sent / total) * 100, 2) if total else 0.0,
-            }
+                "SELECT dimension, value, count FROM lead_counters WHERE count > 0 OR dimension = 'total' ORDER BY dimension, value"
+            )
+        by_status = [{'status': r['value'], 'count': r['count']} for r in rows if r['dimension'] == 'status']
+        by_source = [{'source': r['value'], 'count': r['count']} for r in rows if r['dimension'] == 'source']
+        total = next((r['count'] for r in rows if r['dimension'] == 'total'), 0)
+        sent = next((r['count'] for r in by_status if r['status'] == LEAD_STATUS['PROGRAM_INFO_SENT']), 0)
+        return {
+            'total_leads': total,
+            'by_status': by_status,
+            'by_source': by_source,
+            'conversion_rate': round((sent / total) * 100, 2) if total else 0.0,
+        }
 
     def latest_events_for_lead(self, lead_id, limit=5):
         with self._connect() as conn:
@@ -938,6 +1365,62 @@ class LeadPipelineStore:
                 (lead_id, limit)
             )
 
+    def load_lead_contexts(self, lead_ids, event_limit=5):
+        """Batch-load recent events, latest draft and latest outbound message per lead.
+
+        Uses one windowed query per table so serializing a page of leads costs a
+        fixed number of queries regardless of page size.
+        """
+        lead_ids = list(dict.fromkeys(lead_id for lead_id in lead_ids if lead_id))
+        contexts = {lead_id: {'events': [], 'draft': None, 'outbound': None} for lead_id in lead_ids}
+        if not lead_ids:
+            return contexts
+
+        with self._connect() as conn:
+            for start in range(0, len(lead_ids), 500):
+                chunk = lead_ids[start:start + 500]
+                placeholders = ','.join('?' for _ in chunk)
+                events = self._fetchall(
+                    conn,
+                    f"""SELECT * FROM (
+                           SELECT *, ROW_NUMBER() OVER (
+                               PARTITION BY lead_id ORDER BY received_at DESC
+                           ) AS _rn
+                           FROM lead_events WHERE lead_id IN ({placeholders})
+                       ) WHERE _rn <= ? ORDER BY lead_id, _rn""",
+                    (*chunk, event_limit)
+                )
+                drafts = self._fetchall(
+                    conn,
+                    f"""SELECT * FROM (
+                           SELECT *, ROW_NUMBER() OVER (
+                               PARTITION BY lead_id ORDER BY created_at DESC
+                           ) AS _rn
+                           FROM email_drafts WHERE lead_id IN ({placeholders})
+                       ) WHERE _rn = 1""",
+                    tuple(chunk)
+                )
+                outbound = self._fetchall(
+                    conn,
+                    f"""SELECT * FROM (
+                           SELECT *, ROW_NUMBER() OVER (
+                               PARTITION BY lead_id ORDER BY COALESCE(sent_at, created_at) DESC
+                           ) AS _rn
+                           FROM outbound_messages WHERE lead_id IN ({placeholders})
+                       ) WHERE _rn = 1""",
+                    tuple(chunk)
+                )
+                for row in events:
+                    row.pop('_rn', None)
+                    contexts[row['lead_id']]['events'].append(row)
+                for row in drafts:
+                    row.pop('_rn', None)
+                    contexts[row['lead_id']]['draft'] = row
+                for row in outbound:
+                    row.pop('_rn', None)
+                    contexts[row['lead_id']]['outbound'] = row
+        return contexts
+
     def list_leads_needing_attention(self, statuses, updated_before=None, limit=100):
         if not statuses:
             return []
@@ -953,6 +1436,276 @@ class LeadPipelineStore:
             return self._fetchall(conn, sql, tuple(params))
 
 
+    # --- Durable webhook ingest queue ---
+
+    def enqueue_ingest(self, normalized, payload):
+        """Queue a verified inbound event. Returns (job, created); created is False for duplicates."""
+        source = normalized['source']
+        source_event_id = normalized['source_event_id']
+        now_ts = time.time()
+        with self._lock, self._connect() as conn:
+            existing = self._queued_ingest(conn, source, source_event_id)
+            if existing:
+                return existing, False
+            processed = self._fetchone(
+                conn,
+                "SELECT lead_id FROM lead_events WHERE source = ? AND source_event_id = ?",
+                (source, source_event_id)
+            )
+            if processed:
+                return {'id': None, 'source': source, 'source_event_id': source_event_id,
+                        'status': 'done', 'lead_id': processed['lead_id']}, False
+            job_id = str(uuid.uuid4())
+            inserted = conn.execute(
+                """INSERT INTO ingest_queue (
+                    id, source, source_event_id, normalized_json, payload_json, status,
+                    enqueued_at, enqueued_ts, available_ts
+                ) VALUES (?, ?, ?, ?, ?, 'queued', ?, ?, ?)
+                ON CONFLICT(source, source_event_id) DO NOTHING""",
+                (
+                    job_id, source, source_event_id,
+                    json.dumps(normalized, default=str), json.dumps(payload, default=str),
+                    utcnow_iso(), now_ts, now_ts
+                )
+            ).rowcount
+            if not inserted:
+                # Another worker process queued the same delivery after our SELECT (self._lock is per process)
+                return self._queued_ingest(conn, source, source_event_id), False
+            return self._fetchone(conn, "SELECT * FROM ingest_queue WHERE id = ?", (job_id,)), True
+
+    def _queued_ingest(self, conn, source, source_event_id):
+        existing = self._fetchone(
+            conn,
+            "SELECT * FROM ingest_queue WHERE source = ? AND source_event_id = ?",
+            (source, source_event_id)
+        )
+        if existing:
+            existing['lead_id'] = _parse_json_field(existing.get('result_json'), {}).get('lead_id')
+        return existing
+
+    def claim_ingest_jobs(self, limit=1):
+        """Atomically move up to `limit` ready jobs to 'processing' and return them."""
+        token = str(uuid.uuid4())
+        now_ts = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                """UPDATE ingest_queue
+                   SET status = 'processing', claim_token = ?, attempts = attempts + 1, started_ts = ?
+                   WHERE id IN (
+                       SELECT id FROM ingest_queue
+                       WHERE status = 'queued' AND available_ts <= ?
+                       ORDER BY available_ts ASC LIMIT ?
+                   )""",
+                (token, now_ts, now_ts, limit)
+            )
+            return self._fetchall(conn, "SELECT * FROM ingest_queue WHERE claim_token = ? ORDER BY enqueued_ts", (token,))
+
+    def complete_ingest_job(self, job_id, result):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE ingest_queue SET status = 'done', result_json = ?, last_error = NULL, finished_ts = ? WHERE id = ?",
+                (json.dumps(result, default=str), time.time(), job_id)
+            )
+
+    def fail_ingest_job(self, job_id, error, max_attempts, backoff_seconds=5):
+        """Requeue with exponential backoff, or mark failed once attempts are exhausted."""
+        with self._connect() as conn:
+            job = self._fetchone(conn, "SELECT attempts FROM ingest_queue WHERE id = ?", (job_id,))
+            if not job:
+                return None
+            now_ts = time.time()
+            if job['attempts'] >= max_attempts:
+                conn.execute(
+                    "UPDATE ingest_queue SET status = 'failed', last_error = ?, finished_ts = ? WHERE id = ?",
+                    (str(error)[:1000], now_ts, job_id)
+                )
+                return 'failed'
+            conn.execute(
+                "UPDATE ingest_queue SET status = 'queued', last_error = ?, available_ts = ? WHERE id = ?",
+                (str(error)[:1000], now_ts + backoff_seconds * (2 ** (job['attempts'] - 1)), job_id)
+            )
+            return 'queued'
+
+    def requeue_stale_ingest_jobs(self, older_than_seconds=300):
+        """Return jobs orphaned in 'processing' (e.g. worker killed mid-job) to the queue."""
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE ingest_queue SET status = 'queued', available_ts = ? WHERE status = 'processing' AND started_ts < ?",
+                (time.time(), time.time() - older_than_seconds)
+            )
+            return cur.rowcount
+
+    def prune_ingest_jobs(self, retention_days):
+        with self._connect() as conn:
+            cur = conn.execute(
+                "DELETE FROM ingest_queue WHERE status = 'done' AND finished_ts < ?",
+                (time.time() - retention_days * 86400,)
+            )
+            return cur.rowcount
+
+    def ingest_queue_metrics(self):
+        now_ts = time.time()
+        with self._connect() as conn:
+            by_status = {
+                row['status']: row['count']
+                for row in self._fetchall(conn, "SELECT status, COUNT(*) AS count FROM ingest_queue GROUP BY status")
+            }
+            oldest = self._fetchone(
+                conn,
+                "SELECT MIN(enqueued_ts) AS ts FROM ingest_queue WHERE status IN ('queued', 'processing')"
+            )['ts']
+            recent = self._fetchone(
+                conn,
+                """SELECT AVG(finished_ts - enqueued_ts) AS avg_lag, MAX(finished_ts - enqueued_ts) AS max_lag, COUNT(*) AS count
+                   FROM (SELECT finished_ts, enqueued_ts FROM ingest_queue
+                         WHERE status = 'done' ORDER BY finished_ts DESC LIMIT 100)"""
+            )
+        return {
+            'depth': by_status.get('queued', 0) + by_status.get('processing', 0),
+            'by_status': by_status,
+            'oldest_pending_age_seconds': round(now_ts - oldest, 3) if oldest else 0.0,
+            'recent_avg_lag_seconds': round(recent['avg_lag'], 3) if recent['avg_lag'] is not None else None,
+            'recent_max_lag_seconds': round(recent['max_lag'], 3) if recent['max_lag'] is not None else None,
+            'recent_sample_size': recent['count'],
+        }
+
+    def acquire_lease(self, name, holder, ttl):
+        """Take or renew a named lease. Succeeds if it is free, expired or already ours."""
+        now_ts = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                """INSERT INTO scheduler_leases (name, holder, acquired_at, renewed_at, expires_at)
+                   VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT(name) DO UPDATE SET
+                       acquired_at = CASE WHEN scheduler_leases.holder = excluded.holder
+                                          THEN scheduler_leases.acquired_at ELSE excluded.acquired_at END,
+                       holder = excluded.holder,
+                       renewed_at = excluded.renewed_at,
+                       expires_at = excluded.expires_at
+                   WHERE scheduler_leases.holder = excluded.holder OR scheduler_leases.expires_at < ?""",
+                (name, holder, now_ts, now_ts, now_ts + ttl, now_ts)
+            )
+            row = self._fetchone(conn, "SELECT holder FROM scheduler_leases WHERE name = ?", (name,))
+        return bool(row) and row['holder'] == holder
+
+    def release_lease(self, name, holder):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM scheduler_leases WHERE name = ? AND holder = ?", (name, holder))
+
+    def get_lease(self, name):
+        with self._connect() as conn:
+            return self._fetchone(conn, "SELECT * FROM scheduler_leases WHERE name = ?", (name,))
+
+    # --- Outbound sent-log (append-only, with incremental counters) ---
+
+    def _insert_sent_log(self, conn, entry):
+        ts = entry.get('ts') or ''
+        day = None
+        try:
+            day = datetime.fromisoformat(ts.replace('Z', '+00:00')).date().isoformat()
+        except (TypeError, ValueError):
+            pass
+        entry_type = entry.get('type') or ''
+        channel = entry.get('channel', 'unknown')
+        lead_id = entry.get('lead_id')
+        cur = conn.execute(
+            "INSERT INTO sent_log (ts, day, type, channel, lead_id, entry_json) VALUES (?, ?, ?, ?, ?, ?)",
+            (ts, day, entry_type, channel, lead_id, json.dumps(entry, separators=(',', ':')))
+        )
+        conn.execute(
+            """INSERT INTO sent_log_daily_counts (day, type, channel, count) VALUES (?, ?, ?, 1)
+               ON CONFLICT(day, type, IFNULL(channel, '')) DO UPDATE SET count = count + 1""",
+            (day or '', entry_type, channel)
+        )
+        conn.execute(
+            """INSERT INTO sent_log_lead_counts (lead_id, count, last_ts) VALUES (?, 1, ?)
+               ON CONFLICT(lead_id) DO UPDATE SET count = count + 1, last_ts = MAX(COALESCE(last_ts, ''), excluded.last_ts)""",
+            (lead_id or '', ts)
+        )
+        return cur.lastrowid
+
+    def append_sent_log(self, entry):
+        with self._connect() as conn:
+            return self._insert_sent_log(conn, entry)
+
+    def import_sent_log_jsonl(self, path):
+        """One-shot import of a legacy sent-log.jsonl. Returns entries imported (0 if already imported)."""
+        source_path = os.path.abspath(path)
+        with self._lock, self._connect() as conn:
+            # Claim the path first: a second process racing the import gets 0 instead of a conflict
+            claimed = conn.execute(
+                "INSERT OR IGNORE INTO sent_log_imports (source_path, entries, imported_at) VALUES (?, 0, ?)",
+                (source_path, utcnow_iso())
+            ).rowcount
+            if not claimed:
+                return 0
+            entries = []
+            if os.path.exists(source_path):
+                with open(source_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            entries.append(json.loads(line))
+                        except ValueError:
+                            logger.warning("Skipping malformed sent-log line during import")
+            for entry in entries:
+                self._insert_sent_log(conn, entry)
+            conn.execute(
+                "UPDATE sent_log_imports SET entries = ? WHERE source_path = ?",
+                (len(entries), source_path)
+            )
+            return len(entries)
+
+    def list_sent_log(self, lead_id=None):
+        with self._connect() as conn:
+            if lead_id is not None:
+                rows = conn.execute("SELECT entry_json FROM sent_log WHERE lead_id = ? ORDER BY id", (lead_id,)).fetchall()
+            else:
+                rows = conn.execute("SELECT entry_json FROM sent_log ORDER BY id").fetchall()
+        return [json.loads(r['entry_json']) for r in rows]
+
+    def sent_log_daily_counts(self, since_day=None, entry_type=None):
+        """Return {date: count} from the counter table, optionally filtered by day and type."""
+        clauses = ["day != ''"]
+        params = []
+        if since_day:
+            clauses.append("day >= ?")
+            params.append(since_day.isoformat() if hasattr(since_day, 'isoformat') else since_day)
+        if entry_type:
+            clauses.append("type = ?")
+            params.append(entry_type)
+        with self._connect() as conn:
+            rows = self._fetchall(
+                conn,
+                f"SELECT day, SUM(count) AS count FROM sent_log_daily_counts WHERE {' AND '.join(clauses)} GROUP BY day",
+                tuple(params)
+            )
+        return {datetime.fromisoformat(r['day']).date(): r['count'] for r in rows}
+
+    def sent_log_channel_counts(self):
+        with self._connect() as conn:
+            rows = self._fetchall(
+                conn,
+                "SELECT COALESCE(channel, 'unknown') AS channel, SUM(count) AS count "
+                "FROM sent_log_daily_counts GROUP BY COALESCE(channel, 'unknown')"
+            )
+        return {r['channel']: r['count'] for r in rows}
+
+    def sent_log_total(self):
+        with self._connect() as conn:
+            return self._fetchone(conn, "SELECT COALESCE(SUM(count), 0) AS count FROM sent_log_daily_counts")['count']
+
+    def sent_log_lead_summary(self, lead_id):
+        with self._connect() as conn:
+            row = self._fetchone(conn, "SELECT count, last_ts FROM sent_log_lead_counts WHERE lead_id = ?", (lead_id or '',))
+        return row or {'count': 0, 'last_ts': None}
+
+    def sent_log_lead_ids(self):
+        with self._connect() as conn:
+            return [r['lead_id'] for r in self._fetchall(conn, "SELECT lead_id FROM sent_log_lead_counts")]
+
     # --- Client / Session / Appointment persistence ---
 
     def upsert_client(self, client):
@@ -1043,7 +1796,15 @@ class LeadPipelineStore:
             return self._fetchall(conn, "SELECT id, email, name, role, client_id, created_at FROM portal_users ORDER BY created_at DESC")
 
 
+boot_profiler.mark('config_and_clients')
 lead_store = LeadPipelineStore(Config.LEAD_DB_PATH)
+boot_profiler.mark('lead_store')
+
+
+@app.teardown_request
+def release_lead_store_connection(exc=None):
+    # Pooled connections outlive the request; never leak an open transaction.
+    lead_store.release_connection()
 
 # Simple API key protection (optional; only enforced if TRIFECTA_API_KEY is set)
 @app.before_request
@@ -1123,40 +1884,206 @@ def load_skills(skills_dir=None):
             'size': len(text)
         }
 
+    _build_skill_index()
     logger.info(f"Loaded {len(SKILLS)} skills ({sum(s['size'] for s in SKILLS.values())} bytes)")
 
+
+# Inverted index over SKILLS, rebuilt by load_skills(). match_skill() scores
+# only the skills that share a term or phrase with the message.
+_SKILL_INDEX = {}
+
+
+def _build_skill_index():
+    phrase_postings = defaultdict(list)
+    term_postings = defaultdict(set)
+    skill_tokens = {}
+    sections = []
+    for name, s in SKILLS.items():
+        skill_tokens[name] = frozenset(re.findall(r"\w+", s.get('content', '').lower()[:5000]))
+        for token in skill_tokens[name]:
+            term_postings[token].add(name)
+        for kw in s.get('keywords', []):
+            if kw:
+                phrase_postings[kw].append((name, 10))
+        phrase_postings[name.replace('-', ' ').replace('_', ' ')].append((name, 15))
+        for heading, text in _split_skill_sections(s.get('content', '')):
+            terms = defaultdict(int)
+            for token in re.findall(r"\w+", text.lower()):
+                terms[token] += 1
+            sections.append({
+                'skill': name,
+                'position': len(sections),
+                'heading': heading,
+                'text': text,
+                'terms': dict(terms),
+                'length': sum(terms.values()),
+            })
+
+    # Longest-first alternation inside a lookahead finds the longest phrase
+    # starting at every offset; any shorter phrase at that offset is a prefix of it.
+    phrases = sorted(phrase_postings, key=len, reverse=True)
+    phrase_re = None
+    if phrases:
+        phrase_re = re.compile('(?=(' + '|'.join(re.escape(p) for p in phrases) + '))')
+    phrase_prefixes = {
+        phrase: [other for other in phrases if phrase.startswith(other)]
+        for phrase in phrases
+    }
+
+    section_postings = defaultdict(list)
+    for idx, section in enumerate(sections):
+        for term in section['terms']:
+            section_postings[term].append(idx)
+    section_count = len(sections)
+    section_idf = {
+        term: math.log(1 + (section_count - len(ids) + 0.5) / (len(ids) + 0.5))
+        for term, ids in section_postings.items()
+    }
+
+    _SKILL_INDEX.clear()
+    _SKILL_INDEX.update({
+        'skills': SKILLS,
+        'order': list(SKILLS),
+        'skill_tokens': skill_tokens,
+        'phrase_re': phrase_re,
+        'phrase_postings': dict(phrase_postings),
+        'phrase_prefixes': phrase_prefixes,
+        'term_postings': {term: tuple(names) for term, names in term_postings.items()},
+        'sections': sections,
+        'section_postings': dict(section_postings),
+        'section_idf': section_idf,
+        'section_avg_length': (sum(sec['length'] for sec in sections) / section_count) if section_count else 0.0,
+    })
+
+
+def _split_skill_sections(text):
+    """Split markdown into (heading, text) sections on heading lines, ignoring code fences."""
+    sections = []
+    heading = ''
+    lines = []
+    in_fence = False
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith('```'):
+            in_fence = not in_fence
+        elif not in_fence and re.match(r'^#{1,6}\s', stripped):
+            if any(l.strip() for l in lines):
+                sections.append((heading, '\n'.join(lines).strip()))
+            heading = stripped.lstrip('#').strip()
+            lines = []
+        lines.append(line)
+    if any(l.strip() for l in lines):
+        sections.append((heading, '\n'.join(lines).strip()))
+    return sections
+
+
+def _estimate_tokens(text):
+    return len(text) // 4 + 1
+
+
+def retrieve_skill_sections(message, top_k=None, token_budget=None, skill_name=None, k1=1.5, b=0.75):
+    """Rank skill sections against message with BM25 and pack the best into a token budget."""
+    top_k = Config.SKILL_CONTEXT_TOP_K if top_k is None else top_k
+    token_budget = Config.SKILL_CONTEXT_TOKEN_BUDGET if token_budget is None else token_budget
+    if _SKILL_INDEX.get('skills') is not SKILLS or len(_SKILL_INDEX.get('order', ())) != len(SKILLS):
+        _build_skill_index()
+    sections = _SKILL_INDEX.get('sections') or []
+    if not sections:
+        return []
+
+    avg_length = _SKILL_INDEX['section_avg_length'] or 1.0
+    postings = _SKILL_INDEX['section_postings']
+    idf = _SKILL_INDEX['section_idf']
+    scores = defaultdict(float)
+    for term in set(re.findall(r"\w+", message.lower())):
+        for idx in postings.get(term, ()):
+            section = sections[idx]
+            if skill_name and section['skill'] != skill_name:
+                continue
+            tf = section['terms'][term]
+            norm = tf + k1 * (1 - b + b * section['length'] / avg_length)
+            scores[idx] += idf[term] * tf * (k1 + 1) / norm
+
+    ranked = sorted(scores, key=lambda idx: (-scores[idx], idx))
+    if not ranked and skill_name:
+        # Nothing overlaps; fall back to the skill's opening sections.
+        ranked = [idx for idx, sec in enumerate(sections) if sec['skill'] == skill_name]
+
+    selected = []
+    used = 0
+    for idx in ranked:
+        if len(selected) >= top_k:
+            break
+        cost = _estimate_tokens(sections[idx]['text'])
+        if used + cost > token_budget:
+            if not selected:
+                # Always return something: trim the single best section to fit.
+                text = sections[idx]['text'][:max(token_budget - 1, 1) * 4]
+                selected.append({**sections[idx], 'text': text, 'score': round(scores.get(idx, 0.0), 4), 'truncated': True})
+                used = _estimate_tokens(text)
+            continue
+        selected.append({**sections[idx], 'score': round(scores.get(idx, 0.0), 4), 'truncated': False})
+        used += cost
+
+    selected.sort(key=lambda sec: sec['position'])
+    return [
+        {
+            'skill': sec['skill'],
+            'heading': sec['heading'],
+            'text': sec['text'],
+            'score': sec['score'],
+            'tokens': _estimate_tokens(sec['text']),
+            'truncated': sec['truncated'],
+        }
+        for sec in selected
+    ]
+
+
+def build_skill_context(message, matched):
+    """Assemble prompt context from the matched skill's most relevant sections."""
+    if not matched:
+        return '', []
+    sections = retrieve_skill_sections(message, skill_name=matched['name'])
+    return '\n\n'.join(sec['text'] for sec in sections), sections
+
 # Load skills at startup
-load_skills()
+boot_profiler.mark('skill_helpers')
+boot_profiler.run_or_defer('skills', load_skills)
 
 def match_skill(message):
     """Return best matching skill for message or None."""
     if not SKILLS:
         return None
+    if _SKILL_INDEX.get('skills') is not SKILLS or len(_SKILL_INDEX['order']) != len(SKILLS):
+        _build_skill_index()
 
     msg_lower = message.lower()
-    msg_words = set(re.findall(r"\w+", msg_lower))
+    scores = defaultdict(int)
+
+    # Keyword (+10) and name (+15) boosts: one pass of the combined phrase
+    # automaton, then expand each hit to the shorter phrases it contains as a prefix.
+    phrase_re = _SKILL_INDEX['phrase_re']
+    if phrase_re is not None:
+        matched = set()
+        for m in phrase_re.finditer(msg_lower):
+            matched.update(_SKILL_INDEX['phrase_prefixes'][m.group(1)])
+        for phrase in matched:
+            for skill_name, weight in _SKILL_INDEX['phrase_postings'][phrase]:
+                scores[skill_name] += weight
+
+    # Content overlap (+1 per distinct shared word) via the term posting lists
+    postings = _SKILL_INDEX['term_postings']
+    for word in set(re.findall(r"\w+", msg_lower)):
+        for skill_name in postings.get(word, ()):
+            scores[skill_name] += 1
+
     best = None
     best_score = 0
-
-    for s in SKILLS.values():
-        score = 0
-        # Keyword boost
-        for kw in s.get('keywords', []):
-            if kw and kw in msg_lower:
-                score += 10
-
-        # Name match boost
-        if s['name'].replace('-', ' ').replace('_', ' ') in msg_lower:
-            score += 15
-
-        # Content overlap
-        skill_words = set(re.findall(r"\w+", s.get('content', '').lower()[:5000]))
-        overlap = len(msg_words & skill_words)
-        score += overlap
-
+    for name in _SKILL_INDEX['order']:
+        score = scores.get(name, 0)
         if score > best_score:
             best_score = score
-            best = s
+            best = SKILLS[name]
 
     return best if best_score >= 3 else None
 
@@ -1188,7 +2115,15 @@ def _extract_openai_content(choice_message):
     return str(content).strip()
 
 
-def _call_openai_compatible(base_url, api_key, model, skill_context, message, max_tokens=2000, extra_headers=None):
+def _record_llm_usage(provider, input_tokens, output_tokens):
+    if input_tokens:
+        LLM_TOKENS.inc(provider, 'input', amount=input_tokens)
+    if output_tokens:
+        LLM_TOKENS.inc(provider, 'output', amount=output_tokens)
+
+
+def _call_openai_compatible(base_url, api_key, model, skill_context, message, max_tokens=2000, extra_headers=None,
+                            provider='openai'):
     if not api_key:
         raise ValueError('API key not configured')
 
@@ -1211,11 +2146,13 @@ def _call_openai_compatible(base_url, api_key, model, skill_context, message, ma
         'messages': messages,
     }
 
-    resp = requests.post(url, headers=headers, json=payload, timeout=DEFAULT_OUTBOUND_TIMEOUT)
+    resp = outbound_http.post(url, headers=headers, json=payload)
     if not resp.ok:
         logger.error('OpenAI-compatible API error: %s - %s', resp.status_code, resp.text[:500])
     resp.raise_for_status()
     data = resp.json()
+    usage = data.get('usage') or {}
+    _record_llm_usage(provider, usage.get('prompt_tokens'), usage.get('completion_tokens'))
     choices = data.get('choices', [])
     if choices:
         msg = choices[0].get('message', {})
@@ -1242,59 +2179,394 @@ def _call_anthropic_only(skill_context, message, max_tokens=2000):
     if skill_context:
         payload['system'] = skill_context
 
-    resp = requests.post(url, headers=headers, json=payload, timeout=DEFAULT_OUTBOUND_TIMEOUT)
+    resp = outbound_http.post(url, headers=headers, json=payload)
     if not resp.ok:
         logger.error('Anthropic API error: %s - %s', resp.status_code, resp.text[:500])
     resp.raise_for_status()
     data = resp.json()
+    usage = data.get('usage') or {}
+    _record_llm_usage('anthropic', usage.get('input_tokens'), usage.get('output_tokens'))
     content = data.get('content', [])
     if content and len(content) > 0:
         return content[0].get('text', '').strip()
     return ''
 
 
-def call_anthropic(skill_context, message, max_tokens=2000):
-    """LLM call with provider fallback. Keeps legacy function name for compatibility."""
-    errors = []
+def _iter_sse_json(resp):
+    """Yield the JSON payload of each `data:` line of an upstream event stream."""
+    # Decode bytes ourselves: requests assumes latin-1 for text/event-stream without a charset
+    for raw in resp.iter_lines():
+        line = raw.decode('utf-8', errors='replace') if isinstance(raw, bytes) else raw
+        if not line.startswith('data:'):
+            continue
+        data = line[5:].strip()
+        if data == '[DONE]':
+            return
+        try:
+            yield json.loads(data)
+        except ValueError:
+            continue
+
+
+def _stream_openai_compatible(base_url, api_key, model, system, messages, max_tokens=2000, extra_headers=None,
+                              provider='openai'):
+    """Yield text deltas from an OpenAI-compatible chat completion with stream=true."""
+    if not api_key:
+        raise ValueError('API key not configured')
+
+    url = f"{base_url.rstrip('/')}/chat/completions"
+    headers = {
+        'Authorization': f'Bearer {api_key}',
+        'Content-Type': 'application/json',
+        'Accept': 'text/event-stream',
+    }
+    if extra_headers:
+        headers.update(extra_headers)
+
+    payload = {
+        'model': model,
+        'max_tokens': max_tokens,
+        'messages': ([{'role': 'system', 'content': system}] if system else []) + list(messages),
+        'stream': True,
+        'stream_options': {'include_usage': True},
+    }
+
+    resp = outbound_http.post(url, headers=headers, json=payload, stream=True)
+    try:
+        if not resp.ok:
+            logger.error('OpenAI-compatible API error: %s - %s', resp.status_code, resp.text[:500])
+        resp.raise_for_status()
+        for event in _iter_sse_json(resp):
+            if event.get('error'):
+                raise RuntimeError(str(event['error'])[:200])
+            if event.get('usage'):
+                _record_llm_usage(provider, event['usage'].get('prompt_tokens'), event['usage'].get('completion_tokens'))
+            choices = event.get('choices') or []
+            if choices:
+                delta = (choices[0].get('delta') or {}).get('content')
+                if delta:
+                    yield delta
+    finally:
+        resp.close()
+
+
+def _stream_anthropic(api_key, model, system, messages, max_tokens=2000, version='2024-10-22'):
+    """Yield text deltas from the Anthropic messages API with stream=true."""
+    if not api_key:
+        raise ValueError('ANTHROPIC_API_KEY not configured')
+
+    headers = {
+        'x-api-key': api_key,
+        'Content-Type': 'application/json',
+        'anthropic-version': version,
+        'Accept': 'text/event-stream',
+    }
+    payload = {
+        'model': model,
+        'max_tokens': max_tokens,
+        'messages': list(messages),
+        'stream': True,
+    }
+    if system:
+        payload['system'] = system
+
+    resp = outbound_http.post('https://api.anthropic.com/v1/messages', headers=headers, json=payload, stream=True)
+    try:
+        if not resp.ok:
+            logger.error('Anthropic API error: %s - %s', resp.status_code, resp.text[:500])
+        resp.raise_for_status()
+        for event in _iter_sse_json(resp):
+            kind = event.get('type')
+            if kind == 'message_start':
+                _record_llm_usage('anthropic', ((event.get('message') or {}).get('usage') or {}).get('input_tokens'), None)
+            elif kind == 'message_delta':
+                _record_llm_usage('anthropic', None, (event.get('usage') or {}).get('output_tokens'))
+            elif kind == 'content_block_delta':
+                text = (event.get('delta') or {}).get('text')
+                if text:
+                    yield text
+            elif kind == 'error':
+                raise RuntimeError((event.get('error') or {}).get('message') or 'Anthropic stream error')
+            elif kind == 'message_stop':
+                return
+    finally:
+        resp.close()
+
+llm_cache = None
+if Config.LLM_CACHE_ENABLED:
+    try:
+        llm_cache = LLMResponseCache(Config.LLM_CACHE_DB_PATH, ttl=Config.LLM_CACHE_TTL, max_entries=Config.LLM_CACHE_MAX_ENTRIES)
+    except sqlite3.Error as e:
+        logger.warning(f"LLM response cache disabled: {e}")
+
+
+def _llm_provider_call(provider, skill_context, message, max_tokens):
+    """Return (model, callable) for a configured provider, or (None, None)."""
+    if provider == 'openrouter' and Config.OPENROUTER_API_KEY:
+        return Config.OPENROUTER_MODEL, lambda: _call_openai_compatible(
+            Config.OPENROUTER_BASE_URL,
+            Config.OPENROUTER_API_KEY,
+            Config.OPENROUTER_MODEL,
+            skill_context,
+            message,
+            max_tokens=max_tokens,
+            extra_headers={
+                'HTTP-Referer': Config.OPENROUTER_SITE_URL,
+                'X-Title': Config.OPENROUTER_APP_NAME,
+            },
+            provider='openrouter',
+        )
+    if provider == 'openai' and Config.OPENAI_API_KEY:
+        return Config.OPENAI_MODEL, lambda: _call_openai_compatible(
+            Config.OPENAI_BASE_URL,
+            Config.OPENAI_API_KEY,
+            Config.OPENAI_MODEL,
+            skill_context,
+            message,
+            max_tokens=max_tokens,
+        )
+    if provider == 'anthropic' and Config.ANTHROPIC_API_KEY:
+        return Config.ANTHROPIC_MODEL, lambda: _call_anthropic_only(skill_context, message, max_tokens=max_tokens)
+    return None, None
+
+
+def _llm_cache_op(op, *args):
+    # A cache failure must never cost us the provider call
+    try:
+        return getattr(llm_cache, op)(*args)
+    except sqlite3.Error as e:
+        logger.warning(f"LLM response cache {op} failed: {e}")
+        return None
+
+
+def _parse_provider_concurrency(raw):
+    try:
+        limits = json.loads(raw) if raw else {}
+    except ValueError:
+        logger.warning("Ignoring invalid LLM_PROVIDER_CONCURRENCY: %s", raw)
+        return {}
+    return {str(k).lower(): int(v) for k, v in limits.items()} if isinstance(limits, dict) else {}
+
+
+def _observe_llm_call(provider, ok, latency):
+    # Streams call llm_router.record without a latency and are measured in _timed_stream
+    if latency is None:
+        return
+    LLM_REQUESTS.inc(provider, 'call', 'ok' if ok else 'error')
+    LLM_REQUEST_SECONDS.observe(latency, provider, 'call')
+
+
+llm_router = ProviderRouter(RouterPolicy(
+    window=Config.LLM_ROUTER_WINDOW,
+    failure_threshold=Config.LLM_ROUTER_FAILURE_THRESHOLD,
+    error_rate_threshold=Config.LLM_ROUTER_ERROR_RATE,
+    cooldown=Config.LLM_ROUTER_COOLDOWN,
+    hedge=Config.LLM_ROUTER_HEDGE,
+    hedge_min_delay=Config.LLM_ROUTER_HEDGE_MIN_DELAY,
+    hedge_max_delay=Config.LLM_ROUTER_HEDGE_MAX_DELAY,
+    concurrency=_parse_provider_concurrency(Config.LLM_PROVIDER_CONCURRENCY),
+), on_record=_observe_llm_call)
+
+
+def _describe_llm_error(provider, error):
+    if isinstance(error, CircuitOpenError):
+        logger.info('LLM provider=%s skipped: circuit open', provider)
+        return f'{provider}: circuit open'
+    if isinstance(error, Timeout):
+        logger.warning('LLM request timed out via provider=%s after %ss', provider, DEFAULT_OUTBOUND_TIMEOUT)
+        return f'{provider}: timeout'
+    if isinstance(error, RequestException):
+        logger.error('LLM request failed via provider=%s: %s', provider, error)
+        return f'{provider}: request_failed'
+    logger.error('LLM provider error via provider=%s: %s', provider, error)
+    return f'{provider}: {str(error)[:120]}'
+
+
+def call_anthropic(skill_context, message, max_tokens=2000, cache=False):
+    """LLM call with provider fallback. Keeps legacy function name for compatibility.
+
+    With cache=True, identical (provider, model, system, message, max_tokens) requests
+    are served from the response cache. Caching persists prompts and answers to disk,
+    so it is opt-in and only used for generic chat, never for transcripts or client data.
+    Misses go through llm_router, which skips providers with an open circuit and,
+    with LLM_ROUTER_HEDGE=1, races the next provider once the first is slower than its p95.
+    """
+    use_cache = cache and llm_cache is not None
+    candidates = []
+    models = {}
     for provider in _provider_order():
+        model, invoke = _llm_provider_call(provider, skill_context, message, max_tokens)
+        if invoke is None:
+            continue
+        if use_cache:
+            cached = _llm_cache_op('get', provider, model, skill_context, message, max_tokens)
+            if cached is not None:
+                return cached
+        models[provider] = model
+        candidates.append((provider, invoke))
+
+    try:
+        provider, response_text = llm_router.call(candidates)
+    except AllProvidersFailed as e:
+        details = ' | '.join(_describe_llm_error(p, err) for p, err in e.errors) or 'No API key configured'
+        raise RuntimeError(f'All configured LLM providers failed. Details: {details}')
+    if use_cache:
+        _llm_cache_op('put', provider, models[provider], skill_context, message, max_tokens, response_text)
+    return response_text
+
+
+def _llm_provider_stream(provider, system, messages, max_tokens):
+    """Return (model, generator factory) for a configured provider, or (None, None)."""
+    if provider == 'openrouter' and Config.OPENROUTER_API_KEY:
+        return Config.OPENROUTER_MODEL, lambda: _stream_openai_compatible(
+            Config.OPENROUTER_BASE_URL,
+            Config.OPENROUTER_API_KEY,
+            Config.OPENROUTER_MODEL,
+            system,
+            messages,
+            max_tokens=max_tokens,
+            extra_headers={
+                'HTTP-Referer': Config.OPENROUTER_SITE_URL,
+                'X-Title': Config.OPENROUTER_APP_NAME,
+            },
+            provider='openrouter',
+        )
+    if provider == 'openai' and Config.OPENAI_API_KEY:
+        return Config.OPENAI_MODEL, lambda: _stream_openai_compatible(
+            Config.OPENAI_BASE_URL,
+            Config.OPENAI_API_KEY,
+            Config.OPENAI_MODEL,
+            system,
+            messages,
+            max_tokens=max_tokens,
+        )
+    if provider == 'anthropic' and Config.ANTHROPIC_API_KEY:
+        return Config.ANTHROPIC_MODEL, lambda: _stream_anthropic(
+            Config.ANTHROPIC_API_KEY, Config.ANTHROPIC_MODEL, system, messages, max_tokens=max_tokens
+        )
+    return None, None
+
+
+_ttft_samples = defaultdict(lambda: deque(maxlen=Config.LLM_TTFT_SAMPLES))
+_ttft_lock = threading.Lock()
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(math.ceil(pct / 100.0 * len(ordered))) - 1)]
+
+
+def _record_ttft(route, provider, started, cached=False):
+    ttft_ms = (time.perf_counter() - started) * 1000
+    with _ttft_lock:
+        _ttft_samples[f"{route}/{provider}"].append(ttft_ms)
+    LLM_TTFT_SECONDS.observe(ttft_ms / 1000, route, provider)
+    logger.info(f"[LLM] ttft_ms={ttft_ms:.0f} route={route} provider={provider}{' cached' if cached else ''}")
+    return ttft_ms
+
+
+def llm_ttft_metrics():
+    """Rolling time-to-first-token percentiles per route/provider, in milliseconds."""
+    with _ttft_lock:
+        snapshot = {key: list(samples) for key, samples in _ttft_samples.items()}
+    return {
+        key: {
+            'count': len(samples),
+            'last_ms': round(samples[-1], 1),
+            'p50_ms': round(_percentile(samples, 50), 1),
+            'p95_ms': round(_percentile(samples, 95), 1),
+        }
+        for key, samples in snapshot.items() if samples
+    }
+
+
+def _timed_stream(route, provider, deltas, started=None):
+    """Pass deltas through, recording time-to-first-token and logging the completed stream."""
+    started = started or time.perf_counter()
+    chars = 0
+    try:
+        for delta in deltas:
+            if not chars:
+                _record_ttft(route, provider, started)
+            chars += len(delta)
+            yield delta
+    except Exception:
+        LLM_REQUESTS.inc(provider, 'stream', 'error')
+        raise
+    elapsed = time.perf_counter() - started
+    LLM_REQUESTS.inc(provider, 'stream', 'ok')
+    LLM_REQUEST_SECONDS.observe(elapsed, provider, 'stream')
+    logger.info(f"[LLM] stream complete route={route} provider={provider} "
+                f"total_ms={elapsed * 1000:.0f} chars={chars}")
+
+
+def stream_llm(system, messages, max_tokens=2000, route='chat', cache=False):
+    """Streaming counterpart of call_anthropic: yields completion text as it arrives.
+
+    Providers are tried in LLM_PROVIDER_ORDER (skipping open circuits, and holding the
+    provider's concurrency slot while its stream is open), but only
+    until the first token has been yielded; after that a failure propagates, since the client already has
+    part of the answer. Single-turn requests with cache=True share call_anthropic's
+    response cache, so a hit is yielded as one chunk.
+    """
+    message = messages[0]['content'] if len(messages) == 1 else None
+    use_cache = cache and llm_cache is not None and message is not None
+    configured = [(p, _llm_provider_stream(p, system, messages, max_tokens)) for p in _provider_order()]
+    candidates, skipped = llm_router.route([(p, pair) for p, pair in configured if pair[1] is not None])
+    errors = [f'{p}: circuit open' for p, _ in skipped]
+    for provider, (model, open_stream) in candidates:
+        started = time.perf_counter()
+        if use_cache:
+            cached = _llm_cache_op('get', provider, model, system, message, max_tokens)
+            if cached is not None:
+                _record_ttft(route, provider, started, cached=True)
+                yield cached
+                return
+        if not llm_router.admit(provider):
+            errors.append(f'{provider}: circuit open')
+            continue
+        parts = []
         try:
-            if provider == 'openrouter' and Config.OPENROUTER_API_KEY:
-                return _call_openai_compatible(
-                    Config.OPENROUTER_BASE_URL,
-                    Config.OPENROUTER_API_KEY,
-                    Config.OPENROUTER_MODEL,
-                    skill_context,
-                    message,
-                    max_tokens=max_tokens,
-                    extra_headers={
-                        'HTTP-Referer': Config.OPENROUTER_SITE_URL,
-                        'X-Title': Config.OPENROUTER_APP_NAME,
-                    },
-                )
-            if provider == 'openai' and Config.OPENAI_API_KEY:
-                return _call_openai_compatible(
-                    Config.OPENAI_BASE_URL,
-                    Config.OPENAI_API_KEY,
-                    Config.OPENAI_MODEL,
-                    skill_context,
-                    message,
-                    max_tokens=max_tokens,
-                )
-            if provider == 'anthropic' and Config.ANTHROPIC_API_KEY:
-                return _call_anthropic_only(skill_context, message, max_tokens=max_tokens)
-        except Timeout:
-            logger.warning('LLM request timed out via provider=%s after %ss', provider, DEFAULT_OUTBOUND_TIMEOUT)
-            errors.append(f'{provider}: timeout')
-        except RequestException as e:
-            logger.error('LLM request failed via provider=%s: %s', provider, e)
-            errors.append(f'{provider}: request_failed')
+            with llm_router.slot(provider):
+                for delta in _timed_stream(route, provider, open_stream(), started):
+                    parts.append(delta)
+                    yield delta
+        except GeneratorExit:
+            # The client disconnected: says nothing about the provider, but a half-open trial must be freed
+            llm_router.release(provider)
+            raise
         except Exception as e:
-            logger.error('LLM provider error via provider=%s: %s', provider, e)
-            errors.append(f'{provider}: {str(e)[:120]}')
+            # Streams feed the circuit breaker but not the latency window, which tracks whole calls
+            llm_router.record(provider, False)
+            if parts:
+                raise
+            errors.append(_describe_llm_error(provider, e))
+            continue
+        llm_router.record(provider, True)
+        if use_cache:
+            _llm_cache_op('put', provider, model, system, message, max_tokens, ''.join(parts))
+        return
 
     details = ' | '.join(errors) if errors else 'No API key configured'
     raise RuntimeError(f'All configured LLM providers failed. Details: {details}')
 
+
+def _wants_stream(data):
+    return data.get('stream') is True or 'text/event-stream' in (request.headers.get('Accept') or '')
+
+
+def _sse_response(generator):
+    return app.response_class(generator, mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
+
+
+def _sse_frame(event_type, payload):
+    return f"event: {event_type}\ndata: {json.dumps(payload, separators=(',', ':'), default=str)}\n\n"
+
 # =============================================================================
 # MICROSOFT GRAPH INTEGRATION
 # =============================================================================
@@ -1322,7 +2594,7 @@ class GraphClient:
             'scope': Config.GRAPH_SCOPES
         }
 
-        resp = requests.post(token_url, data=data, timeout=30)
+        resp = outbound_http.post(token_url, data=data)
         resp.raise_for_status()
         token_data = resp.json()
 
@@ -1338,7 +2610,7 @@ class GraphClient:
         headers.setdefault('Content-Type', 'application/json')
 
         url = f"{self.base_url}{endpoint}" if endpoint.startswith('/') else f"{self.base_url}/{endpoint}"
-        resp = requests.request(method, url, headers=headers, timeout=60, **kwargs)
+        resp = outbound_http.request(method, url, headers=headers, **kwargs)
         resp.raise_for_status()
 
         return resp.json() if resp.content else {}
@@ -1411,7 +2683,7 @@ class GraphClient:
         drive_endpoint = f"/sites/{site_id}/drive/root:/{Config.SHAREPOINT_CLIENT_RECORDS_FOLDER}/{folder_path}/{filename}:/content"
 
         headers = {'Content-Type': content_type}
-        resp = requests.put(
+        resp = outbound_http.put(
             f"{self.base_url}{drive_endpoint}",
             headers={
                 'Authorization': f'Bearer {self.get_token()}',
@@ -1455,7 +2727,7 @@ class DialpadClient:
         headers.setdefault('Content-Type', 'application/json')
 
         url = f"{self.base_url}{endpoint}"
-        resp = requests.request(method, url, headers=headers, timeout=30, **kwargs)
+        resp = outbound_http.request(method, url, headers=headers, **kwargs)
         resp.raise_for_status()
 
         return resp.json() if resp.content else {}
@@ -1549,7 +2821,7 @@ class QuickBooksClient:
         }
 
         url = f"{self.base_url}/company/{Config.QUICKBOOKS_REALM_ID}/invoice"
-        resp = requests.post(url, headers=headers, json=invoice_data, timeout=30)
+        resp = outbound_http.post(url, headers=headers, json=invoice_data)
         resp.raise_for_status()
         return resp.json()
 
@@ -1618,9 +2890,46 @@ def health():
         'status': status,
         'services': services,
         'skills_count': len(SKILLS),
+        'lead_db_pool': lead_store.pool_stats(),
+        'outbound_http': outbound_http.stats(),
+        'godaddy_live_sync': godaddy_live_sync.metrics(),
+        'realtime_emitter': dashboard_emitter.stats(),
+        'event_stream': event_hub.stats(),
+        'rate_limiter': rate_limiter.stats(),
+        'llm_ttft': llm_ttft_metrics(),
+        'startup': boot_profiler.report(),
         'timestamp': datetime.now(timezone.utc).isoformat()
     }), 200
 
+def _component_stat_values():
+    values = {}
+
+    def add(component, stats, keys):
+        for key in keys:
+            value = stats.get(key)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                values[(component, key)] = value
+
+    add('lead_db_pool', lead_store.pool_stats(), ('open_connections', 'opens', 'reuses'))
+    add('realtime_emitter', dashboard_emitter.stats(), ('queued', 'emitted', 'dropped', 'failed'))
+    add('event_stream', event_hub.stats(), ('subscribers', 'published', 'subscriber_dropped'))
+    add('rate_limiter', rate_limiter.stats(), ('tracked_keys', 'allowed', 'limited'))
+    add('draft_generator', draft_generator.metrics(), ('runs', 'drafted', 'fallbacks'))
+    if llm_cache is not None:
+        add('llm_cache', llm_cache.stats(), ('entries', 'hits', 'misses', 'evictions'))
+    return values
+
+
+metrics_registry.gauge(
+    'trifecta_component_stat', 'Counters and queue depths reported by in-process components', ('component', 'stat')
+).set_function(_component_stat_values)
+
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Prometheus text exposition of request, SQLite, outbound HTTP and LLM metrics for this worker."""
+    return app.response_class(metrics_registry.render(), content_type=METRICS_CONTENT_TYPE)
+
 @app.route('/api-docs', methods=['GET'])
 def api_docs():
     """Minimal OpenAPI 3.0 spec for key endpoints."""
@@ -1846,6 +3155,35 @@ def dashboard_mission_control():
         logger.error("Mission control payload error: %s", exc)
         return jsonify({'error': str(exc), 'generated_at': utcnow_iso()}), 500
 
+@app.route('/api/stream', methods=['GET'])
+def event_stream():
+    """Server-Sent Events feed of lead:new, lead:updated, outbound:sent and metrics:updated deltas.
+
+    Optional ?topics=a,b filters event types; Last-Event-ID (header or ?last_event_id)
+    replays buffered events missed during a reconnect.
+    """
+    topics = [t.strip() for t in (request.args.get('topics') or '').split(',') if t.strip()]
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+    if event_hub.stats()['subscribers'] >= Config.STREAM_MAX_CLIENTS:
+        return jsonify({'error': 'Too many stream clients; fall back to polling', 'code': 'stream_capacity'}), 503
+    subscription = event_hub.subscribe(topics or None, last_event_id=last_event_id)
+    heartbeat = Config.STREAM_HEARTBEAT_SECONDS
+
+    def generate():
+        try:
+            yield f"retry: 5000\n: connected {utcnow_iso()}\n\n"
+            while not subscription.closed:
+                event = subscription.get(timeout=heartbeat)
+                yield format_sse(event) if event else ": keepalive\n\n"
+        finally:
+            event_hub.unsubscribe(subscription)
+
+    return _sse_response(generate())
+
 @app.route('/api/agent/status', methods=['GET'])
 def agent_status():
     """Agent status endpoint for dashboard."""
@@ -1929,8 +3267,34 @@ def reload_skills():
 # =============================================================================
 # API ENDPOINTS - Chat
 # =============================================================================
+def _stream_chat_reply(skill_context, message, matched, skill_sections, cache=True):
+    """SSE body for /api/chat: a `token` event per delta, then `done` with the full reply."""
+    parts = []
+    try:
+        for delta in stream_llm(skill_context, [{'role': 'user', 'content': message}], route='chat', cache=cache):
+            parts.append(delta)
+            yield _sse_frame('token', {'text': delta})
+    except Exception as e:
+        logger.error('Streaming chat failed: %s', e)
+        if parts:
+            yield _sse_frame('error', {'error': 'Stream interrupted', 'code': 'stream_interrupted'})
+        else:
+            if matched:
+                fallback = f"[Skill: {matched['title']}]\n\n{skill_context[:500]}..."
+            else:
+                fallback = "I'm unable to process your request right now. Please try again."
+            parts.append(fallback)
+            yield _sse_frame('token', {'text': fallback})
+    yield _sse_frame('done', {
+        'reply': ''.join(parts),
+        'matched_skill': matched['name'] if matched else None,
+        'skill_title': matched['title'] if matched else None,
+        'skill_sections': [sec['heading'] for sec in skill_sections],
+        'timestamp': datetime.now(timezone.utc).isoformat()
+    })
+
 @app.route('/api/chat', methods=['POST'])
-@rate_limit
+@rate_limit('chat')
 def chat():
     """Chat endpoint with skill matching and Claude AI."""
     try:
@@ -1949,14 +3313,18 @@ def chat():
         matched = match_skill(message)
         skill_context = ''
 
+        skill_sections = []
         if matched:
-            skill_context = matched.get('content', '')
-            if len(skill_context) > 8000:
-                skill_context = skill_context[:8000] + '\n\n[truncated for context limit]'
+            skill_context, skill_sections = build_skill_context(message, matched)
+
+        if _wants_stream(data):
+            return _sse_response(_stream_chat_reply(
+                skill_context, message, matched, skill_sections, cache=data.get('cache') is True
+            ))
 
         # Call Claude
         try:
-            response_text = call_anthropic(skill_context, message)
+            response_text = call_anthropic(skill_context, message, cache=data.get('cache') is True)
         except Timeout:
             logger.warning('LLM request timed out')
             response_text = "Service timed out, please try again."
@@ -1971,6 +3339,7 @@ def chat():
             'reply': response_text,
             'matched_skill': matched['name'] if matched else None,
             'skill_title': matched['title'] if matched else None,
+            'skill_sections': [sec['heading'] for sec in skill_sections],
             'timestamp': datetime.now(timezone.utc).isoformat()
         }), 200
 
@@ -2258,7 +3627,7 @@ def send_telegram_alert(message):
     url = f"https://api.telegram.org/bot{Config.TELEGRAM_BOT_TOKEN}/sendMessage"
     payload = {"chat_id": Config.TELEGRAM_CHAT_ID, "text": message}
     try:
-        requests.post(url, json=payload, timeout=DEFAULT_OUTBOUND_TIMEOUT)
+        outbound_http.post(url, json=payload)
         return True
     except Exception as exc:
         logger.warning("Telegram alert failed: %s", exc)
@@ -2406,7 +3775,7 @@ def generate_draft_for_lead(lead, user_prompt=None):
         f"Lead question: {lead.get('initial_question')}\n\n"
         "Generate the outreach email draft now."
     )
-    raw = call_anthropic(LEAD_SYSTEM_PROMPT, prompt, max_tokens=1800)
+    raw = call_anthropic(LEAD_SYSTEM_PROMPT, prompt, max_tokens=1800, cache=False)
     draft_obj = parse_json_object(raw) or {}
     if not isinstance(draft_obj, dict):
         draft_obj = {}
@@ -2439,17 +3808,12 @@ def generate_draft_for_lead(lead, user_prompt=None):
     }
 
 
-def maybe_generate_draft(lead):
-    if not (lead.get('email') or lead.get('phone')):
-        return None
-    latest = lead_store.get_latest_draft(lead['id'])
-    if latest and latest.get('state') in {'drafted', 'approved', 'sent'}:
-        return latest
+def _generate_draft_or_fallback(lead):
     try:
-        generated = generate_draft_for_lead(lead)
+        return generate_draft_for_lead(lead)
     except Exception as exc:
         logger.error("Draft generation failed: %s", exc)
-        generated = {
+        return {
             'model': 'fallback-template',
             'prompt_version': Config.LEAD_PROMPT_VERSION,
             'subject': f"Trifecta Program Information for {lead.get('name', 'you')}",
@@ -2459,6 +3823,21 @@ def maybe_generate_draft(lead):
             'risk_flags': ['model_unavailable'],
             'citations_used': ['fallback-template']
         }
+
+
+def _draft_next_status(generated):
+    if (generated['confidence'] < Config.LEAD_DRAFT_CONFIDENCE_THRESHOLD) or generated['risk_flags']:
+        return LEAD_STATUS['NEEDS_HUMAN_REVIEW']
+    return LEAD_STATUS['DRAFT_CREATED']
+
+
+def maybe_generate_draft(lead):
+    if not (lead.get('email') or lead.get('phone')):
+        return None
+    latest = lead_store.get_latest_draft(lead['id'])
+    if latest and latest.get('state') in {'drafted', 'approved', 'sent'}:
+        return latest
+    generated = _generate_draft_or_fallback(lead)
     draft = lead_store.create_draft(
         lead_id=lead['id'],
         model=generated['model'],
@@ -2470,33 +3849,309 @@ def maybe_generate_draft(lead):
         risk_flags=generated['risk_flags'],
         citations=generated['citations_used']
     )
-    next_status = LEAD_STATUS['DRAFT_CREATED']
-    if (generated['confidence'] < Config.LEAD_DRAFT_CONFIDENCE_THRESHOLD) or generated['risk_flags']:
-        next_status = LEAD_STATUS['NEEDS_HUMAN_REVIEW']
-    lead_after, err = lead_store.set_lead_status(lead['id'], next_status)
+    lead_after, err = lead_store.set_lead_status(lead['id'], _draft_next_status(generated))
     if err:
         logger.warning("Lead status transition skipped: %s", err)
+    else:
+        _publish_lead_change('lead:updated', lead_after)
     lead_store.add_audit('system', 'draft_created', 'lead', lead['id'], lead, lead_after or lead)
     return draft
 
 
-def log_lead_to_sheets(lead_data: dict) -> bool:
-    """Log a new lead to Google Sheets. Returns True if successful."""
-    try:
-        creds_path = os.path.join(_base_dir, 'google-credentials.json')
-        if not os.path.exists(creds_path):
-            logger.warning("Google Sheets: google-credentials.json not found, skipping")
-            return False
+class DraftBatchGenerator:
+    """Bulk draft generation: LLM calls fan out over a bounded thread pool, results commit in batches.
+
+    Per-provider concurrency is capped by llm_router (LLM_PROVIDER_CONCURRENCY), so a
+    wide pool cannot stampede a single provider. Each batch of drafts, status
+    transitions and audit rows is written in one transaction.
+    """
+
+    def __init__(self, workers=4, commit_batch=10):
+        self.workers = max(1, workers)
+        self.commit_batch = max(1, commit_batch)
+        self._stats_lock = threading.Lock()
+        self.runs = 0
+        self.drafted = 0
+        self.fallbacks = 0
+        self.busy_seconds = 0.0
+        self.last_run = None
+
+    def _commit(self, pending, summary):
+        for (lead, generated, _), (draft, lead_after, err) in zip(pending, lead_store.commit_draft_batch(pending)):
+            summary['drafted'] += 1
+            if generated['model'] == 'fallback-template':
+                summary['fallbacks'] += 1
+            if err:
+                logger.warning("Lead status transition skipped for %s: %s", lead['id'], err)
+            else:
+                if lead_after['status'] == LEAD_STATUS['NEEDS_HUMAN_REVIEW']:
+                    summary['needs_review'] += 1
+                _publish_lead_change('lead:updated', lead_after)
+        pending.clear()
+
+    def run(self, leads):
+        """Draft every lead with contact details and no draft yet; returns a run summary."""
+        started = time.perf_counter()
+        candidates = [lead for lead in leads if lead.get('email') or lead.get('phone')]
+        existing = lead_store.latest_draft_states([lead['id'] for lead in candidates])
+        todo = [lead for lead in candidates if lead['id'] not in existing]
+        summary = {
+            'candidates': len(leads),
+            'skipped': len(leads) - len(todo),
+            'drafted': 0,
+            'needs_review': 0,
+            'fallbacks': 0,
+        }
+        pending = []
+        if todo:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(todo)), thread_name_prefix='draft-gen') as pool:
+                futures = {pool.submit(_generate_draft_or_fallback, lead): lead for lead in todo}
+                for future in as_completed(futures):
+                    lead = futures[future]
+                    generated = future.result()
+                    pending.append((lead, generated, _draft_next_status(generated)))
+                    if len(pending) >= self.commit_batch:
+                        self._commit(pending, summary)
+            if pending:
+                self._commit(pending, summary)
+        elapsed = time.perf_counter() - started
+        summary['seconds'] = round(elapsed, 3)
+        summary['drafts_per_minute'] = round(summary['drafted'] / elapsed * 60, 2) if elapsed and summary['drafted'] else 0.0
+        summary['finished_at'] = utcnow_iso()
+        with self._stats_lock:
+            self.runs += 1
+            self.drafted += summary['drafted']
+            self.fallbacks += summary['fallbacks']
+            self.busy_seconds += elapsed
+            self.last_run = summary
+        return summary
+
+    def metrics(self):
+        with self._stats_lock:
+            return {
+                'workers': self.workers,
+                'commit_batch': self.commit_batch,
+                'runs': self.runs,
+                'drafted': self.drafted,
+                'fallbacks': self.fallbacks,
+                'drafts_per_minute': round(self.drafted / self.busy_seconds * 60, 2) if self.busy_seconds else 0.0,
+                'last_run': self.last_run,
+            }
+
+
+draft_generator = DraftBatchGenerator(workers=Config.LEAD_DRAFT_CONCURRENCY, commit_batch=Config.LEAD_DRAFT_COMMIT_BATCH)
+
+
+SHEETS_COL_EMAIL = 3
+SHEETS_COL_PHONE = 4
+
+
+def _sheets_a1(row, col):
+    letters = ''
+    while col:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(65 + rem) + letters
+    return f"{letters}{row}"
+
+
+class LeadSheetWriter:
+    """Cached, batched writer for the lead tracking Google Sheet.
+
+    The gspread client/worksheet are opened once and reused, lead rows are
+    located through an email/phone -> row index instead of sheet.find(), and
+    appends and cell updates are buffered and flushed together (one
+    append_rows + one batch_update per flush window).
+    """
 
+    def __init__(self, open_worksheet=None, flush_interval=None, index_ttl=None):
+        self._open_worksheet = open_worksheet or self._open_default_worksheet
+        self.flush_interval = Config.SHEETS_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self.index_ttl = Config.SHEETS_INDEX_TTL if index_ttl is None else index_ttl
+        self._lock = threading.RLock()
+        self._worksheet = None
+        self._row_index = {}
+        self._index_loaded_at = 0.0
+        self._pending_rows = []       # [{'row': [...], 'keys': [...]}]
+        self._pending_cells = {}      # (row, col) -> value
+        self._flush_timer = None
+        self._failed_flushes = 0      # consecutive, drives the retry backoff
+        self.stats = {'appends': 0, 'cell_updates': 0, 'flushes': 0, 'failed_flushes': 0,
+                      'api_calls': 0, 'index_loads': 0}
+
+    @staticmethod
+    def _creds_path():
+        return os.path.join(_base_dir, 'google-credentials.json')
+
+    @staticmethod
+    def _open_default_worksheet():
         import gspread
         from google.oauth2.service_account import Credentials
 
         scopes = ['https://www.googleapis.com/auth/spreadsheets']
-        creds = Credentials.from_service_account_file(creds_path, scopes=scopes)
+        creds = Credentials.from_service_account_file(LeadSheetWriter._creds_path(), scopes=scopes)
         client = gspread.authorize(creds)
-
         sheet_id = os.environ.get('GOOGLE_SHEETS_ID', '1aV55LlDzyfqVu4maXLxfN55cb_NPBnU21BjeqVbqnL0')
-        sheet = client.open_by_key(sheet_id).sheet1
+        return client.open_by_key(sheet_id).sheet1
+
+    def enabled(self):
+        if self._open_worksheet is not LeadSheetWriter._open_default_worksheet:
+            return True
+        return os.path.exists(self._creds_path())
+
+    def _sheet(self):
+        if self._worksheet is None:
+            self._worksheet = self._open_worksheet()
+        return self._worksheet
+
+    def _reset(self):
+        self._worksheet = None
+        self._index_loaded_at = 0.0
+
+    @staticmethod
+    def _keys(email=None, phone=None):
+        keys = []
+        if email and normalize_email(email):
+            keys.append(normalize_email(email))
+        if phone and normalize_phone(phone):
+            keys.append(normalize_phone(phone))
+        return keys
+
+    def _load_index(self):
+        sheet = self._sheet()
+        emails = sheet.col_values(SHEETS_COL_EMAIL)
+        phones = sheet.col_values(SHEETS_COL_PHONE)
+        self.stats['api_calls'] += 2
+        self.stats['index_loads'] += 1
+        index = {}
+        for row_num in range(1, max(len(emails), len(phones)) + 1):
+            email = emails[row_num - 1] if row_num <= len(emails) else ''
+            phone = phones[row_num - 1] if row_num <= len(phones) else ''
+            for key in self._keys(email, phone):
+                index.setdefault(key, row_num)
+        self._row_index = index
+        self._index_loaded_at = time.time()
+
+    def _find_row(self, key):
+        if not self._index_loaded_at or time.time() - self._index_loaded_at > self.index_ttl:
+            self._load_index()
+        row_num = self._row_index.get(key)
+        if row_num is None and time.time() - self._index_loaded_at > 30:
+            # Row may have been added by hand since the index was built
+            self._load_index()
+            row_num = self._row_index.get(key)
+        return row_num
+
+    def append_lead_row(self, row, email=None, phone=None):
+        """Buffer a new lead row; flushed with other pending appends.
+
+        Returns the flush result when writes are not batched (flush_interval <= 0).
+        """
+        with self._lock:
+            self._pending_rows.append({'row': list(row), 'keys': self._keys(email, phone)})
+            self.stats['appends'] += 1
+            return self._schedule_flush()
+
+    def update_lead_cells(self, lookup_value, values):
+        """Buffer cell updates ({col: value}) for the row matching an email or phone.
+
+        Returns False when no row exists for that lead.
+        """
+        key = normalize_email(lookup_value) if '@' in (lookup_value or '') else normalize_phone(lookup_value)
+        if not key:
+            return False
+        with self._lock:
+            # Not appended yet: edit the pending row in place instead of a separate update
+            for pending in self._pending_rows:
+                if key in pending['keys']:
+                    for col, value in values.items():
+                        pending['row'].extend([''] * (col - len(pending['row'])))
+                        pending['row'][col - 1] = value
+                    self.stats['cell_updates'] += len(values)
+                    return True
+            row_num = self._find_row(key)
+            if row_num is None:
+                return False
+            for col, value in values.items():
+                self._pending_cells[(row_num, col)] = value
+            self.stats['cell_updates'] += len(values)
+            self._schedule_flush()
+        return True
+
+    def _schedule_flush(self, delay=None):
+        if delay is None:
+            if self.flush_interval <= 0:
+                return self.flush()
+            delay = self.flush_interval
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(delay, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+        return True
+
+    def flush(self):
+        """Write all buffered appends and cell updates. Returns True if nothing failed.
+
+        On failure whatever was not written goes back into the buffer and
+        another flush is scheduled with exponential backoff.
+        """
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            rows, self._pending_rows = self._pending_rows, []
+            cells, self._pending_cells = self._pending_cells, {}
+            if not rows and not cells:
+                return True
+            appended = 0
+            try:
+                sheet = self._sheet()
+                if rows:
+                    result = sheet.append_rows([p['row'] for p in rows], value_input_option='USER_ENTERED')
+                    appended = len(rows)
+                    self.stats['api_calls'] += 1
+                    updated_range = ((result or {}).get('updates') or {}).get('updatedRange', '')
+                    match = re.search(r'![A-Z]+(\d+)', updated_range)
+                    if match:
+                        first_row = int(match.group(1))
+                        for offset, pending in enumerate(rows):
+                            for key in pending['keys']:
+                                self._row_index.setdefault(key, first_row + offset)
+                    else:
+                        self._index_loaded_at = 0.0
+                if cells:
+                    sheet.batch_update([
+                        {'range': _sheets_a1(row_num, col), 'values': [[value]]}
+                        for (row_num, col), value in sorted(cells.items())
+                    ])
+                    self.stats['api_calls'] += 1
+                self.stats['flushes'] += 1
+                self._failed_flushes = 0
+                logger.info(f"Google Sheets flush: {len(rows)} rows appended, {len(cells)} cells updated")
+                return True
+            except Exception as e:
+                # Rows go back in front of anything buffered since; newer cell values win
+                self._pending_rows = rows[appended:] + self._pending_rows
+                for cell, value in cells.items():
+                    self._pending_cells.setdefault(cell, value)
+                self._failed_flushes += 1
+                self.stats['failed_flushes'] += 1
+                delay = min(max(self.flush_interval, 1.0) * 2 ** (self._failed_flushes - 1), 300.0)
+                logger.warning(f"Google Sheets flush failed (non-fatal), retrying in {delay:.0f}s: {e}")
+                self._reset()
+                self._schedule_flush(delay)
+                return False
+
+
+sheets_writer = LeadSheetWriter()
+atexit.register(sheets_writer.flush)
+
+
+def log_lead_to_sheets(lead_data: dict) -> bool:
+    """Log a new lead to Google Sheets. Returns True once written or queued for the next batched write."""
+    try:
+        if not sheets_writer.enabled():
+            logger.warning("Google Sheets: google-credentials.json not found, skipping")
+            return False
 
         row = [
             lead_data.get('created_at', '')[:10],           # A: Date Contacted
@@ -2513,8 +4168,9 @@ def log_lead_to_sheets(lead_data: dict) -> bool:
             0,                                                # L: Outreach Count (blank, filled by sent-log)
         ]
 
-        sheet.append_row(row)
-        logger.info(f"Lead logged to Google Sheets: {lead_data.get('name')}")
+        if not sheets_writer.append_lead_row(row, email=lead_data.get('email'), phone=lead_data.get('phone')):
+            return False
+        logger.info(f"Lead queued for Google Sheets: {lead_data.get('name')}")
         return True
 
     except Exception as e:
@@ -2522,6 +4178,53 @@ def log_lead_to_sheets(lead_data: dict) -> bool:
         return False
 
 
+_pipeline_metrics_timer = None
+_pipeline_metrics_lock = threading.Lock()
+
+
+def _publish_pipeline_metrics():
+    global _pipeline_metrics_timer
+    with _pipeline_metrics_lock:
+        _pipeline_metrics_timer = None
+    try:
+        event_hub.publish('metrics:updated', {'pipeline': lead_store.status_metrics()})
+    except Exception as e:
+        logger.warning(f"Pipeline metrics publish failed: {e}")
+
+
+def _schedule_pipeline_metrics_publish(delay=1.0):
+    """Coalesce a burst of lead changes into one metrics:updated delta for stream subscribers."""
+    global _pipeline_metrics_timer
+    with _pipeline_metrics_lock:
+        if _pipeline_metrics_timer is not None:
+            return
+        _pipeline_metrics_timer = threading.Timer(delay, _publish_pipeline_metrics)
+        _pipeline_metrics_timer.daemon = True
+        _pipeline_metrics_timer.start()
+
+
+def _publish_lead_change(event_type, lead, message=None):
+    """Push a lead:new / lead:updated delta to the dashboard and /api/stream."""
+    if not lead:
+        return
+    label = lead.get('name') or lead.get('email') or lead.get('phone') or 'Unknown'
+    if message is None:
+        if event_type == 'lead:new':
+            message = f"New lead captured: {label} from {lead.get('source', 'Unknown')}"
+        else:
+            message = f"Lead {label} updated: {lead.get('status')}"
+    emit_to_dashboard(event_type, message, {
+        'leadId': lead['id'],
+        'name': lead.get('name'),
+        'email': lead.get('email'),
+        'phone': lead.get('phone'),
+        'source': lead.get('source'),
+        'status': lead.get('status'),
+        'updatedAt': lead.get('updated_at'),
+    })
+    _schedule_pipeline_metrics_publish()
+
+
 def process_inbound_lead_event(normalized, raw_payload):
     existing = lead_store.lead_event_exists(normalized['source'], normalized['source_event_id'])
     if existing:
@@ -2552,6 +4255,7 @@ def process_inbound_lead_event(normalized, raw_payload):
         log_lead_to_sheets(dict(lead))
     else:
         lead_store.add_audit('system', 'lead_updated', 'lead', lead['id'], lead_before, lead)
+    _publish_lead_change('lead:new' if created else 'lead:updated', lead)
     draft = maybe_generate_draft(lead) if normalized.get('has_contact') else None
     return {'lead': lead, 'event': event, 'duplicate': False, 'draft_generated': bool(draft)}
 
@@ -2583,23 +4287,13 @@ def update_lead_status(email: str = None, phone: str = None, new_status: str = N
             lead_after = lead_store.get_lead_by_id(lead['id'])
 
         lead_store.add_audit('system', 'status_updated', 'lead', lead['id'], lead_before, lead_after)
+        _publish_lead_change('lead:updated', lead_after, f"Lead status updated to {new_status}")
 
         # Update Google Sheets if credentials exist
         try:
-            creds_path = os.path.join(_base_dir, 'google-credentials.json')
-            if os.path.exists(creds_path):
-                import gspread
-                from google.oauth2.service_account import Credentials
-                scopes = ['https://www.googleapis.com/auth/spreadsheets']
-                creds = Credentials.from_service_account_file(creds_path, scopes=scopes)
-                client = gspread.authorize(creds)
-                sheet = client.open_by_key(os.environ.get('GOOGLE_SHEETS_ID', '1aV55LlDzyfqVu4maXLxfN55cb_NPBnU21BjeqVbqnL0')).sheet1
-
-                # Find the row with this email/phone and update status column (H) and date responded (G)
-                cell = sheet.find(email_norm or phone_norm)
-                if cell:
-                    sheet.update_cell(cell.row, 7, now[:10])   # G: Date Responded
-                    sheet.update_cell(cell.row, 8, new_status)  # H: Status
+            if sheets_writer.enabled():
+                # Update status column (H) and date responded (G) for the row with this email/phone
+                if sheets_writer.update_lead_cells(email_norm or phone_norm, {7: now[:10], 8: new_status}):
                     # Also refresh I/K/L from sent-log
                     _update_lead_sheets_row(lead['id'], email=email, phone=phone)
         except Exception as e:
@@ -2754,7 +4448,7 @@ def _build_godaddy_sync_event(conversation, messages):
     }
 
 
-def _fetch_godaddy_live_payload(max_pages=None, page_size=None):
+def _fetch_godaddy_live_payload(max_pages=None, page_size=None, since=None):
     script_path = Path(_base_dir) / 'scripts' / 'godaddy_live_sync.js'
     if not script_path.exists():
         raise FileNotFoundError(f"Missing live sync script: {script_path}")
@@ -2775,6 +4469,8 @@ def _fetch_godaddy_live_payload(max_pages=None, page_size=None):
         '--chrome',
         Config.GODADDY_CHROME_PATH,
     ]
+    if since:
+        command.extend(['--since', since])
     completed = subprocess.run(
         command,
         cwd=_base_dir,
@@ -2794,18 +4490,41 @@ def _fetch_godaddy_live_payload(max_pages=None, page_size=None):
     return payload
 
 
-def sync_godaddy_live_conversations(max_pages=None, page_size=None):
-    payload = _fetch_godaddy_live_payload(max_pages=max_pages, page_size=page_size)
+def _godaddy_conversation_timestamp(conversation):
+    last_message = conversation.get('last_message') if isinstance(conversation.get('last_message'), dict) else {}
+    return last_message.get('created_at') or conversation.get('newest_message_timestamp') or conversation.get('updated_at')
+
+
+def sync_godaddy_live_conversations(max_pages=None, page_size=None, since=None, previous=None):
+    """Pull open GoDaddy conversations and run each changed one through the lead pipeline.
+
+    With an incremental cursor (`since`, the newest message timestamp seen by the
+    previous run) conversations with no activity after the cursor reuse their
+    snapshot from `previous` (conversation id -> snapshot) instead of being re-ingested.
+    """
+    payload = _fetch_godaddy_live_payload(max_pages=max_pages, page_size=page_size, since=since)
     conversations = payload.get('conversations') or []
     message_map = payload.get('messages') or {}
+    previous = previous or {}
+    cursor_dt = parse_iso_datetime(since)
+    newest_dt = cursor_dt
     snapshots = []
     ingested = 0
     duplicates = 0
+    unchanged = 0
 
     for conversation in conversations:
         if not isinstance(conversation, dict):
             continue
         conversation_id = conversation.get('id')
+        activity_dt = parse_iso_datetime(_godaddy_conversation_timestamp(conversation))
+        if activity_dt and (newest_dt is None or activity_dt > newest_dt):
+            newest_dt = activity_dt
+        cached = previous.get(str(conversation_id))
+        if cached and cursor_dt and activity_dt and activity_dt <= cursor_dt:
+            unchanged += 1
+            snapshots.append(cached)
+            continue
         messages = message_map.get(str(conversation_id)) or []
         event = _build_godaddy_sync_event(conversation, messages)
         normalized = normalize_godaddy_event(event)
@@ -2832,10 +4551,165 @@ def sync_godaddy_live_conversations(max_pages=None, page_size=None):
         'upstream_count': len(conversations),
         'ingested_count': ingested,
         'duplicate_count': duplicates,
+        'unchanged_count': unchanged,
+        'newest_message_timestamp': newest_dt.isoformat().replace('+00:00', 'Z') if newest_dt else since,
         'snapshots': snapshots,
     }
 
 
+class GoDaddyLiveSyncWorker:
+    """Keeps the latest GoDaddy live-sync snapshot set cached for the lead board.
+
+    The node/browser bridge runs on a background thread (every `interval` seconds,
+    or on demand when the cache goes stale) so board requests never wait on it.
+    Runs are incremental against the newest message timestamp seen so far; every
+    `full_every`-th run is a full refresh to pick up cursor drift.
+    """
+
+    def __init__(self, interval=0, max_age=300, full_every=10):
+        self.interval = interval
+        self.max_age = max_age
+        self.full_every = max(1, full_every)
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._summary = None
+        self._snapshots = {}
+        self._cursor = None
+        self._fresh_at = None
+        self.runs = 0
+        self.failures = 0
+        self.last_duration_ms = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def is_stale(self):
+        return self._fresh_at is None or time.time() - self._fresh_at > self.max_age
+
+    def refresh(self, full=False, max_pages=None, page_size=None):
+        """Run one sync on the calling thread and update the cache. Returns the run summary."""
+        with self._refresh_lock:
+            with self._lock:
+                cursor = self._cursor
+                previous = dict(self._snapshots)
+            incremental = bool(cursor) and not full and self.runs % self.full_every != 0
+            kwargs = {}
+            if max_pages is not None:
+                kwargs['max_pages'] = max_pages
+            if page_size is not None:
+                kwargs['page_size'] = page_size
+            if incremental:
+                kwargs.update(since=cursor, previous=previous)
+            started = time.perf_counter()
+            try:
+                summary = sync_godaddy_live_conversations(**kwargs)
+            except Exception as exc:
+                logger.warning("GoDaddy live sync skipped: %s", exc)
+                with self._lock:
+                    self.failures += 1
+                    self._summary = {
+                        **(self._summary or {'upstream_count': 0, 'ingested_count': 0, 'duplicate_count': 0}),
+                        'success': False,
+                        'source': LEAD_SOURCE['GODADDY_CHAT'],
+                        'error': str(exc),
+                        'checked_at': utcnow_iso(),
+                    }
+                    return dict(self._summary)
+            finally:
+                self.last_duration_ms = round((time.perf_counter() - started) * 1000, 1)
+
+            snapshots = {}
+            for snapshot in summary.get('snapshots') or []:
+                conversation_id = (snapshot.get('conversation') or {}).get('id')
+                if conversation_id is not None:
+                    snapshots[str(conversation_id)] = snapshot
+            with self._lock:
+                self.runs += 1
+                self._snapshots = snapshots
+                self._cursor = summary.get('newest_message_timestamp') or self._cursor
+                self._fresh_at = time.time()
+                self._summary = {**summary, 'incremental': incremental}
+                return dict(self._summary)
+
+    def request_refresh(self):
+        """Refresh in the background without blocking the caller. Returns True if a refresh is underway."""
+        if self.running:
+            self._wake.set()
+        elif not self._refresh_lock.locked():
+            threading.Thread(target=self.refresh, name='godaddy-live-sync-once', daemon=True).start()
+        return True
+
+    def snapshot(self):
+        """Cached summary plus freshness fields; never touches the upstream."""
+        with self._lock:
+            summary = dict(self._summary or {
+                'success': False,
+                'source': LEAD_SOURCE['GODADDY_CHAT'],
+                'upstream_count': 0,
+                'ingested_count': 0,
+                'duplicate_count': 0,
+                'snapshots': [],
+            })
+            fresh_at = self._fresh_at
+            cursor = self._cursor
+        age = round(time.time() - fresh_at, 1) if fresh_at else None
+        summary.update({
+            'cached': True,
+            'fresh_at': datetime.fromtimestamp(fresh_at, timezone.utc).replace(microsecond=0).isoformat().replace('+00:00', 'Z') if fresh_at else None,
+            'age_seconds': age,
+            'stale': age is None or age > self.max_age,
+            'refreshing': self._refresh_lock.locked(),
+            'newest_message_timestamp': cursor,
+        })
+        return summary
+
+    def metrics(self):
+        with self._lock:
+            return {
+                'running': self.running,
+                'runs': self.runs,
+                'failures': self.failures,
+                'cached_conversations': len(self._snapshots),
+                'newest_message_timestamp': self._cursor,
+                'last_duration_ms': self.last_duration_ms,
+            }
+
+    def start(self):
+        if self.running or self.interval <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='godaddy-live-sync', daemon=True)
+        self._thread.start()
+        logger.info(f"[GoDaddy] Live sync worker started (every {self.interval}s)")
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"[GoDaddy] Live sync loop error: {e}")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+
+godaddy_live_sync = GoDaddyLiveSyncWorker(
+    interval=Config.GODADDY_LIVE_SYNC_INTERVAL,
+    max_age=Config.GODADDY_LIVE_SYNC_MAX_AGE,
+    full_every=Config.GODADDY_LIVE_SYNC_FULL_EVERY,
+)
+
+
 def send_outlook_with_retries(to_email, subject, html_body, text_body=None):
     attempts = 3
     last_exc = None
@@ -2850,6 +4724,210 @@ def send_outlook_with_retries(to_email, subject, html_body, text_body=None):
     return {'ok': False, 'attempts': attempts, 'error': str(last_exc)}
 
 
+def _mark_godaddy_reply(lead):
+    """A repeated GoDaddy event means the lead wrote back: move early-stage leads to REPLIED."""
+    if not lead:
+        return
+    lead_email = normalize_email(lead.get('email'))
+    lead_phone = normalize_phone(lead.get('phone'))
+    if lead.get('status') in (LEAD_STATUS['PROGRAM_INFO_SENT'], LEAD_STATUS['DRAFT_CREATED'], LEAD_STATUS['INQUIRY_RECEIVED']):
+        update_lead_status(email=lead_email, phone=lead_phone, new_status=LEAD_STATUS['REPLIED'], notes='Auto-detected reply via GoDaddy webhook')
+        logger.info(f"[GoDaddy] Auto-marked lead {lead['id']} as REPLIED")
+
+
+def _ingest_godaddy_event(normalized, event):
+    result = process_inbound_lead_event(normalized, event)
+
+    # Auto-update lead status to REPLIED if this is a returning lead (duplicate event = they replied)
+    if result.get('duplicate') and result.get('lead'):
+        _mark_godaddy_reply(result['lead'])
+    return result
+
+
+def _ingest_dialpad_event(normalized, event):
+    result = process_inbound_lead_event(normalized, event)
+    result['sms_sent'] = False
+    result['sms_error'] = None
+
+    # --- Missed Call SMS Auto-Reply ---
+    call_obj = normalized.get('_call', {})
+    is_missed = call_obj.get('missed') is True or call_obj.get('missed') == 'true'
+    event_type = normalized.get('event_type', '')
+    if is_missed and event_type == 'call.created' and not result.get('duplicate'):
+        caller_phone = normalized.get('phone')
+        if caller_phone and Config.DIALPAD_API_KEY:
+            sms_message = (
+                "Hi, this is Trifecta Recovery Services. "
+                "We noticed your call and will follow up shortly. "
+                "You can reach us at (403) 907-0996."
+            )
+            try:
+                dialpad_client.send_sms(
+                    to_number=caller_phone,
+                    message=sms_message,
+                    from_number='+14039070996'
+                )
+                result['sms_sent'] = True
+                logger.info(f"Missed call SMS sent to {caller_phone}")
+
+                # Log to sent-log.jsonl
+                if result.get('lead'):
+                    _append_sent_log({
+                        'ts': utcnow_iso(),
+                        'type': 'sms',
+                        'to': caller_phone,
+                        'lead_id': result['lead']['id'],
+                        'subject': 'Missed call auto-reply',
+                        'channel': 'dialpad',
+                        'status': 'sent',
+                        'direction': 'outbound',
+                        'trigger': 'missed_call_auto_reply',
+                    })
+            except Exception as sms_exc:
+                result['sms_error'] = str(sms_exc)
+                logger.warning(f"Missed call SMS failed for {caller_phone}: {sms_exc}")
+    return result
+
+
+def _ingest_outlook_form_event(normalized, event):
+    return process_inbound_lead_event(normalized, event)
+
+
+INGEST_HANDLERS = {
+    'godaddy': _ingest_godaddy_event,
+    'dialpad': _ingest_dialpad_event,
+    'outlook_form': _ingest_outlook_form_event,
+}
+
+
+def _enqueue_webhook_event(kind, normalized, event):
+    """Durably queue a verified webhook event for the ingest workers; returns a 202 response."""
+    job, created = lead_store.enqueue_ingest({**normalized, '_ingest_kind': kind}, event)
+    if created:
+        ingest_workers.notify()
+    elif kind == 'godaddy' and job.get('status') == 'done' and job.get('lead_id'):
+        # Only repeats of a still-pending job are pure duplicates; a repeat of an
+        # event that was already ingested is the reply signal and runs inline
+        _mark_godaddy_reply(lead_store.get_lead_by_id(job['lead_id']))
+    return jsonify({
+        'status': 'queued' if created else 'duplicate',
+        'source': normalized['source'],
+        'source_event_id': normalized['source_event_id'],
+        'duplicate': not created,
+        'job_id': job.get('id'),
+        'lead_id': job.get('lead_id'),
+    }), 202
+
+
+class IngestWorkerPool:
+    """Worker threads that drain the durable ingest queue (upsert, sheets logging, drafts)."""
+
+    def __init__(self, workers=2, poll_interval=5.0):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+        self._last_prune = 0.0
+        self._stats_lock = threading.Lock()
+        self.processed = 0
+        self.failed = 0
+
+    def start(self):
+        if self._threads:
+            return
+        requeued = lead_store.requeue_stale_ingest_jobs()
+        if requeued:
+            logger.info(f"[Ingest] Requeued {requeued} orphaned jobs")
+        self._stop.clear()
+        for i in range(self.workers):
+            t = threading.Thread(target=self._run, name=f'ingest-worker-{i}', daemon=True)
+            t.start()
+            self._threads.append(t)
+        logger.info(f"[Ingest] Started {self.workers} ingest workers")
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self._wake.set()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+    def notify(self):
+        self._wake.set()
+
+    def run_pending(self, limit=10):
+        """Process up to `limit` ready jobs on the calling thread. Returns the number handled."""
+        handled = 0
+        while handled < limit:
+            jobs = lead_store.claim_ingest_jobs(limit=1)
+            if not jobs:
+                break
+            self._process(jobs[0])
+            handled += 1
+        return handled
+
+    def _process(self, job):
+        try:
+            normalized = json.loads(job['normalized_json'])
+            payload = json.loads(job['payload_json'])
+            handler = INGEST_HANDLERS[normalized.pop('_ingest_kind')]
+            with app.app_context():
+                result = handler(normalized, payload)
+            lead_store.complete_ingest_job(job['id'], {
+                'lead_id': result['lead']['id'] if result.get('lead') else None,
+                'duplicate': result.get('duplicate'),
+                'draft_generated': result.get('draft_generated'),
+                'sms_sent': result.get('sms_sent'),
+            })
+            with self._stats_lock:
+                self.processed += 1
+        except Exception as e:
+            outcome = lead_store.fail_ingest_job(job['id'], e, Config.LEAD_INGEST_MAX_ATTEMPTS)
+            with self._stats_lock:
+                self.failed += 1
+            logger.error(f"[Ingest] Job {job['id']} ({job['source']}/{job['source_event_id']}) failed, {outcome}: {e}")
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                # Clear before claiming so a notify() that lands mid-claim is not lost
+                self._wake.clear()
+                if not self.run_pending(limit=10):
+                    if time.time() - self._last_prune > 3600:
+                        self._last_prune = time.time()
+                        lead_store.prune_ingest_jobs(Config.LEAD_INGEST_RETENTION_DAYS)
+                    self._wake.wait(self.poll_interval)
+            except Exception as e:
+                logger.error(f"[Ingest] Worker loop error: {e}")
+                self._stop.wait(self.poll_interval)
+
+    def metrics(self):
+        metrics = lead_store.ingest_queue_metrics()
+        with self._stats_lock:
+            metrics.update({
+                'async_enabled': Config.LEAD_WEBHOOK_ASYNC,
+                'workers_running': sum(1 for t in self._threads if t.is_alive()),
+                'processed': self.processed,
+                'failed_attempts': self.failed,
+            })
+        return metrics
+
+
+ingest_workers = IngestWorkerPool(workers=Config.LEAD_INGEST_WORKERS)
+
+
+@app.route('/api/webhooks/ingest/metrics', methods=['GET'])
+@require_api_key
+def ingest_queue_metrics():
+    """Webhook ingest queue depth, lag and worker counters."""
+    try:
+        return jsonify(ingest_workers.metrics()), 200
+    except Exception as e:
+        logger.error(f"Ingest metrics error: {e}")
+        return jsonify({'error': str(e), 'code': 'ingest_metrics_failed'}), 500
+
+
 @app.route('/api/webhooks/godaddy', methods=['POST'])
 def godaddy_webhook():
     """Ingest GoDaddy lead events, dedupe, and trigger draft generation."""
@@ -2859,17 +4937,9 @@ def godaddy_webhook():
             return jsonify({'error': 'Invalid webhook authentication'}), 401
         event = request.get_json(force=True) or {}
         normalized = normalize_godaddy_event(event)
-        result = process_inbound_lead_event(normalized, event)
-
-        # Auto-update lead status to REPLIED if this is a returning lead (duplicate event = they replied)
-        if result.get('duplicate') and result.get('lead'):
-            lead = result['lead']
-            lead_email = normalize_email(lead.get('email'))
-            lead_phone = normalize_phone(lead.get('phone'))
-            if lead.get('status') in (LEAD_STATUS['PROGRAM_INFO_SENT'], LEAD_STATUS['DRAFT_CREATED'], LEAD_STATUS['INQUIRY_RECEIVED']):
-                update_lead_status(email=lead_email, phone=lead_phone, new_status=LEAD_STATUS['REPLIED'], notes='Auto-detected reply via GoDaddy webhook')
-                logger.info(f"[GoDaddy] Auto-marked lead {lead['id']} as REPLIED")
-
+        if Config.LEAD_WEBHOOK_ASYNC:
+            return _enqueue_webhook_event('godaddy', normalized, event)
+        result = _ingest_godaddy_event(normalized, event)
         return jsonify({'status': 'received', 'source': normalized['source'], 'source_event_id': normalized['source_event_id'], 'duplicate': result['duplicate'], 'lead_id': result['lead']['id'] if result['lead'] else None, 'draft_generated': result['draft_generated']}), 200
     except Exception as e:
         logger.error("GoDaddy webhook error: %s", e)
@@ -2881,8 +4951,6 @@ def godaddy_webhook():
 @app.route('/api/webhooks/dialpad', methods=['POST'])
 def dialpad_webhook():
     """Receive Dialpad events, normalize to lead events, dedupe, and auto-reply missed calls with SMS."""
-    sms_sent = False
-    sms_error = None
     try:
         raw_body = request.get_data()
         if not verify_dialpad_signature(raw_body):
@@ -2890,45 +4958,9 @@ def dialpad_webhook():
             return jsonify({'error': 'Invalid signature'}), 401
         event = request.get_json(force=True) or {}
         normalized = normalize_dialpad_event(event)
-        result = process_inbound_lead_event(normalized, event)
-
-        # --- Missed Call SMS Auto-Reply ---
-        call_obj = normalized.get('_call', {})
-        is_missed = call_obj.get('missed') is True or call_obj.get('missed') == 'true'
-        event_type = normalized.get('event_type', '')
-        if is_missed and event_type == 'call.created' and not result.get('duplicate'):
-            caller_phone = normalized.get('phone')
-            if caller_phone and Config.DIALPAD_API_KEY:
-                sms_message = (
-                    "Hi, this is Trifecta Recovery Services. "
-                    "We noticed your call and will follow up shortly. "
-                    "You can reach us at (403) 907-0996."
-                )
-                try:
-                    dialpad_client.send_sms(
-                        to_number=caller_phone,
-                        message=sms_message,
-                        from_number='+14039070996'
-                    )
-                    sms_sent = True
-                    logger.info(f"Missed call SMS sent to {caller_phone}")
-
-                    # Log to sent-log.jsonl
-                    if result.get('lead'):
-                        _append_sent_log({
-                            'ts': utcnow_iso(),
-                            'type': 'sms',
-                            'to': caller_phone,
-                            'lead_id': result['lead']['id'],
-                            'subject': 'Missed call auto-reply',
-                            'channel': 'dialpad',
-                            'status': 'sent',
-                            'direction': 'outbound',
-                            'trigger': 'missed_call_auto_reply',
-                        })
-                except Exception as sms_exc:
-                    sms_error = str(sms_exc)
-                    logger.warning(f"Missed call SMS failed for {caller_phone}: {sms_exc}")
+        if Config.LEAD_WEBHOOK_ASYNC:
+            return _enqueue_webhook_event('dialpad', normalized, event)
+        result = _ingest_dialpad_event(normalized, event)
 
         return jsonify({
             'status': 'received',
@@ -2938,8 +4970,8 @@ def dialpad_webhook():
             'duplicate': result['duplicate'],
             'lead_id': result['lead']['id'] if result['lead'] else None,
             'draft_generated': result['draft_generated'],
-            'sms_sent': sms_sent,
-            'sms_error': sms_error,
+            'sms_sent': result['sms_sent'],
+            'sms_error': result['sms_error'],
         }), 200
     except Exception as e:
         logger.error(f"Dialpad webhook error: {e}")
@@ -2956,7 +4988,9 @@ def outlook_form_webhook():
             return jsonify({'error': 'Invalid webhook authentication'}), 401
         event = request.get_json(force=True) or {}
         normalized = normalize_outlook_form_event(event)
-        result = process_inbound_lead_event(normalized, event)
+        if Config.LEAD_WEBHOOK_ASYNC:
+            return _enqueue_webhook_event('outlook_form', normalized, event)
+        result = _ingest_outlook_form_event(normalized, event)
         return jsonify({
             'status': 'received',
             'source': normalized['source'],
@@ -2978,26 +5012,47 @@ OUTBOUND_SENT_LOG = os.path.join(_base_dir, 'trifecta', 'outbound', 'sent-log.js
 OUTBOUND_KPI_FILE = os.path.join(_base_dir, 'trifecta', 'kpi', 'live-kpis.json')
 
 
+def _ensure_sent_log_imported(store=None):
+    """Import the legacy sent-log.jsonl into the SQLite sent-log once per store."""
+    store = store or lead_store
+    if getattr(store, '_sent_log_imported', False):
+        return
+    imported = store.import_sent_log_jsonl(OUTBOUND_SENT_LOG)
+    if imported:
+        logger.info("Imported %d sent-log entries from %s", imported, OUTBOUND_SENT_LOG)
+    store._sent_log_imported = True
+
+
 def _append_sent_log(entry: dict) -> bool:
-    """Append a sent entry to the sent-log.jsonl file. Returns True on success."""
+    """Record a sent entry in the SQLite sent-log (mirrored to sent-log.jsonl). Returns True on success."""
+    try:
+        _ensure_sent_log_imported()
+    except Exception as e:
+        # The legacy import is retried on the next call; it must not cost this entry
+        logger.warning("Failed to import legacy sent-log: %s", e)
+    try:
+        lead_store.append_sent_log(entry)
+    except Exception as e:
+        logger.warning("Failed to append sent-log: %s", e)
+        return False
     try:
+        # Keep the JSONL mirror for external readers (trifecta/scripts/update-kpi-from-db.py)
         os.makedirs(os.path.dirname(OUTBOUND_SENT_LOG), exist_ok=True)
         with open(OUTBOUND_SENT_LOG, 'a', encoding='utf-8') as f:
             f.write(json.dumps(entry, separators=(',', ':')) + '\n')
-        return True
     except Exception as e:
-        logger.warning("Failed to append sent-log: %s", e)
-        return False
+        logger.warning("Failed to mirror sent-log to JSONL: %s", e)
+    return True
 
 
-def _read_sent_log() -> list:
-    """Read all entries from sent-log.jsonl."""
-    if not os.path.exists(OUTBOUND_SENT_LOG):
-        return []
+def _read_sent_log(lead_id=None) -> list:
+    """Read sent-log entries in insertion order, optionally for a single lead."""
+    try:
+        _ensure_sent_log_imported()
+    except Exception as e:
+        logger.warning("Failed to import legacy sent-log: %s", e)
     try:
-        with open(OUTBOUND_SENT_LOG, 'r', encoding='utf-8') as f:
-            lines = [l.strip() for l in f if l.strip()]
-        return [json.loads(line) for line in lines]
+        return lead_store.list_sent_log(lead_id=lead_id)
     except Exception as e:
         logger.warning("Failed to read sent-log: %s", e)
         return []
@@ -3006,19 +5061,10 @@ def _read_sent_log() -> list:
 def _update_lead_sheets_row(lead_id: str, email: str = None, phone: str = None) -> bool:
     """Update a lead row in Google Sheets with outreach data from sent-log. Returns True on success."""
     try:
-        creds_path = os.path.join(_base_dir, 'google-credentials.json')
-        if not os.path.exists(creds_path):
+        if not sheets_writer.enabled():
             logger.warning("Google Sheets: google-credentials.json not found, skipping row update")
             return False
 
-        import gspread
-        from google.oauth2.service_account import Credentials
-        scopes = ['https://www.googleapis.com/auth/spreadsheets']
-        creds = Credentials.from_service_account_file(creds_path, scopes=scopes)
-        client = gspread.authorize(creds)
-        sheet_id = os.environ.get('GOOGLE_SHEETS_ID', '1aV55LlDzyfqVu4maXLxfN55cb_NPBnU21BjeqVbqnL0')
-        sheet = client.open_by_key(sheet_id).sheet1
-
         # Find row matching lead email or phone
         norm_email = normalize_email(email) if email else None
         norm_phone = normalize_phone(phone) if phone else None
@@ -3026,34 +5072,24 @@ def _update_lead_sheets_row(lead_id: str, email: str = None, phone: str = None)
         if not search_value:
             return False
 
-        try:
-            cell = sheet.find(search_value)
-        except Exception:
-            return False
-
-        row_num = cell.row
-
-        # Get all sent entries for this lead
-        sent_entries = [e for e in _read_sent_log() if e.get('lead_id') == lead_id]
+        # Outreach counters for this lead (maintained incrementally in the sent-log store)
+        _ensure_sent_log_imported()
+        summary = lead_store.sent_log_lead_summary(lead_id)
 
         # Column I: Follow-up Sent (YES/NO)
-        followup_sent = 'YES' if sent_entries else 'NO'
+        followup_sent = 'YES' if summary['count'] else 'NO'
 
         # Column K: Last Outreach (date of most recent sent)
-        last_outreach = ''
-        if sent_entries:
-            latest = max(sent_entries, key=lambda e: e.get('ts', ''))
-            last_outreach = latest.get('ts', '')[:10]
+        last_outreach = (summary['last_ts'] or '')[:10] if summary['count'] else ''
 
         # Column L: Outreach Count
-        outreach_count = len(sent_entries)
+        outreach_count = summary['count']
 
-        # Update the row (I=9, K=11, L=12)
-        sheet.update_cell(row_num, 9, followup_sent)
-        sheet.update_cell(row_num, 11, last_outreach)
-        sheet.update_cell(row_num, 12, outreach_count)
+        # Update the row (I=9, K=11, L=12) in the next batched write
+        if not sheets_writer.update_lead_cells(search_value, {9: followup_sent, 11: last_outreach, 12: outreach_count}):
+            return False
 
-        logger.info("Sheet row updated for lead_id=%s: Follow-up=%s, Last=%s, Count=%d",
+        logger.info("Sheet row update queued for lead_id=%s: Follow-up=%s, Last=%s, Count=%d",
                     lead_id, followup_sent, last_outreach, outreach_count)
         return True
 
@@ -3065,7 +5101,7 @@ def _update_lead_sheets_row(lead_id: str, email: str = None, phone: str = None)
 @app.route('/api/outbound/log', methods=['POST'])
 def log_outbound_sent():
     """
-    Log an outbound message (email/SMS/call) to sent-log.jsonl and sync Sheet row.
+    Log an outbound message (email/SMS/call) to the sent-log and sync Sheet row.
     Body: {type, to, lead_id, subject, channel, status}
     """
     try:
@@ -3124,9 +5160,7 @@ def get_outbound_log():
     """Return all sent-log entries. Optional: ?lead_id=<id> to filter."""
     try:
         lead_id_filter = request.args.get('lead_id')
-        entries = _read_sent_log()
-        if lead_id_filter:
-            entries = [e for e in entries if e.get('lead_id') == lead_id_filter]
+        entries = _read_sent_log(lead_id=lead_id_filter or None)
         return jsonify({
             'count': len(entries),
             'entries': entries,
@@ -3144,32 +5178,23 @@ def get_outbound_summary():
     Used for KPI dashboard.
     """
     try:
-        entries = _read_sent_log()
+        _ensure_sent_log_imported()
         now = datetime.now(timezone.utc)
 
         today_date = now.date()
         week_start = (now - timedelta(days=now.weekday())).date()
         month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0).date()
+        recent_start = (now - timedelta(days=13)).date()
 
-        daily = {}
-        for entry in entries:
-            try:
-                ts = datetime.fromisoformat(entry.get('ts', '').replace('Z', '+00:00'))
-                d = ts.date()
-                daily[d] = daily.get(d, 0) + 1
-            except Exception:
-                pass
+        daily = lead_store.sent_log_daily_counts(since_day=min(month_start, recent_start, week_start))
 
         today_count = sum(v for k, v in daily.items() if k == today_date)
         week_count = sum(v for k, v in daily.items() if k >= week_start)
         month_count = sum(v for k, v in daily.items() if k >= month_start)
-        total_count = len(entries)
+        total_count = lead_store.sent_log_total()
 
         # Top channels
-        channel_counts = {}
-        for entry in entries:
-            ch = entry.get('channel', 'unknown')
-            channel_counts[ch] = channel_counts.get(ch, 0) + 1
+        channel_counts = lead_store.sent_log_channel_counts()
 
         # Recent days (last 14)
         recent_days = []
@@ -3195,31 +5220,19 @@ def get_outbound_summary():
 @app.route('/api/kpi/update-from-sent-log', methods=['POST'])
 def update_kpi_from_sent_log():
     """
-    Read sent-log.jsonl, update live-kpis.json with emails_sent_today / emails_sent_week,
+    Read the sent-log counters, update live-kpis.json with emails_sent_today / emails_sent_week,
     and sync Sheet rows for all logged leads.
     """
     try:
-        entries = _read_sent_log()
+        _ensure_sent_log_imported()
         now = datetime.now(timezone.utc)
         today_date = now.date()
         week_start = (now - timedelta(days=now.weekday())).date()
 
-        today_count = 0
-        week_count = 0
-        seen_lead_ids = set()
-
-        for entry in entries:
-            try:
-                ts = datetime.fromisoformat(entry.get('ts', '').replace('Z', '+00:00'))
-                d = ts.date()
-                if entry.get('type') == 'email':
-                    if d == today_date:
-                        today_count += 1
-                    if d >= week_start:
-                        week_count += 1
-                seen_lead_ids.add(entry.get('lead_id'))
-            except Exception:
-                pass
+        email_daily = lead_store.sent_log_daily_counts(since_day=week_start, entry_type='email')
+        today_count = email_daily.get(today_date, 0)
+        week_count = sum(email_daily.values())
+        seen_lead_ids = set(lead_store.sent_log_lead_ids())
 
         # Update live-kpis.json
         kpi_path = OUTBOUND_KPI_FILE
@@ -3802,13 +5815,23 @@ def _serialize_lead_with_context(lead, events, draft, outbound):
     }
 
 
+def _serialize_leads(leads):
+    contexts = lead_store.load_lead_contexts([lead['id'] for lead in leads], event_limit=5)
+    return [
+        _serialize_lead_with_context(
+            lead,
+            contexts[lead['id']]['events'],
+            contexts[lead['id']]['draft'],
+            contexts[lead['id']]['outbound'],
+        )
+        for lead in leads
+    ]
+
+
 def _serialize_lead(lead):
     if not lead:
         return None
-    events = lead_store.latest_events_for_lead(lead['id'], limit=5)
-    draft = lead_store.get_latest_draft(lead['id'])
-    outbound = lead_store.get_latest_outbound_message(lead['id'])
-    return _serialize_lead_with_context(lead, events, draft, outbound)
+    return _serialize_leads([lead])[0]
 
 
 def _build_workflow_counts(leads):
@@ -3942,7 +5965,6 @@ def lead_update_status():
     success = update_lead_status(email=email, phone=phone, new_status=new_status, notes=notes)
 
     if success:
-        emit_to_dashboard("lead:updated", f"Lead status updated to {new_status}", {"email": email, "status": new_status})
         return jsonify({'ok': True, 'status': new_status}), 200
     else:
         return jsonify({'error': 'Lead not found'}), 404
@@ -3971,13 +5993,6 @@ def create_lead():
             )
         }
         result = process_inbound_lead_event(normalized, data)
-        lead = result['lead']
-        if not result['duplicate']:
-            emit_to_dashboard(
-                "lead:new",
-                f"New lead captured: {lead.get('name') or lead.get('email') or 'Unknown'} from {lead.get('source', 'Unknown')}",
-                {"leadId": lead['id'], "name": lead.get('name'), "source": lead.get('source'), "email": lead.get('email')}
-            )
         return jsonify({
             'success': True,
             'lead': _serialize_lead(result['lead']),
@@ -4000,7 +6015,7 @@ def query_leads():
         limit = min(int(data.get('limit', 50)), 200)
         offset = max(int(data.get('offset', 0)), 0)
         leads = lead_store.list_leads(status=status, source=source, limit=limit, offset=offset)
-        serialized = [_serialize_lead(l) for l in leads]
+        serialized = _serialize_leads(leads)
         return jsonify({
             'count': len(leads),
             'leads': serialized,
@@ -4026,22 +6041,14 @@ def lead_board():
         sync_summary = None
         upstream_snapshots = []
         if sync_live and Config.GODADDY_LIVE_SYNC_ENABLED and (not source or source == LEAD_SOURCE['GODADDY_CHAT']):
-            try:
-                sync_summary = sync_godaddy_live_conversations()
-                upstream_snapshots = sync_summary.get('snapshots') or []
-            except Exception as exc:
-                logger.warning("GoDaddy live sync skipped: %s", exc)
-                sync_summary = {
-                    'success': False,
-                    'source': LEAD_SOURCE['GODADDY_CHAT'],
-                    'checked_at': utcnow_iso(),
-                    'error': str(exc),
-                    'upstream_count': 0,
-                    'ingested_count': 0,
-                    'duplicate_count': 0,
-                }
+            # Always serve the cached snapshot set, even when empty (cold process) or stale;
+            # the refresh runs in the background and the board polls again while `syncing`
+            syncing = godaddy_live_sync.is_stale() and godaddy_live_sync.request_refresh()
+            sync_summary = godaddy_live_sync.snapshot()
+            sync_summary['syncing'] = bool(syncing or sync_summary['refreshing'])
+            upstream_snapshots = sync_summary.get('snapshots') or []
         leads = lead_store.list_leads(source=source, limit=limit, offset=offset)
-        serialized = [_serialize_lead(lead) for lead in leads]
+        serialized = _serialize_leads(leads)
         reconciliation = _reconcile_upstream_snapshots(upstream_snapshots, serialized, stale_after_hours=stale_after_hours)
         return jsonify({
             'count': len(serialized),
@@ -4068,7 +6075,7 @@ def reconcile_leads():
         source = data.get('source')
         stale_after_hours = min(max(int(data.get('stale_after_hours', 48)), 1), 168)
         leads = lead_store.list_leads(source=source, limit=200, offset=0)
-        serialized = [_serialize_lead(lead) for lead in leads]
+        serialized = _serialize_leads(leads)
         reconciliation = _reconcile_upstream_snapshots(snapshots, serialized, stale_after_hours=stale_after_hours)
         return jsonify({
             'success': True,
@@ -4087,7 +6094,9 @@ def sync_godaddy_live():
         data = request.get_json(silent=True) or {}
         max_pages = min(max(int(data.get('max_pages', request.args.get('max_pages', Config.GODADDY_LIVE_SYNC_MAX_PAGES))), 1), 5)
         page_size = min(max(int(data.get('page_size', request.args.get('page_size', Config.GODADDY_LIVE_SYNC_PAGE_SIZE))), 1), 100)
-        summary = sync_godaddy_live_conversations(max_pages=max_pages, page_size=page_size)
+        summary = godaddy_live_sync.refresh(full=True, max_pages=max_pages, page_size=page_size)
+        if not summary.get('success'):
+            raise RuntimeError(summary.get('error') or 'GoDaddy live sync failed')
         return jsonify({'success': True, 'sync': summary}), 200
     except Exception as exc:
         logger.error("GoDaddy live sync error: %s", exc)
@@ -4124,6 +6133,20 @@ def create_draft_for_lead_endpoint(lead_id):
     }), 200
 
 
+@app.route('/api/leads/drafts/bulk', methods=['POST'])
+@require_api_key
+def bulk_generate_drafts():
+    """Draft every undrafted INQUIRY_RECEIVED lead (up to `limit`) through the concurrent draft generator."""
+    try:
+        body = request.get_json(silent=True) or {}
+        limit = min(max(int(body.get('limit', Config.LEAD_AUTO_DRAFT_BATCH)), 1), 500)
+        leads = lead_store.list_leads(status=LEAD_STATUS['INQUIRY_RECEIVED'], limit=limit)
+        return jsonify({'status': 'completed', **draft_generator.run(leads)}), 200
+    except Exception as e:
+        logger.error(f"Bulk draft generation error: {e}")
+        return jsonify({'error': str(e), 'code': 'bulk_draft_failed'}), 500
+
+
 @app.route('/api/leads/<lead_id>/approve-send', methods=['POST'])
 def approve_and_send_lead_email(lead_id):
     """Approve latest draft and send via Outlook Graph."""
@@ -4183,6 +6206,8 @@ def approve_and_send_lead_email(lead_id):
         lead_after, err = lead_store.set_lead_status(lead_id, LEAD_STATUS['PROGRAM_INFO_SENT'])
         if err:
             logger.warning("Status update warning on send: %s", err)
+        else:
+            _publish_lead_change('lead:updated', lead_after)
         lead_store.add_audit(actor, 'draft_sent', 'email_draft', draft['id'], d_before, d_after)
 
         # Also append to sent-log for real-time Sheet sync
@@ -4216,7 +6241,8 @@ def approve_and_send_lead_email(lead_id):
         status='failed',
         provider_response=send_result
     )
-    lead_store.set_lead_status(lead_id, LEAD_STATUS['ERROR'])
+    lead_after, _ = lead_store.set_lead_status(lead_id, LEAD_STATUS['ERROR'])
+    _publish_lead_change('lead:updated', lead_after)
     send_telegram_alert(f"Lead email send failed for lead_id={lead_id}. Error={send_result.get('error')}")
     return jsonify({
         'status': 'failed',
@@ -4244,7 +6270,8 @@ def reject_lead_draft(lead_id):
         rejected_by=actor,
         rejected_reason=reason
     )
-    lead_store.set_lead_status(lead_id, LEAD_STATUS['NEEDS_HUMAN_REVIEW'])
+    lead_after, _ = lead_store.set_lead_status(lead_id, LEAD_STATUS['NEEDS_HUMAN_REVIEW'])
+    _publish_lead_change('lead:updated', lead_after)
     lead_store.add_audit(actor, 'draft_rejected', 'email_draft', draft['id'], before, after)
     return jsonify({'status': 'rejected', 'lead_id': lead_id, 'draft_id': draft['id']}), 200
 
@@ -4264,6 +6291,20 @@ def lead_admin_metrics():
         return jsonify({'error': str(exc), 'code': 'lead_metrics_failed'}), 500
 
 
+@app.route('/api/leads/metrics/counters', methods=['GET', 'POST'])
+@require_api_key
+def lead_counters_admin():
+    """Verify the materialized lead counters (GET) or rebuild them from a full scan (POST)."""
+    try:
+        if request.method == 'POST':
+            rows = lead_store.rebuild_lead_counters()
+            logger.info(f"[Leads] Rebuilt {rows} lead counter rows")
+        return jsonify({**lead_store.verify_lead_counters(), 'timestamp': utcnow_iso()}), 200
+    except Exception as exc:
+        logger.error("Lead counters error: %s", exc)
+        return jsonify({'error': str(exc), 'code': 'lead_counters_failed'}), 500
+
+
 @app.route('/api/leads/<lead_id>', methods=['PATCH'])
 @require_api_key
 def update_lead_admin(lead_id):
@@ -4302,6 +6343,7 @@ def update_lead_admin(lead_id):
             lead = lead_after_status
 
         lead_store.add_audit(actor, 'lead_admin_updated', 'lead', lead_id, before, lead)
+        _publish_lead_change('lead:updated', lead)
         return jsonify({'status': 'updated', 'lead': _serialize_lead(lead)}), 200
     except Exception as exc:
         logger.error("Lead admin patch error: %s", exc)
@@ -4347,6 +6389,7 @@ def archive_lead(lead_id):
     before = dict(lead)
     after = lead_store.archive_lead(lead_id)
     lead_store.add_audit(actor, 'lead_archived', 'lead', lead_id, before, after)
+    _publish_lead_change('lead:updated', after)
     return jsonify({'status': 'archived', 'lead_id': lead_id, 'lead': _serialize_lead(after)}), 200
 
 
@@ -4671,6 +6714,94 @@ def handle_unexpected_error(error):
 # =============================================================================
 # SCHEDULED TASKS (APScheduler)
 # =============================================================================
+class SchedulerLeader:
+    """SQLite lease so only one gunicorn worker runs the scheduled jobs.
+
+    Every worker runs APScheduler, but jobs wrapped with `leader_only` are
+    no-ops unless this process holds a live lease. The lease is renewed every
+    ttl/3 seconds; if the leader dies another worker takes over once it expires.
+    """
+
+    def __init__(self, name='scheduler', ttl=60):
+        self.name = name
+        self.ttl = ttl
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._leader_until = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+        self.skipped_runs = 0
+
+    def is_leader(self):
+        return time.time() < self._leader_until
+
+    def try_acquire(self):
+        was_leader = self.is_leader()
+        started = time.time()
+        try:
+            acquired = lead_store.acquire_lease(self.name, self.holder, self.ttl)
+        except Exception as e:
+            logger.warning(f"[CRON] Leader lease check failed: {e}")
+            acquired = False
+        if acquired:
+            self._leader_until = started + self.ttl
+            if not was_leader:
+                logger.info(f"[CRON] {self.holder} is now scheduler leader")
+        else:
+            self._leader_until = 0.0
+            if was_leader:
+                logger.warning(f"[CRON] {self.holder} lost scheduler leadership")
+        return acquired
+
+    def leader_only(self, job):
+        """Wrap a scheduled job so it only runs on the lease holder."""
+        @wraps(job)
+        def run():
+            if not self.is_leader():
+                self.skipped_runs += 1
+                return None
+            return job()
+        return run
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self.try_acquire()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='scheduler-leader', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        self._stop.set()
+        if self.is_leader():
+            try:
+                lead_store.release_lease(self.name, self.holder)
+            except Exception:
+                pass
+        self._leader_until = 0.0
+
+    def _run(self):
+        while not self._stop.wait(max(self.ttl / 3.0, 1.0)):
+            self.try_acquire()
+
+    def status(self):
+        try:
+            lease = lead_store.get_lease(self.name)
+        except Exception:
+            lease = None
+        return {
+            'enabled': Config.SCHEDULER_LEADER_ELECTION,
+            'holder': self.holder,
+            'is_leader': self.is_leader(),
+            'lease_holder': lease['holder'] if lease else None,
+            'lease_expires_in': round(lease['expires_at'] - time.time(), 1) if lease else None,
+            'skipped_runs': self.skipped_runs,
+        }
+
+
+scheduler_leader = SchedulerLeader(ttl=Config.SCHEDULER_LEASE_TTL)
+
+
 def _init_scheduler():
     """Initialize APScheduler for recurring background tasks."""
     try:
@@ -4705,7 +6836,7 @@ def _init_scheduler():
                 telegram_token = os.environ.get('TELEGRAM_BOT_TOKEN')
                 telegram_chat = os.environ.get('TELEGRAM_CHAT_ID')
                 if telegram_token and telegram_chat:
-                    requests.post(
+                    outbound_http.post(
                         f"https://api.telegram.org/bot{telegram_token}/sendMessage",
                         json={'chat_id': telegram_chat, 'text': summary},
                         timeout=10
@@ -4739,18 +6870,14 @@ def _init_scheduler():
             return
         with app.app_context():
             try:
-                leads = lead_store.list_leads(status='INQUIRY_RECEIVED', limit=10)
-                for lead in leads:
-                    if not lead.get('email'):
-                        continue
-                    existing_draft = lead_store.get_latest_draft(lead['id'])
-                    if existing_draft:
-                        continue
-                    try:
-                        maybe_generate_draft(lead)
-                        logger.info(f"[CRON] Auto-drafted email for lead {lead['id']}")
-                    except Exception as e:
-                        logger.warning(f"[CRON] Auto-draft failed for lead {lead['id']}: {e}")
+                leads = lead_store.list_leads(status='INQUIRY_RECEIVED', limit=Config.LEAD_AUTO_DRAFT_BATCH)
+                summary = draft_generator.run([lead for lead in leads if lead.get('email')])
+                if summary['drafted']:
+                    logger.info(
+                        f"[CRON] Auto-drafted {summary['drafted']} leads in {summary['seconds']}s "
+                        f"({summary['drafts_per_minute']} drafts/min, {summary['needs_review']} need review, "
+                        f"{summary['fallbacks']} fallbacks)"
+                    )
             except Exception as e:
                 logger.error(f"[CRON] Auto-draft check failed: {e}")
 
@@ -4883,13 +7010,17 @@ def _init_scheduler():
     _delay_5m = dict(start_date=_dt_sched.fromtimestamp(_now.timestamp() + 300))   # 5 min delay
     _delay_3m = dict(start_date=_dt_sched.fromtimestamp(_now.timestamp() + 180))   # 3 min delay
 
-    scheduler.add_job(daily_lead_summary, 'cron', hour=8, minute=0, id='daily_lead_summary')
-    scheduler.add_job(check_stale_leads, 'interval', hours=4, id='check_stale_leads', **_delay_5m)
-    scheduler.add_job(auto_draft_undrafted, 'interval', minutes=30, id='auto_draft_undrafted', **_delay_5m)
-    scheduler.add_job(compute_kpis_from_db, 'interval', minutes=5, id='compute_kpis', **_delay_3m)
-    scheduler.add_job(poll_inbox_and_notify, 'interval', minutes=2, id='poll_inbox_discord', **_delay_5m)
+    # With leader election on, every worker schedules the jobs but only the lease holder runs them
+    guard = scheduler_leader.leader_only if Config.SCHEDULER_LEADER_ELECTION else (lambda job: job)
+    scheduler.add_job(guard(daily_lead_summary), 'cron', hour=8, minute=0, id='daily_lead_summary')
+    scheduler.add_job(guard(check_stale_leads), 'interval', hours=4, id='check_stale_leads', **_delay_5m)
+    scheduler.add_job(guard(auto_draft_undrafted), 'interval', minutes=30, id='auto_draft_undrafted', **_delay_5m)
+    scheduler.add_job(guard(compute_kpis_from_db), 'interval', minutes=5, id='compute_kpis', **_delay_3m)
+    scheduler.add_job(guard(poll_inbox_and_notify), 'interval', minutes=2, id='poll_inbox_discord', **_delay_5m)
 
     scheduler.start()
+    if Config.SCHEDULER_LEADER_ELECTION:
+        scheduler_leader.start()
     logger.info("[CRON] Scheduler started with 5 jobs: daily_lead_summary, check_stale_leads, auto_draft_undrafted, compute_kpis, poll_inbox_discord")
     # Note: removed immediate startup KPI computation to prevent gunicorn worker timeout
     return scheduler
@@ -4899,7 +7030,8 @@ def _init_scheduler():
 def scheduler_status():
     """Show status of scheduled tasks."""
     if not hasattr(app, '_scheduler') or app._scheduler is None:
-        return jsonify({'status': 'disabled', 'jobs': []}), 200
+        return jsonify({'status': 'disabled', 'jobs': [], 'leader': scheduler_leader.status(),
+                        'draft_generator': draft_generator.metrics()}), 200
     jobs = []
     for job in app._scheduler.get_jobs():
         jobs.append({
@@ -4907,7 +7039,8 @@ def scheduler_status():
             'next_run': job.next_run_time.isoformat() if job.next_run_time else None,
             'trigger': str(job.trigger),
         })
-    return jsonify({'status': 'running', 'jobs': jobs}), 200
+    return jsonify({'status': 'running', 'jobs': jobs, 'leader': scheduler_leader.status(),
+                    'draft_generator': draft_generator.metrics()}), 200
 
 
 # =============================================================================
@@ -5279,6 +7412,28 @@ def admin_ai_agent():
         'emails_sent': auto_sent,
         'leads_processed': metrics.get('total_leads', 0),
         'provider': 'openrouter' if Config.OPENROUTER_API_KEY else ('openai' if Config.OPENAI_API_KEY else ('anthropic' if Config.ANTHROPIC_API_KEY else 'none')),
+        'response_cache': llm_cache.stats() if llm_cache else {'enabled': False},
+        'time_to_first_token': llm_ttft_metrics(),
+        'provider_router': llm_router.stats(),
+        'timestamp': utcnow_iso(),
+    }), 200
+
+
+@app.route('/api/admin/sql-profile', methods=['GET', 'DELETE'])
+@require_admin_auth
+def admin_sql_profile():
+    """Top SQL fingerprints by time and the recent slow-query log (with EXPLAIN QUERY PLAN); DELETE resets."""
+    if request.method == 'DELETE':
+        sql_profiler.reset()
+        return jsonify({'status': 'reset', 'timestamp': utcnow_iso()}), 200
+    try:
+        limit = min(max(int(request.args.get('limit', 20)), 1), 200)
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer', 'code': 'invalid_limit'}), 400
+    return jsonify({
+        **sql_profiler.summary(),
+        'top': sql_profiler.top(limit=limit, sort=request.args.get('sort', 'total')),
+        'slow_queries': sql_profiler.slow_queries(limit=limit),
         'timestamp': utcnow_iso(),
     }), 200
 
@@ -5323,7 +7478,8 @@ def _log_startup_warnings():
     if not warnings:
         logger.info("[STARTUP] All critical secrets configured")
 
-_log_startup_warnings()
+boot_profiler.mark('routes_and_services')
+boot_profiler.run_or_defer('startup_warnings', _log_startup_warnings)
 
 # =============================================================================
 # CALENDAR SYNC ENDPOINT
@@ -5369,10 +7525,9 @@ def send_discord_notification(content, username="Trifecta AI"):
         logger.debug("[Discord] No webhook URL configured, skipping notification")
         return False
     try:
-        resp = requests.post(
+        resp = outbound_http.post(
             DISCORD_WEBHOOK_URL,
             json={"content": content, "username": username},
-            timeout=10
         )
         return resp.status_code in (200, 204)
     except Exception as e:
@@ -5564,7 +7719,7 @@ def daily_brief():
             os.environ.get('HOME', '/home'), 'data', 'lead_pipeline.db'
         )
         if os.path.exists(db_path):
-            conn = sqlite3.connect(db_path)
+            conn = profiled_connect(db_path)
             conn.row_factory = sqlite3.Row
             cur = conn.cursor()
             # Leads that are active/new and haven't been contacted recently
@@ -5597,7 +7752,7 @@ def daily_brief():
             os.environ.get('HOME', '/home'), 'data', 'lead_pipeline.db'
         )
         if os.path.exists(db_path):
-            conn = sqlite3.connect(db_path)
+            conn = profiled_connect(db_path)
             conn.row_factory = sqlite3.Row
             cur = conn.cursor()
             # Content drafts summary
@@ -5629,7 +7784,7 @@ def _oil_gas_db():
     """Get a connection to the Oil & Gas leads SQLite database."""
     db_path = Config.OIL_GAS_LEAD_DB_PATH
     os.makedirs(os.path.dirname(db_path), exist_ok=True)
-    conn = sqlite3.connect(db_path)
+    conn = profiled_connect(db_path)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")
     return conn
@@ -5670,7 +7825,8 @@ def _init_oil_gas_db():
         conn.close()
 
 # Init on startup
-_init_oil_gas_db()
+boot_profiler.mark('portal_and_oil_gas_routes')
+boot_profiler.run_or_defer('oil_gas_db', _init_oil_gas_db)
 
 @app.route('/api/oil-gas/leads', methods=['POST'])
 def create_oil_gas_lead():
@@ -5868,9 +8024,36 @@ RECOVERY_BUDDY_SYSTEM_PROMPT = (
     "Always be warm and gentle. Use no em dashes. Use no emojis. Evidence-based language only. "
     "Keep responses concise (2-4 sentences). Never use the word 'boundaries' as a cliche."
 )
+RECOVERY_BUDDY_MODEL = 'claude-3-haiku-20240307'
+RECOVERY_BUDDY_FALLBACK_REPLY = (
+    'I am here with you. If you need immediate support, please call us at (403) 907-0996 '
+    'or reach the crisis line at 988.'
+)
+
+
+def _stream_recovery_buddy_reply(api_key, messages, history, message):
+    """SSE body for the Recovery Buddy: `token` events, then `done` with the reply and updated history."""
+    parts = []
+    try:
+        deltas = _stream_anthropic(api_key, RECOVERY_BUDDY_MODEL, RECOVERY_BUDDY_SYSTEM_PROMPT, messages,
+                                   max_tokens=300, version='2023-06-01')
+        for delta in _timed_stream('recovery_buddy', 'anthropic', deltas):
+            parts.append(delta)
+            yield _sse_frame('token', {'text': delta})
+    except Exception as e:
+        logger.warning(f"Recovery Buddy stream failed: {e}")
+        if not parts:
+            parts.append(RECOVERY_BUDDY_FALLBACK_REPLY)
+            yield _sse_frame('token', {'text': RECOVERY_BUDDY_FALLBACK_REPLY})
+    reply = ''.join(parts)
+    yield _sse_frame('done', {'reply': reply, 'history': list(history) + [
+        {'role': 'user', 'content': message},
+        {'role': 'assistant', 'content': reply}
+    ]})
 
 
 @app.route('/api/recovery-buddy/chat', methods=['POST'])
+@rate_limit('recovery_buddy')
 def recovery_buddy_chat():
     """Recovery Buddy chat endpoint - 24/7 lead capture and support chatbot."""
     import re as _re
@@ -5921,6 +8104,9 @@ def recovery_buddy_chat():
     if not anthropic_key:
         return jsonify({'reply': 'I am having trouble connecting right now. Please call us at (403) 907-0996.', 'history': history}), 200
 
+    if _wants_stream(data):
+        return _sse_response(_stream_recovery_buddy_reply(anthropic_key, messages, history, message))
+
     try:
         import requests as _req
         resp = _req.post(
@@ -5931,7 +8117,7 @@ def recovery_buddy_chat():
                 'content-type': 'application/json'
             },
             json={
-                'model': 'claude-3-haiku-20240307',
+                'model': RECOVERY_BUDDY_MODEL,
                 'max_tokens': 300,
                 'system': RECOVERY_BUDDY_SYSTEM_PROMPT,
                 'messages': messages
@@ -5939,10 +8125,12 @@ def recovery_buddy_chat():
             timeout=15
         )
         resp.raise_for_status()
-        reply = resp.json()['content'][0]['text']
+        body = resp.json()
+        reply = body['content'][0]['text']
+        _record_llm_usage('anthropic', (body.get('usage') or {}).get('input_tokens'), (body.get('usage') or {}).get('output_tokens'))
     except Exception as e:
         logger.warning(f"Recovery Buddy API call failed: {e}")
-        reply = 'I am here with you. If you need immediate support, please call us at (403) 907-0996 or reach the crisis line at 988.'
+        reply = RECOVERY_BUDDY_FALLBACK_REPLY
 
     updated_history = list(history) + [
         {'role': 'user', 'content': message},
@@ -5959,6 +8147,37 @@ def serve_static(filename):
     return send_from_directory(static_dir, filename)
 
 
+# =============================================================================
+# STARTUP (background services, deferred init, boot report)
+# =============================================================================
+# Endpoints that answer before deferred init has finished (Azure probes /health during warm-up)
+BOOT_EXEMPT_ENDPOINTS = {'health', 'prometheus_metrics', 'startup_profile'}
+
+
+@app.before_request
+def finish_deferred_boot():
+    """In fast-boot mode, make sure deferred init has run before serving a real request."""
+    if not boot_profiler.deferred_done.is_set() and request.endpoint not in BOOT_EXEMPT_ENDPOINTS:
+        boot_profiler.run_deferred()
+
+
+@app.route('/api/admin/startup-profile', methods=['GET'])
+@require_admin_auth
+def startup_profile():
+    """Per-phase import timings for this worker, plus deferred (fast-boot) init steps."""
+    return jsonify(boot_profiler.report()), 200
+
+
+def _start_background_services():
+    app._scheduler = _init_scheduler()
+    if Config.LEAD_WEBHOOK_ASYNC:
+        ingest_workers.start()
+    if Config.GODADDY_LIVE_SYNC_ENABLED:
+        godaddy_live_sync.start()
+
+
+app._scheduler = None
+
 # =============================================================================
 # MAIN
 # =============================================================================
@@ -5967,14 +8186,18 @@ if __name__ == '__main__':
     debug = os.environ.get('FLASK_DEBUG', '0') == '1'
 
     logger.info(f"Starting Trifecta AI Agent v1.0.0 on port {port}")
-    logger.info(f"Skills loaded: {len(SKILLS)}")
+    logger.info(f"Skills loaded: {len(SKILLS)}" + (" (loading in background)" if Config.FAST_BOOT else ""))
     logger.info(f"Debug mode: {debug}")
 
-    app._scheduler = _init_scheduler()
+    boot_profiler.mark('remaining_routes')
+    boot_profiler.run_or_defer('background_services', _start_background_services)
+    boot_profiler.finish()
     app.run(host='0.0.0.0', port=port, debug=debug)
 else:
-    # Production (gunicorn) - start scheduler on import
-    app._scheduler = _init_scheduler()
+    # Production (gunicorn) - start scheduler on import (after import in fast-boot mode)
+    boot_profiler.mark('remaining_routes')
+    boot_profiler.run_or_defer('background_services', _start_background_services)
+    boot_profiler.finish()
 
 
 
@@ -48,19 +48,23 @@ def register_webhook():
     Request body:
     {
         "webhook_url": "https://example.com/webhooks",
-        "event_types": ["lead.new", "payment.received"]  # Optional, defaults to all
+        "event_types": ["lead.new", "payment.received"],  # Optional, defaults to all
+        "filters": {"source": ["website", "referral"]}  # Optional, matched against event data
     }
     """
     try:
         data = request.get_json()
         webhook_url = data.get('webhook_url')
         event_types = data.get('event_types')
+        filters = data.get('filters')
         
         if not webhook_url:
             return jsonify({'error': 'webhook_url is required'}), 400
+        if filters is not None and not isinstance(filters, dict):
+            return jsonify({'error': 'filters must be an object'}), 400
         
         registry = get_registry()
-        result = registry.register(webhook_url, event_types)
+        result = registry.register(webhook_url, event_types, filters)
         
         return jsonify(result), 201
     except Exception as e:
@@ -118,6 +122,7 @@ def list_webhooks():
         
         return jsonify({
             'webhooks': webhooks,
+            'subscriptions': registry.list_subscriptions(),
             'total_urls': sum(len(urls) for urls in webhooks.values())
         }), 200
     except Exception as e:
@@ -233,9 +238,43 @@ def emit_webhook_event():
         )
         
         emitter = get_emitter()
-        result = emitter.emit(event)
+        result = emitter.emit(event, wait=data.get('wait', True))
         
-        return jsonify(result), 200
+        return jsonify(result), 200 if result['status'] != 'queued' else 202
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/webhooks/deliveries', methods=['GET'])
+def delivery_stats():
+    """Outbox counts by status plus per-subscriber success rate and latency"""
+    try:
+        return jsonify(get_emitter().stats()), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/webhooks/dead-letters', methods=['GET'])
+def list_dead_letters():
+    """Deliveries that ran out of attempts (or were rejected outright)"""
+    try:
+        limit = min(int(request.args.get('limit', 50)), 500)
+        dead = get_emitter().outbox.dead_letters(limit)
+        return jsonify({'dead_letters': dead, 'count': len(dead)}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/webhooks/dead-letters/<delivery_id>/retry', methods=['POST'])
+def retry_dead_letter(delivery_id):
+    """Put a dead-lettered delivery back in the retry queue with a fresh set of attempts"""
+    try:
+        emitter = get_emitter()
+        if not emitter.outbox.requeue(delivery_id):
+            return jsonify({'error': 'Dead-lettered delivery not found'}), 404
+        # The retry loop picks it up; don't attempt (or claim other due deliveries) on the request thread
+        emitter.notify()
+        return jsonify({'status': 'requeued', 'delivery_id': delivery_id}), 202
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
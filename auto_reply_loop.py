@@ -6,13 +6,31 @@ Runs every 5 minutes to:
 2. Draft responses with Claude
 3. Send replies back to GoDaddy
 4. Sync to spreadsheet
+
+The steps run in-process as stages of one long-lived AutoReplyPipeline that
+shares a SQLite connection across cycles; drafting goes through pooled HTTP
+sessions (sending is still a placeholder that makes no HTTP call). Drafting
+and sending can fan out over AUTO_REPLY_DRAFT_CONCURRENCY /
+AUTO_REPLY_SEND_CONCURRENCY threads. Between cycles the runner watches
+lead_pipeline.db and starts the next cycle as soon as another process commits
+to it (no sooner than AUTO_REPLY_MIN_GAP seconds after the last one), or
+after AUTO_REPLY_INTERVAL seconds at the latest.
 """
 import os
+import sys
 import json
+import sqlite3
+import threading
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import time
 
+import fetch_godaddy_leads
+import reply_generator
+import send_godaddy_reply
+from outbound_http import get_http
+
 LOG_DIR = ".logs"
 
 def log_action(message):
@@ -35,7 +53,7 @@ STATUS_DIR = os.path.join(
     'workspaceopenclaw gateway', 'trifecta', 'agent-status'
 )
 
-def write_scout_status(status: str, leads_processed: int = 0, errors: list = None):
+def write_scout_status(status: str, leads_processed: int = 0, errors: list = None, stage_ms: dict = None):
     """Write Scout agent status to the shared status directory."""
     os.makedirs(STATUS_DIR, exist_ok=True)
     from datetime import timezone
@@ -52,9 +70,14 @@ def write_scout_status(status: str, leads_processed: int = 0, errors: list = Non
     existing['auto_reply_leads_processed'] = leads_processed
     if errors:
         existing['auto_reply_errors'] = errors
+    if stage_ms is not None:
+        existing['auto_reply_stage_ms'] = stage_ms
     with open(scout_file, 'w') as f:
         json.dump(existing, f, indent=2)
 
+DB_PATH = 'lead_pipeline.db'
+SCOUT_SCRIPT = 'scout_godaddy_api.py'
+
 def run_step(script_name):
     """Run a Python script and return success status."""
     try:
@@ -72,76 +95,226 @@ def run_step(script_name):
         log_action(f"ERROR running {script_name}: {str(e)}")
         return False
 
-def sync_to_spreadsheet():
-    """Sync database to master spreadsheet."""
-    try:
-        log_action("Running spreadsheet sync...")
-        result = subprocess.run([VENV_PYTHON, 'sync_spreadsheet.py'], capture_output=True, timeout=60)
-        
-        if result.returncode == 0:
-            log_action("Spreadsheet sync completed")
-            return True
-        else:
-            log_action(f"ERROR in spreadsheet sync: {result.stderr.decode()}")
-            return False
-            
-    except Exception as e:
-        log_action(f"ERROR syncing spreadsheet: {str(e)}")
-        return False
+class StageResult:
+    """Outcome and wall time of one pipeline stage"""
 
-def run_cycle():
-    """Run one complete cycle of the automated reply loop."""
-    log_action("========== AUTO-REPLY CYCLE START ==========")
-    write_scout_status("running")
-    errors = []
-
-    # Step 1: Fetch new GoDaddy conversations (API-first, no browser needed)
-    if not run_step("scout_godaddy_api.py"):
-        log_action("WARNING: Re:amaze API fetch failed, trying browser fallback...")
-        if not run_step("fetch_godaddy_leads.py"):
+    def __init__(self, name, ok, items=0, seconds=0.0, error=None):
+        self.name = name
+        self.ok = ok
+        self.items = items
+        self.seconds = seconds
+        self.error = error
+
+    def as_dict(self):
+        return {'ok': self.ok, 'items': self.items, 'ms': round(self.seconds * 1000, 1), 'error': self.error}
+
+class AutoReplyPipeline:
+    """fetch -> draft -> send -> sync as in-process stages over one DB connection and HTTP client"""
+
+    def __init__(self, db_path=DB_PATH, draft_concurrency=1, send_concurrency=1, batch_size=10, http=None):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self.http = http or get_http()
+        self.http.configure_host(reply_generator.FLASK_API_URL, timeout=60, pool_maxsize=max(4, draft_concurrency))
+        self.draft_concurrency = max(1, draft_concurrency)
+        self.send_concurrency = max(1, send_concurrency)
+        self.batch_size = batch_size
+        self.cycles = 0
+        self.last_results = []
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._data_version = None
+
+    def _stage(self, name, fn):
+        started = time.perf_counter()
+        error = None
+        try:
+            ok, items = fn()
+        except Exception as e:
+            ok, items, error = False, 0, str(e)
+            log_action(f"ERROR in {name} stage: {error}")
+        if self.conn.in_transaction:
+            # A step that failed mid-write must not leave the shared connection holding a transaction
+            self.conn.rollback()
+        result = StageResult(name, ok, items, time.perf_counter() - started, error)
+        log_action(f"Stage {name}: {'ok' if ok else 'FAILED'}, {items} item(s) in {result.seconds * 1000:.0f}ms")
+        return result
+
+    @staticmethod
+    def _map(fn, items, workers):
+        """Yield (item, fn(item)) in input order, fanning fn out over `workers` threads."""
+        if workers <= 1 or len(items) <= 1:
+            for item in items:
+                yield item, fn(item)
+            return
+        with ThreadPoolExecutor(max_workers=min(workers, len(items)), thread_name_prefix='auto-reply') as pool:
+            yield from zip(items, pool.map(fn, items))
+
+    def fetch(self):
+        # scout_godaddy_api.py is a standalone script (not importable here), so it still runs as a subprocess
+        if os.path.exists(SCOUT_SCRIPT) and run_step(SCOUT_SCRIPT):
+            return True, 0
+        log_action("Re:amaze API fetch unavailable or failed, using browser fallback in-process...")
+        conversations = fetch_godaddy_leads.get_godaddy_conversations()
+        new_leads = fetch_godaddy_leads.get_new_leads(conversations, conn=self.conn)
+        return True, fetch_godaddy_leads.insert_leads_to_db(new_leads, conn=self.conn)
+
+    def draft(self):
+        leads = reply_generator.get_awaiting_response_leads(conn=self.conn, limit=self.batch_size)
+        drafted = 0
+        # Drafts are generated concurrently; the shared connection is only written from this thread
+        drafts = self._map(lambda lead: reply_generator.draft_response(lead['initial_message'], http=self.http),
+                           leads, self.draft_concurrency)
+        for lead, draft in drafts:
+            if draft and reply_generator.store_draft_response(lead['id'], draft, conn=self.conn):
+                drafted += 1
+                log_action(f"Stored draft for lead {lead['id']}")
+        return True, drafted
+
+    def send(self):
+        leads = send_godaddy_reply.get_ready_to_send_leads(conn=self.conn, limit=self.batch_size)
+        sent_count = 0
+        # send_godaddy_reply is a placeholder with no HTTP call yet; pass self.http once it makes one
+        sends = self._map(lambda lead: send_godaddy_reply.send_godaddy_reply(lead['source_id'], lead['draft_response']),
+                          leads, self.send_concurrency)
+        for lead, sent in sends:
+            if sent and send_godaddy_reply.mark_sent(lead['id'], conn=self.conn):
+                sent_count += 1
+                log_action(f"Sent reply for lead {lead['id']}")
+        return True, sent_count
+
+    def sync(self):
+        import sync_db_to_spreadsheet  # needs openpyxl, so only imported when the stage runs
+        result = sync_db_to_spreadsheet.sync_to_spreadsheet()
+        return result is not None, (result or {}).get('written', 0)
+
+    def run_cycle(self, reason='scheduled'):
+        """Run one complete cycle of the automated reply loop."""
+        log_action(f"========== AUTO-REPLY CYCLE START ({reason}) ==========")
+        write_scout_status("running")
+        errors = []
+        results = []
+
+        # Step 1: Fetch new GoDaddy conversations (API-first, no browser needed)
+        fetched = self._stage('fetch', self.fetch)
+        results.append(fetched)
+        if not fetched.ok:
             log_action("SKIPPING CYCLE: both fetch methods failed")
             errors.append("fetch failed (API + browser)")
-            write_scout_status("error", 0, errors)
+            self._finish_cycle(results)
+            write_scout_status("error", 0, errors, self.stage_ms())
             return False
 
-    time.sleep(2)
+        # Step 2: Draft responses with Claude
+        results.append(self._stage('draft', self.draft))
+        if not results[-1].ok:
+            log_action("WARNING: reply generation failed, continuing...")
+            errors.append("reply_generator failed")
+
+        # Step 3: Send replies to GoDaddy
+        results.append(self._stage('send', self.send))
+        if not results[-1].ok:
+            log_action("WARNING: sending failed, continuing...")
+            errors.append("send_godaddy_reply failed")
 
-    # Step 2: Draft responses with Claude
-    if not run_step("reply_generator.py"):
-        log_action("WARNING: reply generation failed, continuing...")
-        errors.append("reply_generator failed")
+        # Step 4: Sync to spreadsheet
+        results.append(self._stage('sync', self.sync))
 
-    time.sleep(2)
+        self._finish_cycle(results)
+        write_scout_status("idle", fetched.items, errors if errors else None, self.stage_ms())
+        log_action("========== AUTO-REPLY CYCLE COMPLETE ==========")
+        return True
+
+    def _finish_cycle(self, results):
+        self.cycles += 1
+        self.last_results = results
+        log_action("Stage timings: " + ', '.join(f"{r.name} {r.seconds * 1000:.0f}ms" for r in results))
+        # Our own commits don't bump data_version on this connection; anything written since
+        # by another process (the Flask app, the scout script) will
+        self._db_changed()
+
+    def stage_ms(self):
+        return {r.name: r.as_dict() for r in self.last_results}
+
+    def _db_changed(self):
+        """True when another connection has committed to the DB since the last check."""
+        try:
+            version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error:
+            return False
+        changed = self._data_version is not None and version != self._data_version
+        self._data_version = version
+        return changed
 
-    # Step 3: Send replies to GoDaddy
-    if not run_step("send_godaddy_reply.py"):
-        log_action("WARNING: sending failed, continuing...")
-        errors.append("send_godaddy_reply failed")
+    def trigger(self):
+        """Start the next cycle now (subject to the minimum gap)."""
+        self._wake.set()
 
-    time.sleep(2)
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
 
-    # Step 4: Sync to spreadsheet
-    sync_to_spreadsheet()
+    def serve_forever(self, interval=300, min_gap=30, poll=5):
+        """Run a cycle on start, then whenever the DB changes or trigger() is called, at least every `interval`s."""
+        next_due = time.monotonic()
+        last_run = None
+        pending = None
+        while not self._stop.is_set():
+            if self._db_changed():
+                pending = pending or 'db change'
+            if self._wake.is_set():
+                self._wake.clear()
+                pending = pending or 'trigger'
+            now = time.monotonic()
+            if now >= next_due:
+                pending = pending or 'interval'
+            if pending and (last_run is None or now - last_run >= min_gap or pending == 'interval'):
+                try:
+                    self.run_cycle(pending)
+                except Exception as e:
+                    log_action(f"CYCLE ERROR (will retry next interval): {e}")
+                pending = None
+                last_run = time.monotonic()
+                next_due = last_run + interval
+                log_action(f"Waiting for DB changes (next cycle in at most {interval}s)...")
+                continue
+            self._wake.wait(poll)
 
-    write_scout_status("idle", 0, errors if errors else None)
-    log_action("========== AUTO-REPLY CYCLE COMPLETE ==========")
-    return True
+    def close(self):
+        self.conn.close()
+
+_pipeline = None
+
+def get_pipeline():
+    """Process-wide pipeline configured from AUTO_REPLY_* env settings"""
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = AutoReplyPipeline(
+            draft_concurrency=int(os.environ.get('AUTO_REPLY_DRAFT_CONCURRENCY', '4')),
+            send_concurrency=int(os.environ.get('AUTO_REPLY_SEND_CONCURRENCY', '1')),
+            batch_size=int(os.environ.get('AUTO_REPLY_BATCH', '10')),
+        )
+    return _pipeline
+
+def run_cycle():
+    """Run one complete cycle of the automated reply loop."""
+    return get_pipeline().run_cycle()
 
 if __name__ == "__main__":
     INTERVAL_SECONDS = int(os.environ.get('AUTO_REPLY_INTERVAL', '300'))  # 5 min default
-    log_action(f"Automated reply loop starting (interval: {INTERVAL_SECONDS}s, continuous mode)...")
+    MIN_GAP_SECONDS = int(os.environ.get('AUTO_REPLY_MIN_GAP', '30'))
+    WATCH_SECONDS = float(os.environ.get('AUTO_REPLY_WATCH_SECONDS', '5'))
+    pipeline = get_pipeline()
 
-    while True:
-        try:
-            run_cycle()
-        except KeyboardInterrupt:
-            log_action("Auto-reply loop stopped by user.")
-            break
-        except Exception as e:
-            log_action(f"CYCLE ERROR (will retry next interval): {e}")
-        log_action(f"Sleeping {INTERVAL_SECONDS}s until next cycle...")
-        try:
-            time.sleep(INTERVAL_SECONDS)
-        except KeyboardInterrupt:
-            log_action("Auto-reply loop stopped by user.")
-            break
+    if '--once' in sys.argv[1:]:
+        pipeline.run_cycle('once')
+        sys.exit(0)
+
+    log_action(f"Automated reply loop starting (interval: {INTERVAL_SECONDS}s, event-driven, "
+               f"draft concurrency {pipeline.draft_concurrency}, send concurrency {pipeline.send_concurrency})...")
+    try:
+        pipeline.serve_forever(INTERVAL_SECONDS, MIN_GAP_SECONDS, WATCH_SECONDS)
+    except KeyboardInterrupt:
+        log_action("Auto-reply loop stopped by user.")
+    finally:
+        pipeline.close()
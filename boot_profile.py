@@ -0,0 +1,108 @@
+"""Startup profiling and deferred initialization for Trifecta AI Agent
+
+`BootProfiler` records how long each phase of importing app.py takes (from the
+first import to the last `mark()`), so a slow cold start can be traced to the
+phase that caused it. In fast-boot mode, initialization that no request needs
+to bind the port (skill files, the scheduler, schema checks) is queued with
+`run_or_defer()` instead of run inline. The queue then runs once, either in a
+background thread started after import or on the first request, whichever
+comes first.
+"""
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class BootProfiler:
+    """Per-phase startup timings plus a run-once queue of deferred init steps"""
+
+    def __init__(self, fast: bool = False):
+        self.fast = fast
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+        self._last = self.started
+        self.phases: List[Tuple[str, float]] = []
+        self.ready_seconds: Optional[float] = None
+        self._deferred: List[Tuple[str, Callable[[], Any]]] = []
+        self.deferred_phases: List[Tuple[str, float]] = []
+        self.deferred_errors: Dict[str, str] = {}
+        self.deferred_done = threading.Event()
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+
+    def mark(self, phase: str):
+        """Close `phase`: everything since the previous mark is attributed to it."""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def run_or_defer(self, phase: str, fn: Callable[[], Any]):
+        """Run `fn` now and close `phase` after it, or queue it when booting fast.
+
+        Mark the code before the call first, or its time is counted in `phase`.
+        """
+        if self.fast:
+            with self._lock:
+                self._deferred.append((phase, fn))
+                self.deferred_done.clear()
+            return None
+        try:
+            return fn()
+        finally:
+            self.mark(phase)
+
+    def finish(self):
+        """End of import: log the phase report and start the deferred queue."""
+        self.ready_seconds = time.perf_counter() - self.started
+        ranked = sorted(self.phases, key=lambda p: p[1], reverse=True)
+        logger.info("[BOOT] Imported in %.0fms%s: %s", self.ready_seconds * 1000,
+                    ' (fast boot)' if self.fast else '',
+                    ', '.join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in ranked[:8]))
+        with self._lock:
+            pending = bool(self._deferred)
+        if not pending:
+            self.deferred_done.set()
+            return
+        threading.Thread(target=self.run_deferred, name='boot-deferred', daemon=True).start()
+
+    def run_deferred(self):
+        """Run every queued step once; concurrent callers wait until the queue is drained."""
+        if self.deferred_done.is_set():
+            return
+        ran = []
+        with self._run_lock:
+            while True:
+                with self._lock:
+                    if not self._deferred:
+                        break
+                    phase, fn = self._deferred.pop(0)
+                started = time.perf_counter()
+                try:
+                    fn()
+                except Exception as e:
+                    self.deferred_errors[phase] = str(e)
+                    logger.error(f"[BOOT] Deferred init '{phase}' failed: {e}")
+                ran.append((phase, time.perf_counter() - started))
+                with self._lock:
+                    self.deferred_phases.append(ran[-1])
+            self.deferred_done.set()
+        if ran:
+            logger.info("[BOOT] Deferred init finished: " + ', '.join(
+                f"{name} {seconds * 1000:.0f}ms" for name, seconds in ran))
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = [phase for phase, _ in self._deferred]
+            deferred = list(self.deferred_phases)
+        return {
+            'fast_boot': self.fast,
+            'started_at': self.started_at,
+            'import_ms': round(self.ready_seconds * 1000, 1) if self.ready_seconds is not None else None,
+            'phases_ms': {name: round(seconds * 1000, 1) for name, seconds in self.phases},
+            'deferred_ms': {name: round(seconds * 1000, 1) for name, seconds in deferred},
+            'deferred_pending': pending,
+            'deferred_errors': dict(self.deferred_errors),
+        }
@@ -13,6 +13,8 @@ from datetime import datetime, timezone
 from flask import Blueprint, request, jsonify
 import requests
 
+from sql_profiler import connect as profiled_connect
+
 logger = logging.getLogger(__name__)
 
 _default_db_dir = os.path.join(os.path.dirname(__file__), '..', 'trifecta-ai-agent')
@@ -28,7 +30,7 @@ content_bp = Blueprint('content', __name__, url_prefix='/api/content')
 def _get_db():
     db_path = CONTENT_DB_PATH
     os.makedirs(os.path.dirname(db_path), exist_ok=True)
-    conn = sqlite3.connect(db_path)
+    conn = profiled_connect(db_path)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")
     _ensure_table(conn)
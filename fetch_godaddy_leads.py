@@ -45,10 +45,12 @@ def get_godaddy_conversations():
         log_action(f"ERROR fetching GoDaddy conversations: {str(e)}")
         return []
 
-def get_new_leads(conversations):
+def get_new_leads(conversations, conn=None):
     """Compare against DB to find new leads."""
+    own_conn = conn is None
     try:
-        conn = sqlite3.connect(DB_PATH)
+        if own_conn:
+            conn = sqlite3.connect(DB_PATH)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
@@ -62,7 +64,8 @@ def get_new_leads(conversations):
             if conv_id and str(conv_id) not in existing_ids:
                 new_leads.append(conv)
         
-        conn.close()
+        if own_conn:
+            conn.close()
         log_action(f"Found {len(new_leads)} new leads out of {len(conversations)} total conversations")
         return new_leads
         
@@ -70,10 +73,12 @@ def get_new_leads(conversations):
         log_action(f"ERROR checking for new leads: {str(e)}")
         return []
 
-def insert_leads_to_db(new_leads):
+def insert_leads_to_db(new_leads, conn=None):
     """Insert new leads into database."""
+    own_conn = conn is None
     try:
-        conn = sqlite3.connect(DB_PATH)
+        if own_conn:
+            conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
         
         inserted_count = 0
@@ -93,7 +98,8 @@ def insert_leads_to_db(new_leads):
             inserted_count += 1
         
         conn.commit()
-        conn.close()
+        if own_conn:
+            conn.close()
         
         log_action(f"Inserted {inserted_count} new leads into database")
         return inserted_count
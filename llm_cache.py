@@ -0,0 +1,118 @@
+"""Content-addressed LLM response cache for Trifecta AI Agent
+
+Responses are keyed on a hash of (provider, model, system prompt, message,
+max_tokens) and persisted in SQLite so they survive restarts. Entries expire
+after a TTL; once the cache holds more than `max_entries` rows the least
+recently used ones are evicted.
+"""
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+
+def cache_key(provider: str, model: str, system: str, message: str, max_tokens: int) -> str:
+    raw = json.dumps([provider, model, system or '', message or '', int(max_tokens)], separators=(',', ':'))
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite-backed TTL + LRU cache of completion text"""
+
+    def __init__(self, db_path: str, ttl: float = 86400, max_entries: int = 5000, timeout: float = 5.0):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        with self._conn() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    provider TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_hit_at REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_hit ON llm_cache(last_hit_at)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, provider: str, model: str, system: str, message: str, max_tokens: int) -> Optional[str]:
+        key = cache_key(provider, model, system, message, max_tokens)
+        now = time.time()
+        with self._conn() as conn:
+            row = conn.execute("SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row and now - row[1] <= self.ttl:
+                conn.execute("UPDATE llm_cache SET last_hit_at = ?, hits = hits + 1 WHERE key = ?", (now, key))
+            elif row:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                row = None
+        with self._lock:
+            if row:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return row[0] if row else None
+
+    def put(self, provider: str, model: str, system: str, message: str, max_tokens: int, response: str):
+        if not response:
+            return
+        key = cache_key(provider, model, system, message, max_tokens)
+        now = time.time()
+        with self._conn() as conn:
+            conn.execute(
+                """INSERT INTO llm_cache (key, provider, model, response, created_at, last_hit_at, hits)
+                   VALUES (?, ?, ?, ?, ?, ?, 0)
+                   ON CONFLICT(key) DO UPDATE SET response = excluded.response,
+                       created_at = excluded.created_at, last_hit_at = excluded.last_hit_at""",
+                (key, provider, model, response, now, now)
+            )
+            conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,))
+            overflow = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY last_hit_at LIMIT ?)",
+                    (overflow,)
+                )
+        with self._lock:
+            self.stores += 1
+            self.evictions += max(overflow, 0)
+
+    def clear(self):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM llm_cache")
+
+    def stats(self) -> Dict:
+        with self._conn() as conn:
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(response)), 0) FROM llm_cache").fetchone()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': entries,
+                'bytes': size,
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'stores': self.stores,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,295 @@
+"""Health-scored LLM provider routing for Trifecta AI Agent
+
+Each provider keeps a rolling window of call latencies and outcomes. A provider
+whose recent calls keep failing has its circuit opened and is skipped until a
+cooldown passes, after which a single trial call is let through (half-open).
+
+With hedging on, when the preferred provider has not answered within its own
+p95 latency the next provider is raced against it and the first success wins.
+The losing call cannot be cancelled mid-request; it finishes in the background
+and its outcome still feeds the health window.
+"""
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+@dataclass
+class RouterPolicy:
+    window: int = 50
+    failure_threshold: int = 3  # consecutive failures that open the circuit
+    error_rate_threshold: float = 0.5  # ...or this error rate over at least min_samples calls
+    min_samples: int = 10
+    cooldown: float = 30.0
+    hedge: bool = False
+    hedge_min_delay: float = 1.0
+    hedge_max_delay: float = 8.0
+    hedge_default_delay: float = 4.0  # until a provider has min_samples latencies
+    max_workers: int = 8
+    concurrency: Dict[str, int] = field(default_factory=dict)  # provider -> max in-flight calls
+
+
+class CircuitOpenError(RuntimeError):
+    """Provider skipped because its circuit breaker is open"""
+
+
+class AllProvidersFailed(RuntimeError):
+    """Every candidate failed or was skipped; `errors` holds (provider, exception) pairs"""
+
+    def __init__(self, errors: List[Tuple[str, BaseException]]):
+        self.errors = errors
+        super().__init__('; '.join(f"{name}: {err}" for name, err in errors) or 'no providers available')
+
+
+def _percentile(values: Sequence[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+class ProviderHealth:
+    """Rolling latency/outcome window and circuit state for one provider"""
+
+    def __init__(self, name: str, window: int):
+        self.name = name
+        self.latencies: deque = deque(maxlen=max(1, window))
+        self.outcomes: deque = deque(maxlen=max(1, window))
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self.calls = 0
+        self.failures = 0
+        self.skipped = 0
+        self.hedged = 0
+        self.hedged_wins = 0
+        self.circuit_opens = 0
+
+    def error_rate(self) -> float:
+        return (self.outcomes.count(False) / len(self.outcomes)) if self.outcomes else 0.0
+
+    def state(self, now: float, cooldown: float) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        return 'open' if now - self.opened_at < cooldown else 'half_open'
+
+
+class ProviderRouter:
+    """Skips providers with an open circuit (half-open ones go last), trips breakers and optionally hedges slow calls"""
+
+    def __init__(self, policy: Optional[RouterPolicy] = None,
+                 on_record: Optional[Callable[[str, bool, Optional[float]], None]] = None):
+        self.policy = policy or RouterPolicy()
+        self.on_record = on_record
+        self._health: Dict[str, ProviderHealth] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots = {name: threading.BoundedSemaphore(limit)
+                       for name, limit in self.policy.concurrency.items() if limit and limit > 0}
+
+    def slot(self, name: str):
+        """Hold one of the provider's concurrency slots (blocks while all are in use)."""
+        slot = self._slots.get(name)
+        return slot if slot is not None else nullcontext()
+
+    def _invoke(self, name: str, invoke: Callable[[], Any]) -> Any:
+        with self.slot(name):
+            return invoke()
+
+    def _get(self, name: str) -> ProviderHealth:
+        health = self._health.get(name)
+        if health is None:
+            health = self._health[name] = ProviderHealth(name, self.policy.window)
+        return health
+
+    def route(self, candidates: Sequence[Tuple[str, Any]]) -> Tuple[List[Tuple[str, Any]], List[Tuple[str, BaseException]]]:
+        """Split candidates into (worth trying, skipped-with-reason).
+
+        Closed circuits keep their configured order; half-open providers go last.
+        """
+        now = time.monotonic()
+        healthy, trials, skipped = [], [], []
+        with self._lock:
+            for candidate in candidates:
+                health = self._get(candidate[0])
+                state = health.state(now, self.policy.cooldown)
+                if state == 'closed':
+                    healthy.append(candidate)
+                elif state == 'half_open' and not health.trial_in_flight:
+                    trials.append(candidate)
+                else:
+                    health.skipped += 1
+                    skipped.append((candidate[0], CircuitOpenError('circuit open')))
+        return healthy + trials, skipped
+
+    def admit(self, name: str) -> bool:
+        """Claim the right to call `name` now; a half-open provider admits one trial at a time."""
+        with self._lock:
+            health = self._get(name)
+            state = health.state(time.monotonic(), self.policy.cooldown)
+            if state == 'closed':
+                return True
+            if state == 'half_open' and not health.trial_in_flight:
+                health.trial_in_flight = True
+                return True
+            health.skipped += 1
+            return False
+
+    def release(self, name: str):
+        """Give back a trial claimed by admit() without an outcome, e.g. when the caller abandoned the call."""
+        with self._lock:
+            self._get(name).trial_in_flight = False
+
+    def record(self, name: str, ok: bool, latency: Optional[float] = None):
+        """Feed one call outcome; latency (seconds) only enters the hedge window for successful calls."""
+        if self.on_record is not None:
+            self.on_record(name, ok, latency)
+        now = time.monotonic()
+        with self._lock:
+            health = self._get(name)
+            health.calls += 1
+            health.trial_in_flight = False
+            health.outcomes.append(ok)
+            if ok:
+                health.consecutive_failures = 0
+                health.opened_at = None
+                if latency is not None:
+                    health.latencies.append(latency)
+                return
+            health.failures += 1
+            health.consecutive_failures += 1
+            tripped = health.consecutive_failures >= self.policy.failure_threshold or (
+                len(health.outcomes) >= self.policy.min_samples
+                and health.error_rate() >= self.policy.error_rate_threshold
+            )
+            if tripped and health.state(now, self.policy.cooldown) != 'open':
+                if health.opened_at is None:
+                    health.circuit_opens += 1
+                health.opened_at = now
+
+    def hedge_delay(self, name: str) -> float:
+        with self._lock:
+            latencies = list(self._get(name).latencies)
+        if len(latencies) < self.policy.min_samples:
+            return self.policy.hedge_default_delay
+        return min(self.policy.hedge_max_delay, max(self.policy.hedge_min_delay, _percentile(latencies, 95)))
+
+    def call(self, candidates: Sequence[Tuple[str, Callable[[], Any]]]) -> Tuple[str, Any]:
+        """Run the first healthy candidate, falling back (or hedging) to the next ones.
+
+        Returns (provider, result); raises AllProvidersFailed when nothing succeeded.
+        """
+        queue, errors = self.route(candidates)
+        if not self.policy.hedge:
+            for name, invoke in queue:
+                if not self.admit(name):
+                    errors.append((name, CircuitOpenError('circuit open')))
+                    continue
+                started = time.monotonic()
+                try:
+                    result = self._invoke(name, invoke)
+                except Exception as e:
+                    self.record(name, False, time.monotonic() - started)
+                    errors.append((name, e))
+                    continue
+                self.record(name, True, time.monotonic() - started)
+                return name, result
+            raise AllProvidersFailed(errors)
+        return self._call_hedged(queue, errors)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.policy.max_workers,
+                                                        thread_name_prefix='llm-hedge')
+        return self._executor
+
+    def _settle(self, name: str, started: float, future) -> Tuple[bool, Any]:
+        try:
+            result = future.result()
+        except Exception as e:
+            self.record(name, False, time.monotonic() - started)
+            return False, e
+        self.record(name, True, time.monotonic() - started)
+        return True, result
+
+    def _call_hedged(self, queue: List[Tuple[str, Callable[[], Any]]], errors: List[Tuple[str, BaseException]]) -> Tuple[str, Any]:
+        pending: Dict[Any, Tuple[str, float, bool]] = {}
+
+        def launch():
+            while queue:
+                name, invoke = queue.pop(0)
+                if not self.admit(name):
+                    errors.append((name, CircuitOpenError('circuit open')))
+                    continue
+                hedged = bool(pending)
+                if hedged:
+                    with self._lock:
+                        self._get(name).hedged += 1
+                pending[self._pool().submit(self._invoke, name, invoke)] = (name, time.monotonic(), hedged)
+                return
+
+        launch()
+        while pending:
+            timeout = None
+            if queue:
+                name, started, _ = max(pending.values(), key=lambda p: p[1])
+                timeout = max(0.0, started + self.hedge_delay(name) - time.monotonic())
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                launch()
+                continue
+            for future in done:
+                name, started, hedged = pending.pop(future)
+                ok, value = self._settle(name, started, future)
+                if not ok:
+                    errors.append((name, value))
+                    continue
+                if hedged:
+                    with self._lock:
+                        self._get(name).hedged_wins += 1
+                for other, (other_name, other_started, _) in pending.items():
+                    other.add_done_callback(lambda f, n=other_name, s=other_started: self._settle(n, s, f))
+                return name, value
+            if not pending and queue:
+                launch()
+        raise AllProvidersFailed(errors)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            providers = {}
+            for name, health in self._health.items():
+                latencies = list(health.latencies)
+                p50, p95 = _percentile(latencies, 50), _percentile(latencies, 95)
+                providers[name] = {
+                    'state': health.state(now, self.policy.cooldown),
+                    'health_score': round(1.0 - health.error_rate(), 3),
+                    'error_rate': round(health.error_rate(), 3),
+                    'calls': health.calls,
+                    'failures': health.failures,
+                    'consecutive_failures': health.consecutive_failures,
+                    'circuit_opens': health.circuit_opens,
+                    'skipped': health.skipped,
+                    'hedged': health.hedged,
+                    'hedged_wins': health.hedged_wins,
+                    'p50_ms': round(p50 * 1000, 1) if p50 is not None else None,
+                    'p95_ms': round(p95 * 1000, 1) if p95 is not None else None,
+                }
+        return {
+            'hedging': self.policy.hedge,
+            'cooldown_seconds': self.policy.cooldown,
+            'concurrency': dict(self.policy.concurrency),
+            'providers': providers,
+        }
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,190 @@
+"""In-process metrics registry for Trifecta AI Agent
+
+Counters, gauges and histograms rendered in the Prometheus text exposition
+format. The hot path takes no lock: every thread updates its own shard (a
+plain dict reached through threading.local) and shards are summed when
+/metrics is scraped. Shards of threads that have exited are folded into a
+base shard so short-lived worker pools do not grow the registry.
+"""
+import math
+import threading
+from bisect import bisect_left
+import weakref
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _ShardedMetric:
+    """Per-thread shards merged at collection time; subclasses define `_merge(into, value)`"""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[Tuple[weakref.ref, dict]] = []
+        self._base: dict = {}
+        self._lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append((weakref.ref(threading.current_thread()), shard))
+        return shard
+
+    def _collect(self) -> dict:
+        with self._lock:
+            live = []
+            for ref, shard in self._shards:
+                if ref() is None or not ref().is_alive():
+                    for key, value in list(shard.items()):
+                        self._base[key] = self._merge(self._base.get(key), value)
+                else:
+                    live.append((ref, shard))
+            self._shards = live
+            merged = {key: self._merge(None, value) for key, value in self._base.items()}
+            shards = [shard for _, shard in live]
+        for shard in shards:
+            for key, value in list(shard.items()):
+                merged[key] = self._merge(merged.get(key), value)
+        return merged
+
+
+class Counter(_ShardedMetric):
+    kind = 'counter'
+
+    def inc(self, *labels, amount: float = 1.0):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0.0) + amount
+
+    def _merge(self, into, value):
+        return (into or 0.0) + value
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in sorted(self._collect().items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    """Up/down gauge (sharded like a counter) with optional collect-time callbacks"""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._callback: Optional[Callable[[], Dict[Tuple, float]]] = None
+
+    def dec(self, *labels, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+    def set_function(self, fn: Callable[[], Dict[Tuple, float]]):
+        """Read values at scrape time from `fn() -> {label_values_tuple: value}`."""
+        self._callback = fn
+
+    def samples(self) -> Iterable[str]:
+        if self._callback is None:
+            yield from super().samples()
+            return
+        for labels, value in sorted(self._callback().items()):
+            labels = labels if isinstance(labels, tuple) else (labels,)
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Histogram(_ShardedMetric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._empty = (0,) * (len(self.buckets) + 1)
+
+    def observe(self, value: float, *labels):
+        # Each observation swaps in a new (counts, sum, count) tuple, so a scrape reading
+        # this shard from another thread never sees the bucket, sum and count out of step
+        shard = self._shard()
+        counts, total, count = shard.get(labels) or (self._empty, 0.0, 0)
+        i = bisect_left(self.buckets, value)  # first bucket with value <= bound, else +Inf
+        shard[labels] = (counts[:i] + (counts[i] + 1,) + counts[i + 1:], total + value, count + 1)
+
+    def _merge(self, into, value):
+        if into is None:
+            return [list(value[0]), value[1], value[2]]
+        into[0] = [a + b for a, b in zip(into[0], value[0])]
+        into[1] += value[1]
+        into[2] += value[2]
+        return into
+
+    def samples(self) -> Iterable[str]:
+        bounds = list(self.buckets) + [math.inf]
+        for labels, (counts, total, count) in sorted(self._collect().items()):
+            cumulative = 0
+            for bound, n in zip(bounds, counts):
+                cumulative += n
+                le = ('le', _format_value(bound))
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _ShardedMetric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            try:
+                lines.extend(metric.samples())
+            except Exception as e:
+                # One broken collect-time callback must not take the whole scrape down
+                lines.append(f"# collect error for {metric.name}: {_escape(e)}")
+        return '\n'.join(lines) + '\n'
+
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
@@ -0,0 +1,238 @@
+"""Shared outbound HTTP layer for Trifecta AI Agent
+
+One keep-alive requests.Session per upstream host, each with its own
+connection pool, timeout and retry policy, plus per-host reuse metrics.
+"""
+import os
+import json
+import time
+import threading
+import requests
+from dataclasses import dataclass, asdict, replace
+from typing import Callable, Dict, List, Optional, Any, Tuple
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+@dataclass
+class HostPolicy:
+    """Connection, timeout and retry settings for one upstream host"""
+    timeout: float = float(os.environ.get('OUTBOUND_DEFAULT_TIMEOUT', os.environ.get('DEFAULT_OUTBOUND_TIMEOUT', '15')))
+    pool_connections: int = int(os.environ.get('OUTBOUND_POOL_CONNECTIONS', '4'))
+    pool_maxsize: int = int(os.environ.get('OUTBOUND_POOL_MAXSIZE', '16'))
+    retries: int = int(os.environ.get('OUTBOUND_RETRIES', '2'))
+    backoff_factor: float = float(os.environ.get('OUTBOUND_RETRY_BACKOFF', '0.3'))
+    status_forcelist: Tuple[int, ...] = (429, 502, 503, 504)
+    retry_post: bool = False  # only safe for upstreams where a replayed POST has no side effects
+    read_retries: Optional[int] = None  # retries after a read error/timeout; None = `retries`
+
+    def build_retry(self) -> Retry:
+        methods = set(Retry.DEFAULT_ALLOWED_METHODS)
+        if self.retry_post:
+            methods.add('POST')
+        return Retry(
+            total=self.retries,
+            connect=self.retries,
+            read=self.retries if self.read_retries is None else self.read_retries,
+            status=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.status_forcelist,
+            allowed_methods=frozenset(methods),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+
+
+@dataclass
+class HostStats:
+    """Per-host request counters"""
+    requests: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+def _host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def _normalize_host(host_or_url: str) -> str:
+    return _host_key(host_or_url if '://' in host_or_url else f"https://{host_or_url}")
+
+
+def _policy_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+    allowed = {k: v for k, v in fields.items() if k in HostPolicy.__dataclass_fields__}
+    if 'status_forcelist' in allowed:
+        allowed['status_forcelist'] = tuple(allowed['status_forcelist'])
+    return allowed
+
+
+class OutboundHTTP:
+    """Pooled keep-alive sessions keyed by scheme://host"""
+
+    def __init__(self, default_policy: Optional[HostPolicy] = None):
+        self.default_policy = default_policy or HostPolicy()
+        self._policies: Dict[str, HostPolicy] = {}
+        self._sessions: Dict[str, requests.Session] = {}
+        self._stats: Dict[str, HostStats] = {}
+        self._env_overrides: Dict[str, Dict[str, Any]] = {}
+        self._observers: List[Callable[[str, str, str, float], None]] = []
+        self._lock = threading.Lock()
+        self._load_from_env()
+
+    def add_observer(self, fn: Callable[[str, str, str, float], None]):
+        """Call fn(host, method, status, seconds) after every request; status is 'error' on exceptions."""
+        self._observers.append(fn)
+
+    def _load_from_env(self):
+        """Load per-host overrides from OUTBOUND_HOST_POLICIES (JSON: {host: {field: value}})"""
+        raw = os.environ.get('OUTBOUND_HOST_POLICIES', '')
+        if not raw:
+            return
+        try:
+            overrides = json.loads(raw)
+        except ValueError:
+            return
+        for host, fields in (overrides or {}).items():
+            if isinstance(fields, dict):
+                self._env_overrides[_normalize_host(host)] = _policy_fields(fields)
+                self.configure_host(host)
+
+    def configure_host(self, host_or_url: str, **fields: Any) -> HostPolicy:
+        """Set the policy for a host; accepts a bare host name or any URL on that host.
+
+        Overrides from OUTBOUND_HOST_POLICIES always win over values set in code.
+        """
+        key = _normalize_host(host_or_url)
+        with self._lock:
+            policy = replace(self._policies.get(key, self.default_policy), **_policy_fields(fields))
+            policy = replace(policy, **self._env_overrides.get(key, {}))
+            self._policies[key] = policy
+            # Rebuild the session on next use so pool/retry changes take effect
+            session = self._sessions.pop(key, None)
+        if session is not None:
+            session.close()
+        return policy
+
+    def policy_for(self, url: str) -> HostPolicy:
+        return self._policies.get(_host_key(url), self.default_policy)
+
+    def session_for(self, url: str) -> requests.Session:
+        key = _host_key(url)
+        session = self._sessions.get(key)
+        if session is not None:
+            return session
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                policy = self._policies.get(key, self.default_policy)
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=policy.pool_connections,
+                    pool_maxsize=policy.pool_maxsize,
+                    max_retries=policy.build_retry(),
+                )
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._sessions[key] = session
+                self._stats.setdefault(key, HostStats())
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request over the host's pooled session; timeout defaults to the host policy"""
+        key = _host_key(url)
+        session = self.session_for(url)
+        kwargs.setdefault('timeout', self.policy_for(url).timeout)
+        started = time.perf_counter()
+        failed = False
+        status = 'error'
+        try:
+            resp = session.request(method, url, **kwargs)
+            failed = resp.status_code >= 500
+            status = str(resp.status_code)
+            return resp
+        except requests.RequestException:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                stats = self._stats.setdefault(key, HostStats())
+                stats.requests += 1
+                stats.errors += int(failed)
+                stats.total_ms += elapsed * 1000
+                stats.max_ms = max(stats.max_ms, elapsed * 1000)
+            for observer in self._observers:
+                try:
+                    observer(key, method, status, elapsed)
+                except Exception:
+                    pass
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request('PUT', url, **kwargs)
+
+    def _connections_opened(self, session: requests.Session) -> int:
+        opened = 0
+        seen = set()
+        for adapter in session.adapters.values():
+            if id(adapter) in seen:
+                continue
+            seen.add(id(adapter))
+            pools = adapter.poolmanager.pools
+            for pool_key in list(pools.keys()):
+                pool = pools.get(pool_key)
+                if pool is not None:
+                    opened += getattr(pool, 'num_connections', 0)
+        return opened
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-host request counts, latency and connection reuse"""
+        with self._lock:
+            snapshot = {key: asdict(s) for key, s in self._stats.items()}
+            sessions = dict(self._sessions)
+        result = {}
+        for key, data in snapshot.items():
+            session = sessions.get(key)
+            opened = self._connections_opened(session) if session is not None else 0
+            reused = max(data['requests'] - opened, 0)
+            result[key] = {
+                'requests': data['requests'],
+                'errors': data['errors'],
+                'connections_opened': opened,
+                'connections_reused': reused,
+                'reuse_ratio': round(reused / data['requests'], 4) if data['requests'] else 0.0,
+                'avg_ms': round(data['total_ms'] / data['requests'], 2) if data['requests'] else 0.0,
+                'max_ms': round(data['max_ms'], 2),
+                'timeout': self.policy_for(key).timeout,
+            }
+        return result
+
+    def close(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+# Global instance
+_http: Optional[OutboundHTTP] = None
+_http_lock = threading.Lock()
+
+
+def get_http() -> OutboundHTTP:
+    """Get or create the shared outbound HTTP client"""
+    global _http
+    if _http is None:
+        with _http_lock:
+            if _http is None:
+                _http = OutboundHTTP()
+    return _http
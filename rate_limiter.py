@@ -0,0 +1,243 @@
+"""Token-bucket rate limiting for Trifecta AI Agent
+
+Each (policy, client) key holds O(1) state: tokens left and the last refill
+time. The in-memory backend bounds memory with LRU eviction plus an idle TTL;
+the SQLite backend shares buckets between gunicorn workers on one host. If
+that store is busy or unavailable, checks fail open: the request is let through
+and counted in stats() as `failed_open`, so a limiter outage is not an API outage.
+"""
+import os
+import json
+import time
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RatePolicy:
+    """Refill `per_minute` tokens a minute, holding at most `burst`"""
+    per_minute: float = float(os.environ.get('RATE_LIMIT_PER_MINUTE', '60'))
+    burst: Optional[float] = None
+
+    @property
+    def capacity(self) -> float:
+        return float(self.burst if self.burst is not None else self.per_minute)
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.per_minute / 60.0
+
+    def idle_ttl(self) -> float:
+        """Seconds after which an untouched bucket is full again and can be forgotten"""
+        return self.capacity / self.refill_per_second if self.refill_per_second else 3600.0
+
+
+def _refill(tokens: float, updated_at: float, now: float, policy: RatePolicy) -> float:
+    return min(policy.capacity, tokens + max(0.0, now - updated_at) * policy.refill_per_second)
+
+
+def _consume(tokens: float, policy: RatePolicy) -> Tuple[bool, float, float]:
+    """Returns (allowed, tokens_after, retry_after_seconds)."""
+    if tokens >= 1.0:
+        return True, tokens - 1.0, 0.0
+    wait = (1.0 - tokens) / policy.refill_per_second if policy.refill_per_second else 60.0
+    return False, tokens, wait
+
+
+class MemoryBucketBackend:
+    """Per-process buckets in an LRU map capped at `max_keys`"""
+
+    name = 'memory'
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max(1, max_keys)
+        self._buckets: 'OrderedDict[str, Tuple[float, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+    def take(self, key: str, policy: RatePolicy, now: float) -> Tuple[bool, float, float]:
+        with self._lock:
+            state = self._buckets.get(key)
+            if state is None:
+                tokens = policy.capacity
+            else:
+                tokens = _refill(state[0], state[1], now, policy)
+                self._buckets.move_to_end(key)
+            allowed, tokens, retry_after = _consume(tokens, policy)
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+                self.evicted += 1
+            return allowed, tokens, retry_after
+
+    def prune(self, now: float, ttl: float) -> int:
+        """Drop buckets idle for longer than `ttl` seconds."""
+        removed = 0
+        with self._lock:
+            # LRU order means the stalest buckets are at the front
+            while self._buckets:
+                key, (_, updated_at) = next(iter(self._buckets.items()))
+                if now - updated_at <= ttl:
+                    break
+                self._buckets.popitem(last=False)
+                removed += 1
+        return removed
+
+    def size(self) -> int:
+        return len(self._buckets)
+
+
+class SQLiteBucketBackend:
+    """Buckets in a shared SQLite file so limits hold across worker processes"""
+
+    name = 'sqlite'
+
+    def __init__(self, db_path: str, max_keys: int = 10000, timeout: float = 5.0):
+        self.db_path = db_path
+        self.max_keys = max(1, max_keys)
+        self.timeout = timeout
+        self._local = threading.local()
+        self.evicted = 0
+        with self._conn() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS rate_buckets (
+                    key TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_rate_buckets_updated ON rate_buckets(updated_at)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def take(self, key: str, policy: RatePolicy, now: float) -> Tuple[bool, float, float]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated_at FROM rate_buckets WHERE key = ?", (key,)).fetchone()
+            tokens = policy.capacity if row is None else _refill(row[0], row[1], now, policy)
+            allowed, tokens, retry_after = _consume(tokens, policy)
+            conn.execute(
+                """INSERT INTO rate_buckets (key, tokens, updated_at) VALUES (?, ?, ?)
+                   ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at""",
+                (key, tokens, now)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        return allowed, tokens, retry_after
+
+    def prune(self, now: float, ttl: float) -> int:
+        conn = self._conn()
+        removed = conn.execute("DELETE FROM rate_buckets WHERE updated_at < ?", (now - ttl,)).rowcount
+        overflow = conn.execute("SELECT COUNT(*) FROM rate_buckets").fetchone()[0] - self.max_keys
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM rate_buckets WHERE key IN (SELECT key FROM rate_buckets ORDER BY updated_at LIMIT ?)",
+                (overflow,)
+            )
+            self.evicted += overflow
+            removed += overflow
+        return removed
+
+    def size(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM rate_buckets").fetchone()[0]
+
+
+class RateLimiter:
+    """Named per-route policies over a bucket backend"""
+
+    def __init__(self, backend=None, default_policy: Optional[RatePolicy] = None, prune_interval: float = 60.0):
+        self.backend = backend or MemoryBucketBackend()
+        self.default_policy = default_policy or RatePolicy()
+        self.prune_interval = prune_interval
+        self._policies: Dict[str, RatePolicy] = {}
+        self._lock = threading.Lock()
+        self._last_prune = time.time()
+        self.allowed = 0
+        self.limited = 0
+        self.failed_open = 0
+        self._load_from_env()
+
+    def _load_from_env(self):
+        """Load per-policy overrides from RATE_LIMIT_POLICIES (JSON: {name: {per_minute, burst}})"""
+        self._env_overrides: Dict[str, Dict] = {}
+        raw = os.environ.get('RATE_LIMIT_POLICIES', '')
+        if not raw:
+            return
+        try:
+            overrides = json.loads(raw)
+        except ValueError:
+            return
+        for name, fields in (overrides or {}).items():
+            if isinstance(fields, dict):
+                self._env_overrides[name] = {k: v for k, v in fields.items() if k in RatePolicy.__dataclass_fields__}
+                self.configure(name)
+
+    def configure(self, name: str, **fields) -> RatePolicy:
+        """Set a named policy; RATE_LIMIT_POLICIES overrides always win over values set in code."""
+        merged = {**asdict(self.default_policy), **fields, **self._env_overrides.get(name, {})}
+        policy = RatePolicy(**merged)
+        with self._lock:
+            self._policies[name] = policy
+        return policy
+
+    def policy(self, name: str) -> RatePolicy:
+        return self._policies.get(name, self.default_policy)
+
+    def check(self, name: str, client_key: str) -> Tuple[bool, float, float]:
+        """Take one token for `client_key` under policy `name`.
+
+        Returns (allowed, tokens_remaining, retry_after_seconds).
+        """
+        policy = self.policy(name)
+        now = time.time()
+        try:
+            allowed, remaining, retry_after = self.backend.take(f"{name}:{client_key}", policy, now)
+        except sqlite3.OperationalError as e:
+            logger.warning("Rate limiter store unavailable, letting request through: %s", e)
+            with self._lock:
+                self.failed_open += 1
+            return True, policy.capacity, 0.0
+        with self._lock:
+            if allowed:
+                self.allowed += 1
+            else:
+                self.limited += 1
+            due = now - self._last_prune > self.prune_interval
+            if due:
+                self._last_prune = now
+        if due:
+            longest_ttl = max([p.idle_ttl() for p in self._policies.values()] + [self.default_policy.idle_ttl()])
+            try:
+                self.backend.prune(now, longest_ttl)
+            except sqlite3.OperationalError as e:
+                logger.warning("Rate limiter prune skipped: %s", e)
+        return allowed, remaining, retry_after
+
+    def stats(self) -> Dict:
+        return {
+            'backend': self.backend.name,
+            'tracked_keys': self.backend.size(),
+            'max_keys': self.backend.max_keys,
+            'evicted': self.backend.evicted,
+            'allowed': self.allowed,
+            'limited': self.limited,
+            'failed_open': self.failed_open,
+            'policies': {name: asdict(p) for name, p in self._policies.items()},
+        }
@@ -0,0 +1,258 @@
+"""Real-time event delivery for Trifecta AI Agent
+
+DashboardEmitter pushes events to the Lamby Command Center from a single
+dispatcher thread: a bounded ring buffer (drop-oldest when full) is drained
+in batches over the shared keep-alive outbound HTTP session.
+
+EventHub is the in-process pub/sub behind the /api/stream SSE endpoint.
+"""
+import json
+import time
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from requests.exceptions import RequestException
+
+from outbound_http import OutboundHTTP, get_http
+
+logger = logging.getLogger(__name__)
+
+
+class DashboardEmitter:
+    """Bounded, batching emitter for the dashboard's /api/realtime/emit endpoint.
+
+    Multi-event batches go to `/api/realtime/emit/batch` as {"events": [...]}.
+    If the dashboard does not expose that route (404/405) the emitter falls back
+    to one POST per event, still over the same pooled connection.
+    """
+
+    def __init__(self, base_url: str, http: Optional[OutboundHTTP] = None, capacity: int = 1000,
+                 max_batch: int = 50, flush_interval: float = 0.05):
+        self.base_url = base_url.rstrip('/')
+        self.http = http or get_http()
+        self.capacity = max(1, capacity)
+        self.max_batch = max(1, max_batch)
+        self.flush_interval = flush_interval
+        self._buffer: deque = deque(maxlen=self.capacity)
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = False
+        self._in_flight = 0
+        self.batch_supported = True
+        self.enqueued = 0
+        self.emitted = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self.batched_events = 0
+
+    def emit(self, event_type: str, message: str, data: Optional[Dict[str, Any]] = None):
+        """Queue an event; never blocks on the network. Drops the oldest event when full."""
+        event = {'event_type': event_type, 'message': message, 'data': data or {}}
+        with self._cond:
+            if len(self._buffer) == self.capacity:
+                self.dropped += 1
+            self._buffer.append(event)
+            self.enqueued += 1
+            self._cond.notify()
+        self._ensure_started()
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop = False
+                self._thread = threading.Thread(target=self._run, name='dashboard-emitter', daemon=True)
+                self._thread.start()
+
+    def _take_batch(self) -> List[Dict[str, Any]]:
+        with self._cond:
+            while not self._buffer and not self._stop:
+                self._cond.wait()
+            if not self._buffer:
+                return []
+            # Give a burst a moment to coalesce into one POST
+            if len(self._buffer) < self.max_batch and self.flush_interval > 0 and not self._stop:
+                self._cond.wait(self.flush_interval)
+            batch = [self._buffer.popleft() for _ in range(min(self.max_batch, len(self._buffer)))]
+            self._in_flight = len(batch)
+            return batch
+
+    def _post(self, path: str, payload: Dict[str, Any]):
+        return self.http.post(f"{self.base_url}{path}", json=payload)
+
+    def _send(self, batch: List[Dict[str, Any]]) -> int:
+        """Deliver a batch; returns how many events the dashboard accepted."""
+        if len(batch) > 1 and self.batch_supported:
+            resp = self._post('/api/realtime/emit/batch', {'events': batch})
+            if resp.status_code in (404, 405):
+                logger.info("[Realtime Emit] Dashboard has no batch endpoint; sending events individually")
+                self.batch_supported = False
+            else:
+                self.batches += 1
+                if resp.status_code == 200:
+                    self.batched_events += len(batch)
+                    return len(batch)
+                logger.warning(f"[Realtime Emit] Batch failed ({resp.status_code}): {len(batch)} events")
+                return 0
+        delivered = 0
+        for event in batch:
+            resp = self._post('/api/realtime/emit', event)
+            self.batches += 1
+            if resp.status_code == 200:
+                delivered += 1
+                logger.debug(f"[Realtime Emit] {event['event_type']}: {event['message']}")
+            else:
+                logger.warning(f"[Realtime Emit] Failed ({resp.status_code}): {event['event_type']}")
+        return delivered
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return
+            try:
+                delivered = self._send(batch)
+            except RequestException as e:
+                # Non-blocking: dashboard might not be running locally
+                logger.debug(f"[Realtime Emit] Dashboard unreachable: {e}")
+                delivered = 0
+            with self._cond:
+                self.emitted += delivered
+                self.failed += len(batch) - delivered
+                self._in_flight = 0
+                self._cond.notify_all()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until the buffer is drained. Returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._buffer or self._in_flight:
+                if self._thread is None or not self._thread.is_alive():
+                    return False
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.notify_all()
+                self._cond.wait(min(remaining, 0.05))
+        return True
+
+    def close(self, timeout: float = 5.0):
+        self.flush(timeout)
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                'queued': len(self._buffer),
+                'capacity': self.capacity,
+                'enqueued': self.enqueued,
+                'emitted': self.emitted,
+                'dropped': self.dropped,
+                'failed': self.failed,
+                'batches': self.batches,
+                'batched_events': self.batched_events,
+                'batch_endpoint': self.batch_supported,
+            }
+
+
+class Subscription:
+    """One subscriber's bounded event queue; the slowest client only ever loses its own oldest events"""
+
+    def __init__(self, topics: Optional[Iterable[str]] = None, maxsize: int = 256):
+        self.topics = set(topics) if topics else None
+        self._queue: deque = deque(maxlen=max(1, maxsize))
+        self._cond = threading.Condition()
+        self.closed = False
+        self.dropped = 0
+
+    def wants(self, event_type: str) -> bool:
+        return self.topics is None or event_type in self.topics
+
+    def put(self, event: Dict[str, Any]):
+        with self._cond:
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+            self._queue.append(event)
+            self._cond.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Next event, or None on timeout / close."""
+        with self._cond:
+            if not self._queue and not self.closed:
+                self._cond.wait(timeout)
+            return self._queue.popleft() if self._queue else None
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class EventHub:
+    """In-process pub/sub with a short replay history for Last-Event-ID resumes"""
+
+    def __init__(self, history: int = 256, subscriber_queue: int = 256):
+        self.subscriber_queue = subscriber_queue
+        self._history: deque = deque(maxlen=max(1, history))
+        self._subscribers: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self.published = 0
+
+    def publish(self, event_type: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        with self._lock:
+            event = {
+                'id': self._next_id,
+                'type': event_type,
+                'data': data or {},
+                'ts': datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace('+00:00', 'Z'),
+            }
+            self._next_id += 1
+            self.published += 1
+            self._history.append(event)
+            subscribers = [sub for sub in self._subscribers if sub.wants(event_type)]
+        for sub in subscribers:
+            sub.put(event)
+        return event
+
+    def subscribe(self, topics: Optional[Iterable[str]] = None, last_event_id: Optional[int] = None) -> Subscription:
+        """Register a subscriber; with last_event_id, buffered events after it are replayed first."""
+        sub = Subscription(topics, maxsize=self.subscriber_queue)
+        with self._lock:
+            if last_event_id is not None:
+                for event in self._history:
+                    if event['id'] > last_event_id and sub.wants(event['type']):
+                        sub.put(event)
+            self._subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            if sub in self._subscribers:
+                self._subscribers.remove(sub)
+        sub.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'subscribers': len(self._subscribers),
+                'published': self.published,
+                'last_event_id': self._next_id - 1,
+                'subscriber_dropped': sum(sub.dropped for sub in self._subscribers),
+            }
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Render a hub event as a text/event-stream frame"""
+    payload = json.dumps({'data': event['data'], 'ts': event['ts']}, separators=(',', ':'), default=str)
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {payload}\n\n"
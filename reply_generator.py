@@ -23,10 +23,12 @@ def log_action(message):
     with open(log_file, "a") as f:
         f.write(log_msg + "\n")
 
-def get_awaiting_response_leads():
-    """Get leads that need responses drafted."""
+def get_awaiting_response_leads(conn=None, limit=10):
+    """Get leads that need responses drafted (on `conn` when the pipeline runner shares one)."""
+    own_conn = conn is None
     try:
-        conn = sqlite3.connect(DB_PATH)
+        if own_conn:
+            conn = sqlite3.connect(DB_PATH)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
@@ -35,11 +37,12 @@ def get_awaiting_response_leads():
             FROM leads
             WHERE status = 'AWAITING_RESPONSE' 
             AND draft_response IS NULL
-            LIMIT 10
-        """)
+            LIMIT ?
+        """, (limit,))
         
         leads = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        if own_conn:
+            conn.close()
         
         log_action(f"Found {len(leads)} leads awaiting response drafts")
         return leads
@@ -48,8 +51,8 @@ def get_awaiting_response_leads():
         log_action(f"ERROR fetching awaiting-response leads: {str(e)}")
         return []
 
-def draft_response(lead_message):
-    """Use Claude to draft a warm, professional response."""
+def draft_response(lead_message, http=None):
+    """Use Claude to draft a warm, professional response (over `http`'s pooled sessions if given)."""
     try:
         prompt = f"""You are a warm, professional addiction recovery intake specialist responding to a potential client inquiry.
 
@@ -64,9 +67,9 @@ Keep it professional, warm, and human. No marketing jargon.
 Do NOT use em dashes (--). Use commas, periods, or colons instead."""
 
         # Use Flask API layer (avoids Python 3.14 Anthropic SDK incompatibility)
-        resp = http_requests.post(
+        resp = (http or http_requests).post(
             f"{FLASK_API_URL}/api/chat",
-            json={"message": prompt, "skill": "trifecta-lead-intake-workflow"},
+            json={"message": prompt, "skill": "trifecta-lead-intake-workflow", "cache": False},
             timeout=60
         )
         resp.raise_for_status()
@@ -79,20 +82,24 @@ Do NOT use em dashes (--). Use commas, periods, or colons instead."""
         log_action(f"ERROR drafting response with Claude: {str(e)}")
         return None
 
-def store_draft_response(lead_id, draft_response):
+def store_draft_response(lead_id, draft_response, conn=None):
     """Store drafted response in database."""
+    own_conn = conn is None
     try:
-        conn = sqlite3.connect(DB_PATH)
+        if own_conn:
+            conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
         
         cursor.execute("""
             UPDATE leads
-            SET draft_response = ?, status = 'AWAITING_SEND'
+            SET draft_response = ?, status = 'AWAITING_SEND',
+                updated_at = strftime('%Y-%m-%dT%H:%M:%SZ', 'now')
             WHERE id = ?
         """, (draft_response, lead_id))
         
         conn.commit()
-        conn.close()
+        if own_conn:
+            conn.close()
         
         return True
         
@@ -0,0 +1,80 @@
+"""Microbenchmark: indexed match_skill() vs the original linear scan.
+
+Usage: python scripts/bench_skill_match.py [iterations]
+"""
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import app  # noqa: E402
+
+MESSAGES = [
+    "I need help with lead intake and the godaddy chat workflow",
+    "Can you build a tailored session for a client struggling with cravings?",
+    "Generate the oil and gas campaign outreach email",
+    "What is the status of the dashboard testing?",
+    "xyzzy frobinator nonsense 12345",
+    "Draft session documentation notes for today's client session on relapse prevention",
+]
+
+
+def linear_match_skill(message):
+    """The pre-index scorer: re-tokenizes every skill for every message."""
+    if not app.SKILLS:
+        return None
+    msg_lower = message.lower()
+    msg_words = set(re.findall(r"\w+", msg_lower))
+    best = None
+    best_score = 0
+    for s in app.SKILLS.values():
+        score = 0
+        for kw in s.get('keywords', []):
+            if kw and kw in msg_lower:
+                score += 10
+        if s['name'].replace('-', ' ').replace('_', ' ') in msg_lower:
+            score += 15
+        skill_words = set(re.findall(r"\w+", s.get('content', '').lower()[:5000]))
+        score += len(msg_words & skill_words)
+        if score > best_score:
+            best_score = score
+            best = s
+    return best if best_score >= 3 else None
+
+
+def _bench(fn, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for message in MESSAGES:
+            fn(message)
+    elapsed = time.perf_counter() - started
+    return elapsed * 1e6 / (iterations * len(MESSAGES))
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    app.load_skills()
+    print(f"skills loaded: {len(app.SKILLS)}")
+
+    for message in MESSAGES:
+        expected = linear_match_skill(message)
+        actual = app.match_skill(message)
+        if (expected or {}).get('name') != (actual or {}).get('name'):
+            print(f"MISMATCH for {message!r}: {expected and expected['name']} != {actual and actual['name']}")
+            return 1
+
+    linear_us = _bench(linear_match_skill, iterations)
+    indexed_us = _bench(app.match_skill, iterations)
+    print(f"linear scan : {linear_us:9.1f} us/message")
+    print(f"indexed     : {indexed_us:9.1f} us/message")
+    if indexed_us:
+        print(f"speedup     : {linear_us / indexed_us:9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -52,6 +52,21 @@ async function fetchJson(page, url) {
   }, url);
 }
 
+function conversationTimestamp(conversation) {
+  const lastMessage = conversation && conversation.last_message && typeof conversation.last_message === 'object'
+    ? conversation.last_message
+    : {};
+  return lastMessage.created_at || conversation.newest_message_timestamp || conversation.updated_at || null;
+}
+
+function isNewerThan(value, since) {
+  if (!since) {
+    return true;
+  }
+  const parsed = Date.parse(value || '');
+  return Number.isNaN(parsed) || parsed > since;
+}
+
 async function fetchDebuggerVersion(browserUrl) {
   const response = await fetch(`${browserUrl.replace(/\/$/, '')}/json/version`);
   if (!response.ok) {
@@ -130,6 +145,8 @@ async function main() {
   const browserUrl = args['browser-url'] || process.env.GODADDY_BROWSER_DEBUG_URL || 'http://127.0.0.1:18800';
   const maxPages = Math.max(1, parseInt(args.pages || process.env.GODADDY_LIVE_SYNC_MAX_PAGES || '1', 10));
   const pageSize = Math.max(1, Math.min(parseInt(args['page-size'] || process.env.GODADDY_LIVE_SYNC_PAGE_SIZE || '30', 10), 100));
+  // Incremental cursor: only conversations with activity after this timestamp get their messages re-fetched
+  const since = typeof args.since === 'string' && !Number.isNaN(Date.parse(args.since)) ? Date.parse(args.since) : null;
 
   if (!brand) {
     throw new Error('Missing GoDaddy Reamaze brand URL');
@@ -175,11 +192,21 @@ async function main() {
       }
     }
 
+    let newestMessageTimestamp = null;
+    const unchangedIds = [];
     for (const conversation of conversations) {
       const conversationId = conversation && conversation.id;
       if (!conversationId) {
         continue;
       }
+      const timestamp = conversationTimestamp(conversation);
+      if (timestamp && (!newestMessageTimestamp || Date.parse(timestamp) > Date.parse(newestMessageTimestamp))) {
+        newestMessageTimestamp = timestamp;
+      }
+      if (!isNewerThan(timestamp, since)) {
+        unchangedIds.push(String(conversationId));
+        continue;
+      }
       const response = await fetchJson(page, `${baseUrl}/${conversationId}/messages?count_per_page=10&page=1`);
       if (response.ok && response.body && Array.isArray(response.body.messages)) {
         messageMap[String(conversationId)] = response.body.messages;
@@ -193,6 +220,8 @@ async function main() {
       fetched_at: new Date().toISOString(),
       brand,
       total_count: conversations.length,
+      newest_message_timestamp: newestMessageTimestamp,
+      unchanged_ids: unchangedIds,
       conversations,
       messages: messageMap,
     }));
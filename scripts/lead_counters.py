@@ -0,0 +1,29 @@
+"""Verify or rebuild the materialized lead pipeline counters.
+
+Usage: python scripts/lead_counters.py [--rebuild]
+
+Exits non-zero when the counters have drifted from the leads table and
+--rebuild was not given.
+"""
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import app  # noqa: E402
+
+
+def main():
+    if '--rebuild' in sys.argv[1:]:
+        rows = app.lead_store.rebuild_lead_counters()
+        print(f"rebuilt {rows} counter rows")
+    report = app.lead_store.verify_lead_counters()
+    print(json.dumps(report, indent=2))
+    return 0 if report['ok'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
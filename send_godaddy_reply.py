@@ -22,10 +22,12 @@ def log_action(message):
     with open(log_file, "a") as f:
         f.write(log_msg + "\n")
 
-def get_ready_to_send_leads():
-    """Get leads with drafted responses ready to send."""
+def get_ready_to_send_leads(conn=None, limit=10):
+    """Get leads with drafted responses ready to send (on `conn` when the pipeline runner shares one)."""
+    own_conn = conn is None
     try:
-        conn = sqlite3.connect(DB_PATH)
+        if own_conn:
+            conn = sqlite3.connect(DB_PATH)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
@@ -34,11 +36,12 @@ def get_ready_to_send_leads():
             FROM leads
             WHERE status = 'AWAITING_SEND'
             AND draft_response IS NOT NULL
-            LIMIT 10
-        """)
+            LIMIT ?
+        """, (limit,))
         
         leads = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        if own_conn:
+            conn.close()
         
         log_action(f"Found {len(leads)} leads ready to send")
         return leads
@@ -63,20 +66,24 @@ def send_godaddy_reply(source_id, draft_response):
         log_action(f"ERROR sending GoDaddy reply: {str(e)}")
         return False
 
-def mark_sent(lead_id):
+def mark_sent(lead_id, conn=None):
     """Mark lead as sent in database."""
+    own_conn = conn is None
     try:
-        conn = sqlite3.connect(DB_PATH)
+        if own_conn:
+            conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
         
         cursor.execute("""
             UPDATE leads
-            SET status = 'AWAITING_EMAIL', sent_at = datetime('now')
+            SET status = 'AWAITING_EMAIL', sent_at = datetime('now'),
+                updated_at = strftime('%Y-%m-%dT%H:%M:%SZ', 'now')
             WHERE id = ?
         """, (lead_id,))
         
         conn.commit()
-        conn.close()
+        if own_conn:
+            conn.close()
         return True
         
     except Exception as e:
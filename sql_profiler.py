@@ -0,0 +1,362 @@
+"""SQLite query profiler for Trifecta AI Agent
+
+Connections opened through `connect()` (or with `factory=ProfiledConnection`)
+time every statement, including the rows fetched afterwards. Statements are
+grouped by fingerprint (literals and IN-lists collapsed) with count, total and
+max time, rows returned and the routes that issued them. Executions slower
+than the threshold land in a bounded slow-query log; a slow fingerprint also
+gets its EXPLAIN QUERY PLAN captured (at most once per plan_ttl seconds) by a
+background thread on its own read-only connection, so the caller's connection
+and open transaction are never used for it. The `observer` callback (the
+/metrics histogram) sees every execute, even with detailed profiling disabled.
+"""
+import os
+import re
+import time
+import queue
+import sqlite3
+import threading
+from urllib.request import pathname2url
+from collections import Counter, OrderedDict, deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+_EXPLAINABLE = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH', 'REPLACE')
+
+
+def fingerprint(sql: str) -> str:
+    """Normalize a statement so executions that differ only in literals group together."""
+    text = _STRING_LITERAL.sub('?', sql)
+    text = _NUMBER_LITERAL.sub('?', text)
+    text = _IN_LIST.sub('(?+)', text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+class QueryStats:
+    __slots__ = ('fingerprint', 'db', 'count', 'total', 'max', 'rows', 'routes', 'plan', 'plan_at')
+
+    def __init__(self, fp: str, db: str):
+        self.fingerprint = fp
+        self.db = db
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.routes: Counter = Counter()
+        self.plan: Optional[List[str]] = None
+        self.plan_at = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'fingerprint': self.fingerprint,
+            'db': self.db,
+            'count': self.count,
+            'total_ms': round(self.total * 1000, 3),
+            'avg_ms': round(self.total * 1000 / self.count, 3) if self.count else 0.0,
+            'max_ms': round(self.max * 1000, 3),
+            'rows': self.rows,
+            'routes': dict(self.routes.most_common(5)),
+            'plan': self.plan,
+        }
+
+
+class QueryProfiler:
+    """Aggregates statement timings per fingerprint and keeps a rolling slow-query log"""
+
+    def __init__(self, slow_threshold: float = 0.05, max_fingerprints: int = 500, slow_log_size: int = 100,
+                 plan_ttl: float = 600.0, route_fn: Optional[Callable[[], str]] = None,
+                 observer: Optional[Callable[[str, float], None]] = None, enabled: bool = True):
+        self.slow_threshold = slow_threshold
+        self.max_fingerprints = max(1, max_fingerprints)
+        self.plan_ttl = plan_ttl
+        self.route_fn = route_fn
+        self.observer = observer
+        self.enabled = enabled
+        self._stats: 'OrderedDict[Tuple[str, str], QueryStats]' = OrderedDict()
+        self._slow: deque = deque(maxlen=max(1, slow_log_size))
+        self._fingerprints: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._plan_jobs: queue.Queue = queue.Queue(maxsize=100)
+        self._plan_thread: Optional[threading.Thread] = None
+        self.started_at = time.time()
+        self.statements = 0
+        self.evicted = 0
+
+    def _route(self) -> str:
+        if self.route_fn is not None:
+            try:
+                route = self.route_fn()
+                if route:
+                    return route
+            except Exception:
+                pass
+        return threading.current_thread().name
+
+    def _fingerprint(self, sql: str) -> str:
+        fp = self._fingerprints.get(sql)
+        if fp is None:
+            fp = fingerprint(sql)
+            if len(self._fingerprints) > self.max_fingerprints * 4:
+                self._fingerprints.clear()
+            self._fingerprints[sql] = fp
+        return fp
+
+    def observe(self, db: str, elapsed: float):
+        """Feed one execute time to the observer; called whether or not profiling is enabled."""
+        if self.observer is not None:
+            self.observer(db, elapsed)
+
+    def begin(self, db: str, sql: str, params: Any, elapsed: float, rows: int = 0,
+              db_path: Optional[str] = None) -> Dict[str, Any]:
+        """Record one execution; returns a handle that fetches add rows/time to."""
+        handle = {
+            'db': db,
+            'db_path': db_path,
+            'sql': sql,
+            'params': params,
+            'fingerprint': self._fingerprint(sql),
+            'route': self._route(),
+            'elapsed': 0.0,
+            'rows': 0,
+            'slow_entry': None,
+        }
+        with self._lock:
+            self.statements += 1
+            stats = self._stats_for(db, handle['fingerprint'])
+            stats.count += 1
+            stats.routes[handle['route']] += 1
+        self.observe(db, elapsed)
+        self.add(handle, elapsed, rows)
+        return handle
+
+    def _stats_for(self, db: str, fp: str) -> QueryStats:
+        key = (db, fp)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = QueryStats(fp, db)
+            while len(self._stats) > self.max_fingerprints:
+                # Evict the cheapest fingerprint so the expensive ones stay visible
+                cheapest = min(self._stats, key=lambda k: self._stats[k].total)
+                if cheapest == key:
+                    break
+                del self._stats[cheapest]
+                self.evicted += 1
+        return stats
+
+    def add(self, handle: Dict[str, Any], elapsed: float, rows: int = 0):
+        """Attribute fetch time and rows to an execution already begun."""
+        handle['elapsed'] += elapsed
+        handle['rows'] += rows
+        capture_plan = False
+        with self._lock:
+            stats = self._stats_for(handle['db'], handle['fingerprint'])
+            stats.total += elapsed
+            stats.rows += rows
+            stats.max = max(stats.max, handle['elapsed'])
+            entry = handle['slow_entry']
+            if entry is None and handle['elapsed'] >= self.slow_threshold:
+                entry = handle['slow_entry'] = {
+                    'at': time.time(),
+                    'db': handle['db'],
+                    'route': handle['route'],
+                    'fingerprint': handle['fingerprint'],
+                    'sql': handle['sql'][:2000],
+                }
+                self._slow.append(entry)
+                capture_plan = time.time() - stats.plan_at > self.plan_ttl
+                if capture_plan:
+                    stats.plan_at = time.time()
+            if entry is not None:
+                entry['duration_ms'] = round(handle['elapsed'] * 1000, 3)
+                entry['rows'] = handle['rows']
+        if capture_plan and handle['db_path'] and handle['sql'].lstrip().upper().startswith(_EXPLAINABLE):
+            self._queue_plan((stats, entry, handle['db_path'], handle['sql'], handle['params']))
+
+    def _queue_plan(self, job):
+        try:
+            self._plan_jobs.put_nowait(job)
+        except queue.Full:
+            return  # a later slow execution retries after plan_ttl
+        if self._plan_thread is None:
+            with self._lock:
+                if self._plan_thread is None:
+                    self._plan_thread = threading.Thread(target=self._plan_worker, name='sql-explain', daemon=True)
+                    self._plan_thread.start()
+
+    def _plan_worker(self):
+        while True:
+            stats, entry, db_path, sql, params = self._plan_jobs.get()
+            try:
+                plan = self.explain(db_path, sql, params)
+                with self._lock:
+                    stats.plan = plan
+                    if entry is not None:
+                        entry['plan'] = plan
+            finally:
+                self._plan_jobs.task_done()
+
+    def wait_for_plans(self):
+        """Block until every queued EXPLAIN QUERY PLAN has been captured."""
+        self._plan_jobs.join()
+
+    @staticmethod
+    def explain(db_path: str, sql: str, params: Any) -> Optional[List[str]]:
+        """EXPLAIN QUERY PLAN for `sql` on a separate read-only (and unprofiled) connection to `db_path`."""
+        try:
+            conn = sqlite3.connect(f"file:{pathname2url(os.path.abspath(db_path))}?mode=ro", uri=True, timeout=1)
+            try:
+                rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params if params is not None else ()).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            return [f"explain failed: {e}"]
+        return [str(row[-1]) for row in rows]
+
+    def top(self, limit: int = 20, sort: str = 'total') -> List[Dict[str, Any]]:
+        attr = {'total': 'total', 'max': 'max', 'count': 'count', 'rows': 'rows'}.get(sort, 'total')
+        with self._lock:
+            ranked = sorted(self._stats.values(), key=lambda s: getattr(s, attr), reverse=True)[:limit]
+            return [s.as_dict() for s in ranked]
+
+    def slow_queries(self, limit: int = 50) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(entry) for entry in list(self._slow)[-limit:]][::-1]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._slow.clear()
+            self.statements = 0
+            self.evicted = 0
+            self.started_at = time.time()
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'since': self.started_at,
+                'statements': self.statements,
+                'fingerprints': len(self._stats),
+                'max_fingerprints': self.max_fingerprints,
+                'evicted': self.evicted,
+                'slow_threshold_ms': round(self.slow_threshold * 1000, 3),
+                'slow_logged': len(self._slow),
+            }
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """Cursor that reports execute time, then fetch*() time and row counts, to the profiler"""
+
+    _handle = None
+
+    def _profiler(self) -> Optional[QueryProfiler]:
+        profiler = getattr(self.connection, 'profiler', None)
+        return profiler if profiler is not None and profiler.enabled else None
+
+    def _record(self, sql, parameters, elapsed):
+        profiler = getattr(self.connection, 'profiler', None)
+        if profiler is None:
+            return
+        if not profiler.enabled:
+            profiler.observe(self.connection.profile_label, elapsed)
+            return
+        rows = self.rowcount if self.rowcount and self.rowcount > 0 else 0
+        self._handle = profiler.begin(self.connection.profile_label, sql, parameters, elapsed, rows,
+                                      self.connection.profile_path)
+
+    def execute(self, sql, parameters=()):
+        if getattr(self.connection, 'profiler', None) is None:
+            return super().execute(sql, parameters)
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._record(sql, parameters, time.perf_counter() - started)
+
+    def executemany(self, sql, seq_of_parameters):
+        if getattr(self.connection, 'profiler', None) is None:
+            return super().executemany(sql, seq_of_parameters)
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            # No single parameter set to explain the plan with
+            self._record(sql, None, time.perf_counter() - started)
+
+    def _fetched(self, started: float, rows: int):
+        handle = self._handle
+        profiler = self._profiler()
+        if handle is not None and profiler is not None:
+            profiler.add(handle, time.perf_counter() - started, rows)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(started, 0 if row is None else 1)
+        return row
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(started, len(rows))
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(started, len(rows))
+        return rows
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """sqlite3 connection whose statements all go through ProfiledCursor"""
+
+    profiler: Optional[QueryProfiler] = None
+    profile_label = 'sqlite'
+    profile_path: Optional[str] = None  # file the plan capture opens read-only
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+_profiler: Optional[QueryProfiler] = None
+_profiler_lock = threading.Lock()
+
+
+def get_profiler() -> QueryProfiler:
+    """Get or create the process-wide profiler (SQL_PROFILER_* env settings)"""
+    global _profiler
+    if _profiler is None:
+        with _profiler_lock:
+            if _profiler is None:
+                _profiler = QueryProfiler(
+                    slow_threshold=float(os.environ.get('SQL_PROFILER_SLOW_MS', '50')) / 1000.0,
+                    max_fingerprints=int(os.environ.get('SQL_PROFILER_MAX_FINGERPRINTS', '500')),
+                    slow_log_size=int(os.environ.get('SQL_PROFILER_SLOW_LOG_SIZE', '100')),
+                    enabled=os.environ.get('SQL_PROFILER_ENABLED', '1') == '1',
+                )
+    return _profiler
+
+
+def attach(conn: sqlite3.Connection, label: str, profiler: Optional[QueryProfiler] = None,
+           db_path: Optional[str] = None) -> sqlite3.Connection:
+    conn.profiler = profiler or get_profiler()
+    conn.profile_label = label
+    if db_path and db_path != ':memory:' and not db_path.startswith('file:'):
+        conn.profile_path = db_path
+    return conn
+
+
+def connect(db_path: str, label: Optional[str] = None, factory=ProfiledConnection, **kwargs) -> sqlite3.Connection:
+    """sqlite3.connect() with profiling; `label` defaults to the database file name."""
+    conn = sqlite3.connect(db_path, factory=factory, **kwargs)
+    return attach(conn, label or os.path.splitext(os.path.basename(db_path))[0], db_path=db_path)
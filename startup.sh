@@ -25,12 +25,19 @@ fi
 # Confirm core packages are available before starting
 python3 -c "import flask, gunicorn; print('[startup] Core packages verified')" 2>&1
 
+# Fast boot: the worker finishes importing app.py without loading skills or starting the
+# scheduler; those run in a background thread right after (see boot_profile.py and
+# GET /api/admin/startup-profile for per-phase timings)
+export FAST_BOOT=${FAST_BOOT:-1}
+
 # Start gunicorn — NO --preload to prevent blocking port bind on cold start
-# APScheduler starts per-worker; only 1 worker to prevent duplicate schedulers
+# APScheduler starts per-worker; a SQLite leader lease (SCHEDULER_LEADER_ELECTION) makes
+# only one worker run the jobs, so GUNICORN_WORKERS can be raised. Keep 1 if dashboards rely
+# on /api/stream, whose event hub is per-process.
 # --timeout=600: Azure probe allows 230s; worker needs time to init + handle first request
 # --graceful-timeout=30: allow in-flight requests to finish on restart
 exec gunicorn --bind=0.0.0.0:8000 \
-         --workers=1 \
+         --workers=${GUNICORN_WORKERS:-1} \
          --threads=8 \
          --timeout=600 \
          --graceful-timeout=30 \
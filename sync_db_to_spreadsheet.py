@@ -2,14 +2,53 @@
 """
 Real-time sync from SQLite DB to master Excel spreadsheet.
 Writes new leads and status updates back to the Excel file.
+
+Syncs are incremental: a state file next to the spreadsheet keeps a high-water
+mark on leads.updated_at and a lead_id -> row map, so each run only rewrites
+the rows of leads that changed since the last one (and skips loading the
+workbook at all when nothing did). New leads fill rows freed by archived ones,
+then go below the last row. A full rewrite (newest first) happens on the first
+run, with --full, or when the spreadsheet was edited or the DB lost rows since
+the last sync; a spreadsheet that does not exist yet is streamed out with
+openpyxl's write-only mode.
 """
 import os
+import sys
+import json
+import time
 import sqlite3
 import openpyxl
 from datetime import datetime
 
 DB_PATH = 'lead_pipeline.db'
 SPREADSHEET_PATH = 'C:/Users/TrifectaAgent/.openclaw/media/inbound/1921d37d-3f7b-4702-8f7f-8919ac87b967.xlsx'
+STATE_PATH = os.environ.get('SPREADSHEET_SYNC_STATE', SPREADSHEET_PATH + '.sync.json')
+SHEET_NAME = 'Sheet1'
+EXCLUDED_STATUSES = ('DELETED', 'ARCHIVED')
+LEAD_COLUMNS = """id, name, email, phone, source, status,
+                   initial_question, program_interest, notes,
+                   created_at, updated_at"""
+
+# Column mapping (0-indexed)
+COL = {
+    'date': 1,
+    'name': 2,
+    'email': 3,
+    'phone': 4,
+    'source': 5,
+    'question': 6,
+    'date_resp': 7,
+    'status': 8,
+    'followup': 9,
+    'program': 10,
+    'notes': 11,
+}
+ROW_WIDTH = 12
+HEADERS = {
+    'date': 'Date', 'name': 'Name', 'email': 'Email', 'phone': 'Phone', 'source': 'Source',
+    'question': 'Question', 'date_resp': 'Date Responded', 'status': 'Status',
+    'followup': 'Follow-up', 'program': 'Program', 'notes': 'Notes',
+}
 
 def log_action(message):
     """Log to console and file."""
@@ -17,31 +56,59 @@ def log_action(message):
     log_msg = f"[{timestamp}] {message}"
     print(log_msg)
 
+def _connect():
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    try:
+        # The high-water mark query is a range scan on updated_at
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_leads_updated_at ON leads(updated_at)")
+    except sqlite3.Error:
+        pass
+    return conn
+
 def get_all_leads():
     """Get all leads from SQLite DB."""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
+        conn = _connect()
         cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT id, name, email, phone, source, status, 
-                   initial_question, program_interest, notes,
-                   created_at, updated_at
+
+        cursor.execute(f"""
+            SELECT {LEAD_COLUMNS}
             FROM leads
             WHERE status NOT IN ('DELETED', 'ARCHIVED')
             ORDER BY created_at DESC
         """)
-        
+
         leads = [dict(row) for row in cursor.fetchall()]
         conn.close()
         log_action(f"Retrieved {len(leads)} leads from DB")
         return leads
-        
+
     except Exception as e:
         log_action(f"ERROR fetching leads: {str(e)}")
         return []
 
+def get_changed_leads(since):
+    """Leads (any status) updated at or after the high-water mark, plus the active lead count.
+
+    `>=` rather than `>` so leads sharing the mark's timestamp are not missed;
+    ones already synced at that version are skipped by the caller.
+    """
+    conn = _connect()
+    try:
+        rows = conn.execute(f"""
+            SELECT {LEAD_COLUMNS}
+            FROM leads
+            WHERE updated_at >= ?
+            ORDER BY updated_at, created_at
+        """, (since,)).fetchall()
+        active = conn.execute(
+            "SELECT COUNT(*) FROM leads WHERE status NOT IN ('DELETED', 'ARCHIVED')"
+        ).fetchone()[0]
+    finally:
+        conn.close()
+    return [dict(row) for row in rows], active
+
 def reverse_status_map(db_status):
     """Convert DB status back to spreadsheet status."""
     status_map = {
@@ -59,68 +126,189 @@ def reverse_status_map(db_status):
     }
     return status_map.get(db_status, db_status)
 
-def sync_to_spreadsheet():
-    """Write all leads to spreadsheet."""
+def lead_row_values(lead):
+    """Cell values for columns A..L of one lead's row (unmapped columns are blank)."""
+    created_date = lead.get('created_at', '')
+    if created_date:
+        created_date = created_date[:10]  # YYYY-MM-DD
+
+    values = [None] * ROW_WIDTH
+    values[COL['date']] = created_date
+    values[COL['name']] = lead.get('name', '')
+    values[COL['email']] = lead.get('email', '')
+    values[COL['phone']] = lead.get('phone', '')
+    values[COL['source']] = lead.get('source', 'GODADDY')
+    values[COL['question']] = lead.get('initial_question', '')
+    values[COL['status']] = reverse_status_map(lead.get('status', ''))
+    values[COL['program']] = lead.get('program_interest', '')
+    values[COL['notes']] = lead.get('notes', '')
+    return values
+
+def _spreadsheet_signature():
+    """(mtime_ns, size) of the spreadsheet, or None when it does not exist."""
     try:
-        leads = get_all_leads()
-        if not leads:
-            log_action("No leads to sync")
-            return
-        
+        st = os.stat(SPREADSHEET_PATH)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+def load_sync_state():
+    try:
+        with open(STATE_PATH, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if state.get('spreadsheet') != SPREADSHEET_PATH or not isinstance(state.get('rows'), dict):
+        return None
+    return state
+
+def save_sync_state(state):
+    state['spreadsheet'] = SPREADSHEET_PATH
+    state['signature'] = _spreadsheet_signature()
+    tmp_path = STATE_PATH + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, STATE_PATH)
+
+def _high_water_mark(leads, previous=''):
+    return max([previous or ''] + [lead.get('updated_at') or '' for lead in leads])
+
+def full_sync():
+    """Rewrite every lead row (newest first) and rebuild the row map."""
+    leads = get_all_leads()
+    if not leads:
+        log_action("No leads to sync")
+        return {'mode': 'full', 'written': 0, 'added': 0, 'removed': 0}
+    rows = {}
+    free_rows = []
+
+    if _spreadsheet_signature() is None:
+        # New file: stream rows out in write-only mode instead of building cells in memory
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet(SHEET_NAME)
+        header = [None] * ROW_WIDTH
+        for key, idx in COL.items():
+            header[idx] = HEADERS[key]
+        ws.append(header)
+        for idx, lead in enumerate(leads, start=2):
+            ws.append(lead_row_values(lead))
+            rows[lead['id']] = [idx, lead.get('updated_at') or '']
+        wb.save(SPREADSHEET_PATH)
+    else:
         # Load spreadsheet
         wb = openpyxl.load_workbook(SPREADSHEET_PATH)
-        ws = wb['Sheet1']
-        
-        # Column mapping (0-indexed)
-        COL = {
-            'date': 1,
-            'name': 2,
-            'email': 3,
-            'phone': 4,
-            'source': 5,
-            'question': 6,
-            'date_resp': 7,
-            'status': 8,
-            'followup': 9,
-            'program': 10,
-            'notes': 11,
-        }
-        
-        # Clear existing data (keep headers)
-        for row_idx in range(2, ws.max_row + 1):
-            for col_idx in range(1, 13):
-                ws.cell(row=row_idx, column=col_idx).value = None
-        
-        # Write all leads
+        ws = wb[SHEET_NAME]
+        last_row = max(ws.max_row, len(leads) + 1)
+
         for idx, lead in enumerate(leads, start=2):
             try:
-                # Parse date
-                created_date = lead.get('created_at', '')
-                if created_date:
-                    created_date = created_date[:10]  # YYYY-MM-DD
-                
-                # Map values
-                ws.cell(row=idx, column=COL['date'] + 1).value = created_date
-                ws.cell(row=idx, column=COL['name'] + 1).value = lead.get('name', '')
-                ws.cell(row=idx, column=COL['email'] + 1).value = lead.get('email', '')
-                ws.cell(row=idx, column=COL['phone'] + 1).value = lead.get('phone', '')
-                ws.cell(row=idx, column=COL['source'] + 1).value = lead.get('source', 'GODADDY')
-                ws.cell(row=idx, column=COL['question'] + 1).value = lead.get('initial_question', '')
-                ws.cell(row=idx, column=COL['status'] + 1).value = reverse_status_map(lead.get('status', ''))
-                ws.cell(row=idx, column=COL['program'] + 1).value = lead.get('program_interest', '')
-                ws.cell(row=idx, column=COL['notes'] + 1).value = lead.get('notes', '')
-                
+                for col_idx, value in enumerate(lead_row_values(lead), start=1):
+                    ws.cell(row=idx, column=col_idx).value = value
+                rows[lead['id']] = [idx, lead.get('updated_at') or '']
             except Exception as e:
                 log_action(f"ERROR writing row {idx}: {str(e)}")
-        
+                # Blank the half-written row and leave the lead unmapped, so a later run rewrites it
+                for col_idx in range(1, ROW_WIDTH + 1):
+                    ws.cell(row=idx, column=col_idx).value = None
+                free_rows.append(idx)
+
+        # Clear leftover rows from a longer previous sync (keep headers)
+        for row_idx in range(len(leads) + 2, last_row + 1):
+            for col_idx in range(1, ROW_WIDTH + 1):
+                ws.cell(row=row_idx, column=col_idx).value = None
+
         # Save spreadsheet
         wb.save(SPREADSHEET_PATH)
-        log_action(f"Synced {len(leads)} leads to spreadsheet")
-        
+
+    save_sync_state({
+        'high_water_mark': _high_water_mark(leads),
+        'rows': rows,
+        'free_rows': free_rows,
+        'next_row': len(leads) + 2,
+    })
+    return {'mode': 'full', 'written': len(rows), 'added': len(rows), 'removed': 0}
+
+def incremental_sync(state):
+    """Rewrite only rows of leads changed since the high-water mark.
+
+    Returns None when the state no longer matches the DB and a full sync is needed.
+    """
+    changed, active = get_changed_leads(state.get('high_water_mark', ''))
+    rows = state['rows']
+    free_rows = sorted(state.get('free_rows', []))
+    next_row = state.get('next_row', len(rows) + 2)
+
+    writes = {}  # row -> values (None clears the row)
+    added = removed = 0
+    for lead in changed:
+        version = lead.get('updated_at') or ''
+        entry = rows.get(lead['id'])
+        if entry and entry[1] == version:
+            continue  # already synced at this version (same timestamp as the mark)
+        if lead.get('status') in EXCLUDED_STATUSES:
+            if entry:
+                writes[entry[0]] = None
+                free_rows.append(entry[0])
+                del rows[lead['id']]
+                removed += 1
+            continue
+        if entry:
+            row_idx = entry[0]
+        elif free_rows:
+            row_idx = free_rows.pop(0)
+            added += 1
+        else:
+            row_idx = next_row
+            next_row += 1
+            added += 1
+        rows[lead['id']] = [row_idx, version]
+        writes[row_idx] = lead_row_values(lead)
+
+    if len(rows) != active:
+        # Leads deleted outright (or rows lost some other way): the map can't be trusted
+        return None
+
+    if writes:
+        wb = openpyxl.load_workbook(SPREADSHEET_PATH)
+        ws = wb[SHEET_NAME]
+        for row_idx, values in sorted(writes.items()):
+            for col_idx in range(1, ROW_WIDTH + 1):
+                ws.cell(row=row_idx, column=col_idx).value = values[col_idx - 1] if values else None
+        wb.save(SPREADSHEET_PATH)
+
+    save_sync_state({
+        'high_water_mark': _high_water_mark(changed, state.get('high_water_mark')),
+        'rows': rows,
+        'free_rows': sorted(free_rows),
+        'next_row': next_row,
+    })
+    return {'mode': 'incremental', 'written': len(writes), 'added': added, 'removed': removed}
+
+def sync_to_spreadsheet(full=False):
+    """Bring the spreadsheet up to date with the DB, rewriting only what changed."""
+    started = time.perf_counter()
+    try:
+        state = None if full else load_sync_state()
+        if state is not None and state.get('signature') != _spreadsheet_signature():
+            log_action("Spreadsheet changed outside the sync (or is missing) - doing a full sync")
+            state = None
+
+        result = incremental_sync(state) if state is not None else None
+        if result is None:
+            result = full_sync()
+
+        result['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        log_action(
+            f"Synced {result['written']} row(s) to spreadsheet ({result['mode']}: "
+            f"{result['added']} added, {result['removed']} removed) in {result['elapsed_ms']}ms"
+        )
+        return result
+
     except Exception as e:
         log_action(f"ERROR syncing to spreadsheet: {str(e)}")
+        return None
 
 if __name__ == "__main__":
     log_action("Starting DB to spreadsheet sync...")
-    sync_to_spreadsheet()
+    sync_to_spreadsheet(full='--full' in sys.argv[1:])
     log_action("Sync complete.")
@@ -11,7 +11,7 @@ os.environ.setdefault('SECRET_KEY', 'test-secret')
 os.environ.setdefault('SKILL_DIR', 'Assets/skills')
 os.environ.setdefault('INTERNAL_API_KEY', '')
 
-from app import app, load_skills, match_skill, SKILLS
+from app import app, load_skills, match_skill, retrieve_skill_sections, SKILLS
 
 
 @pytest.fixture
@@ -88,6 +88,37 @@ class TestSkillMatching:
         result = match_skill('xyzzy frobinator nonsense 12345')
         assert result is None
 
+    def test_match_skill_index_scores_keywords_and_names(self, tmp_path):
+        (tmp_path / 'detox-planning.md').write_text(
+            '# Detox Planning\nKeywords: detox, detox plan, withdrawal\n', encoding='utf-8')
+        (tmp_path / 'billing.md').write_text(
+            '# Billing\nKeywords: invoice\n', encoding='utf-8')
+        try:
+            load_skills(str(tmp_path))
+            assert match_skill('I want a detox plan')['name'] == 'detox-planning'
+            assert match_skill('please resend the invoice')['name'] == 'billing'
+            assert match_skill('xyzzy frobinator nonsense 12345') is None
+        finally:
+            load_skills()
+
+    def test_retrieve_skill_sections_ranks_and_respects_budget(self, tmp_path):
+        (tmp_path / 'program.md').write_text(
+            '# Program\nIntro text.\n\n'
+            '## Pricing\nThe boot camp costs 2499 CAD and pricing includes all sessions.\n\n'
+            '## Scheduling\nSessions are booked weekly through the calendar.\n\n'
+            '```\n# not a heading\n```\n',
+            encoding='utf-8')
+        try:
+            load_skills(str(tmp_path))
+            sections = retrieve_skill_sections('what is the pricing', top_k=1, token_budget=500)
+            assert [s['heading'] for s in sections] == ['Pricing']
+            assert all(s['tokens'] <= 500 for s in sections)
+
+            tiny = retrieve_skill_sections('pricing sessions calendar', top_k=5, token_budget=10)
+            assert len(tiny) == 1 and tiny[0]['truncated']
+        finally:
+            load_skills()
+
 
 class TestDashboardEndpoints:
     def test_dashboard_overview_exists(self, client):
@@ -112,6 +143,463 @@ class TestRateLimiting:
             # 400 is fine (no Anthropic key in test), 429 is not
             assert r.status_code != 429
 
+    def test_token_bucket_limits_burst_and_refills(self):
+        from rate_limiter import RateLimiter, MemoryBucketBackend
+        limiter = RateLimiter(MemoryBucketBackend())
+        limiter.configure('burst', per_minute=60, burst=3)
+        results = [limiter.check('burst', '1.2.3.4')[0] for _ in range(4)]
+        assert results == [True, True, True, False]
+        allowed, _, retry_after = limiter.check('burst', '1.2.3.4')
+        assert allowed is False and 0 < retry_after <= 1.0
+        assert limiter.check('burst', '5.6.7.8')[0] is True
+
+    def test_memory_backend_caps_tracked_keys(self):
+        from rate_limiter import RateLimiter, MemoryBucketBackend
+        limiter = RateLimiter(MemoryBucketBackend(max_keys=100))
+        for i in range(1000):
+            limiter.check('default', f'10.0.{i // 256}.{i % 256}')
+        stats = limiter.stats()
+        assert stats['tracked_keys'] == 100
+        assert stats['evicted'] == 900
+
+    def test_sqlite_backend_shares_buckets_between_limiters(self, tmp_path):
+        from rate_limiter import RateLimiter, SQLiteBucketBackend
+        db_path = str(tmp_path / 'rate.db')
+        worker_a = RateLimiter(SQLiteBucketBackend(db_path))
+        worker_b = RateLimiter(SQLiteBucketBackend(db_path))
+        for limiter in (worker_a, worker_b):
+            limiter.configure('chat', per_minute=60, burst=2)
+        assert worker_a.check('chat', 'ip')[0] is True
+        assert worker_b.check('chat', 'ip')[0] is True
+        assert worker_a.check('chat', 'ip')[0] is False
+
+    def test_busy_sqlite_backend_fails_open(self, client, tmp_path, monkeypatch):
+        import sqlite3
+        import app as app_module
+        from rate_limiter import RateLimiter, SQLiteBucketBackend
+        db_path = str(tmp_path / 'rate.db')
+        limiter = RateLimiter(SQLiteBucketBackend(db_path, timeout=0.05))
+        limiter.configure('recovery_buddy', per_minute=1, burst=1)
+        monkeypatch.setattr(app_module, 'rate_limiter', limiter)
+        holder = sqlite3.connect(db_path, isolation_level=None)
+        holder.execute('BEGIN IMMEDIATE')  # another worker holds the write lock
+        try:
+            for _ in range(2):
+                r = client.post('/api/recovery-buddy/chat', data='not json', content_type='text/plain')
+                assert r.status_code == 400
+        finally:
+            holder.execute('ROLLBACK')
+            holder.close()
+        stats = limiter.stats()
+        assert (stats['failed_open'], stats['allowed']) == (2, 0)
+        assert limiter.check('recovery_buddy', 'ip')[0] is True
+
+    def test_recovery_buddy_route_returns_429_with_retry_after(self, client, monkeypatch):
+        import app as app_module
+        from rate_limiter import RateLimiter, MemoryBucketBackend
+        limiter = RateLimiter(MemoryBucketBackend())
+        limiter.configure('recovery_buddy', per_minute=1, burst=1)
+        monkeypatch.setattr(app_module, 'rate_limiter', limiter)
+        first = client.post('/api/recovery-buddy/chat', data='not json', content_type='text/plain')
+        assert first.status_code == 400
+        limited = client.post('/api/recovery-buddy/chat', data='not json', content_type='text/plain')
+        assert limited.status_code == 429
+        assert int(limited.headers['Retry-After']) >= 1
+
+
+class TestLLMResponseCache:
+    def test_cache_hits_expire_and_evict_lru(self, tmp_path):
+        from llm_cache import LLMResponseCache
+        cache = LLMResponseCache(str(tmp_path / 'llm.db'), ttl=60, max_entries=2)
+        assert cache.get('openai', 'm', 'sys', 'hello', 100) is None
+        cache.put('openai', 'm', 'sys', 'hello', 100, 'hi there')
+        assert cache.get('openai', 'm', 'sys', 'hello', 100) == 'hi there'
+        # Any part of the key changing is a different entry
+        assert cache.get('anthropic', 'm', 'sys', 'hello', 100) is None
+        assert cache.get('openai', 'm', 'other system', 'hello', 100) is None
+
+        cache.put('openai', 'm', 'sys', 'second', 100, 'two')
+        cache.get('openai', 'm', 'sys', 'hello', 100)  # refresh 'hello' so 'second' is LRU
+        cache.put('openai', 'm', 'sys', 'third', 100, 'three')
+        assert cache.get('openai', 'm', 'sys', 'second', 100) is None
+        assert cache.get('openai', 'm', 'sys', 'hello', 100) == 'hi there'
+        stats = cache.stats()
+        assert stats['entries'] == 2
+        assert stats['evictions'] == 1
+
+        cache.ttl = 0
+        import time
+        time.sleep(0.01)
+        assert cache.get('openai', 'm', 'sys', 'hello', 100) is None
+
+    def test_call_anthropic_uses_cache_only_when_opted_in(self, tmp_path, monkeypatch):
+        import app as app_module
+        from llm_cache import LLMResponseCache
+        from llm_router import ProviderRouter
+        monkeypatch.setattr(app_module, 'llm_cache', LLMResponseCache(str(tmp_path / 'llm.db')))
+        monkeypatch.setattr(app_module, 'llm_router', ProviderRouter())
+        monkeypatch.setattr(app_module.Config, 'LLM_PROVIDER_ORDER', 'anthropic')
+        monkeypatch.setattr(app_module.Config, 'ANTHROPIC_API_KEY', 'test-key')
+        calls = []
+        monkeypatch.setattr(app_module, '_call_anthropic_only',
+                            lambda ctx, msg, max_tokens=2000: calls.append(msg) or f'answer {len(calls)}')
+
+        assert app_module.call_anthropic('system', 'same question', cache=True) == 'answer 1'
+        assert app_module.call_anthropic('system', 'same question', cache=True) == 'answer 1'
+        assert app_module.call_anthropic('system', 'same question') == 'answer 2'
+        assert len(calls) == 2
+        assert app_module.llm_cache.stats()['hits'] == 1
+
+    def test_drafts_and_default_chat_requests_leave_the_cache_empty(self, client, tmp_path, monkeypatch):
+        import app as app_module
+        import reply_generator
+        from llm_cache import LLMResponseCache
+        from llm_router import ProviderRouter
+        monkeypatch.setattr(app_module, 'llm_cache', LLMResponseCache(str(tmp_path / 'llm.db')))
+        monkeypatch.setattr(app_module, 'llm_router', ProviderRouter())
+        monkeypatch.setattr(app_module.Config, 'LLM_PROVIDER_ORDER', 'anthropic')
+        monkeypatch.setattr(app_module.Config, 'ANTHROPIC_API_KEY', 'test-key')
+        monkeypatch.setattr(app_module, '_call_anthropic_only', lambda ctx, msg, max_tokens=2000: 'We can help.')
+        monkeypatch.setattr(reply_generator, 'LOG_DIR', str(tmp_path))
+
+        class _FlaskHTTP:
+            def post(self, url, json=None, timeout=None):
+                r = client.post(url.replace(reply_generator.FLASK_API_URL, ''), json=json)
+                assert r.status_code == 200
+                return type('Response', (), {'raise_for_status': lambda self: None, 'json': lambda self: r.get_json()})()
+
+        assert reply_generator.draft_response("I need help for my son's drinking", http=_FlaskHTTP())
+        assert client.post('/api/chat', json={'message': 'what are your hours?'}).status_code == 200
+        assert app_module.llm_cache.stats()['entries'] == 0
+
+        assert client.post('/api/chat', json={'message': 'what are your hours?', 'cache': True}).status_code == 200
+        assert app_module.llm_cache.stats()['entries'] == 1
+
+
+class TestProviderRouter:
+    def test_circuit_opens_after_failures_and_half_opens_after_cooldown(self):
+        from llm_router import AllProvidersFailed, ProviderRouter, RouterPolicy
+        router = ProviderRouter(RouterPolicy(failure_threshold=2, cooldown=0.05))
+        calls = []
+
+        def flaky():
+            calls.append('flaky')
+            raise RuntimeError('boom')
+
+        candidates = [('flaky', flaky), ('backup', lambda: calls.append('backup') or 'ok')]
+        assert router.call(candidates) == ('backup', 'ok')
+        assert router.call(candidates) == ('backup', 'ok')
+        assert router.stats()['providers']['flaky']['state'] == 'open'
+        # Open circuit: straight to the backup without touching the failing provider
+        assert router.call(candidates) == ('backup', 'ok')
+        assert calls.count('flaky') == 2
+
+        import time
+        time.sleep(0.06)
+        assert router.call([('flaky', lambda: 'recovered')]) == ('flaky', 'recovered')
+        assert router.stats()['providers']['flaky']['state'] == 'closed'
+
+        router.record('flaky', False)
+        router.record('flaky', False)
+        with pytest.raises(AllProvidersFailed) as excinfo:
+            router.call([('flaky', flaky)])
+        assert [name for name, _ in excinfo.value.errors] == ['flaky']
+
+    def test_hedged_request_takes_the_faster_provider(self):
+        import threading
+        from llm_router import ProviderRouter, RouterPolicy
+        router = ProviderRouter(RouterPolicy(hedge=True, hedge_default_delay=0.05))
+        release = threading.Event()
+
+        def hung():
+            release.wait(5)
+            return 'slow'
+
+        try:
+            assert router.call([('slow', hung), ('fast', lambda: 'quick')]) == ('fast', 'quick')
+            stats = router.stats()['providers']
+            assert stats['fast']['hedged_wins'] == 1
+        finally:
+            release.set()
+            router.close()
+
+    def test_per_provider_concurrency_limit(self):
+        import threading
+        import time
+        from llm_router import ProviderRouter, RouterPolicy
+        router = ProviderRouter(RouterPolicy(concurrency={'solo': 1}))
+        lock = threading.Lock()
+        active = []
+        peak = []
+
+        def call():
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.pop()
+            return 'ok'
+
+        threads = [threading.Thread(target=router.call, args=([('solo', call)],)) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+        assert max(peak) == 1
+        assert router.stats()['providers']['solo']['calls'] == 4
+
+
+class TestStreamingChat:
+    @staticmethod
+    def _frames(body):
+        frames = []
+        for block in body.decode().strip().split('\n\n'):
+            fields = dict(line.split(': ', 1) for line in block.split('\n'))
+            frames.append((fields['event'], json.loads(fields['data'])))
+        return frames
+
+    def test_chat_streams_tokens_and_falls_back_before_first_token(self, client, monkeypatch):
+        import app as app_module
+        from llm_router import ProviderRouter
+        monkeypatch.setattr(app_module, 'llm_router', ProviderRouter())
+        monkeypatch.setattr(app_module.Config, 'LLM_PROVIDER_ORDER', 'openai,anthropic')
+        monkeypatch.setattr(app_module.Config, 'OPENAI_API_KEY', 'test-key')
+        monkeypatch.setattr(app_module.Config, 'ANTHROPIC_API_KEY', 'test-key')
+
+        def broken(*args, **kwargs):
+            raise RuntimeError('upstream down')
+            yield  # pragma: no cover
+
+        monkeypatch.setattr(app_module, '_stream_openai_compatible', broken)
+        monkeypatch.setattr(app_module, '_stream_anthropic', lambda *a, **kw: iter(['Hel', 'lo']))
+
+        r = client.post('/api/chat', json={'message': 'hi there', 'stream': True, 'cache': False})
+        assert r.status_code == 200
+        assert r.mimetype == 'text/event-stream'
+        frames = self._frames(r.data)
+        assert [f for f in frames if f[0] == 'token'] == [('token', {'text': 'Hel'}), ('token', {'text': 'lo'})]
+        assert frames[-1][0] == 'done'
+        assert frames[-1][1]['reply'] == 'Hello'
+        assert app_module.llm_ttft_metrics()['chat/anthropic']['count'] >= 1
+
+    def test_disconnect_mid_stream_frees_half_open_trial_and_concurrency_slot(self, monkeypatch):
+        import app as app_module
+        from llm_router import ProviderRouter, RouterPolicy
+        router = ProviderRouter(RouterPolicy(failure_threshold=1, cooldown=0.0, concurrency={'anthropic': 1}))
+        monkeypatch.setattr(app_module, 'llm_router', router)
+        monkeypatch.setattr(app_module.Config, 'LLM_PROVIDER_ORDER', 'anthropic')
+        monkeypatch.setattr(app_module.Config, 'ANTHROPIC_API_KEY', 'test-key')
+        monkeypatch.setattr(app_module, '_stream_anthropic', lambda *a, **kw: iter(['Hel', 'lo']))
+        router.record('anthropic', False)
+        assert router.stats()['providers']['anthropic']['state'] == 'half_open'
+
+        stream = app_module.stream_llm('system', [{'role': 'user', 'content': 'hi'}])
+        assert next(stream) == 'Hel'
+        assert router.route([('anthropic', None)])[0] == []  # trial in flight
+        assert router.slot('anthropic').acquire(blocking=False) is False
+        stream.close()
+
+        assert router.route([('anthropic', None)])[0] == [('anthropic', None)]
+        assert router.slot('anthropic').acquire(blocking=False) is True
+        router.slot('anthropic').release()
+        assert router.stats()['providers']['anthropic']['calls'] == 1  # no outcome recorded for the disconnect
+
+    def test_anthropic_stream_yields_text_deltas(self, monkeypatch):
+        import app as app_module
+        events = [
+            {'type': 'message_start'},
+            {'type': 'content_block_delta', 'delta': {'type': 'text_delta', 'text': 'I am '}},
+            {'type': 'content_block_delta', 'delta': {'type': 'text_delta', 'text': 'here.'}},
+            {'type': 'message_stop'},
+        ]
+
+        class _StreamedResponse:
+            ok = True
+            closed = False
+
+            def raise_for_status(self):
+                pass
+
+            def iter_lines(self):
+                for event in events:
+                    yield f"event: {event['type']}".encode()
+                    yield f"data: {json.dumps(event)}".encode()
+                    yield b''
+
+            def close(self):
+                self.closed = True
+
+        resp = _StreamedResponse()
+        sent = {}
+        monkeypatch.setattr(app_module.outbound_http, 'post',
+                            lambda url, **kwargs: sent.update(kwargs) or resp)
+
+        deltas = list(app_module._stream_anthropic('key', 'model', 'system', [{'role': 'user', 'content': 'hi'}]))
+        assert deltas == ['I am ', 'here.']
+        assert sent['stream'] is True
+        assert sent['json']['stream'] is True
+        assert resp.closed
+
+
+class TestMetrics:
+    def test_metrics_endpoint_exposes_request_histograms(self, client):
+        assert client.get('/health').status_code == 200
+        r = client.get('/metrics')
+        assert r.status_code == 200
+        assert r.content_type.startswith('text/plain; version=0.0.4')
+        text = r.data.decode()
+        assert '# TYPE http_request_duration_seconds histogram' in text
+        assert 'http_request_duration_seconds_count{endpoint="health",method="GET",status="200"}' in text
+        assert 'http_request_duration_seconds_bucket{endpoint="health",method="GET",status="200",le="+Inf"}' in text
+        assert 'http_requests_in_flight' in text
+        assert 'trifecta_component_stat{component="rate_limiter",stat="allowed"}' in text
+
+    def test_sharded_counters_survive_thread_exit(self):
+        import threading
+        from metrics import MetricsRegistry
+        registry = MetricsRegistry()
+        counter = registry.counter('jobs_total', 'Jobs', ('kind',))
+        hist = registry.histogram('job_seconds', 'Job time', buckets=(0.1, 1.0))
+
+        def work():
+            for _ in range(100):
+                counter.inc('a')
+            hist.observe(0.05)
+            hist.observe(5)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        counter.inc('b', amount=2.5)
+
+        text = registry.render()
+        assert 'jobs_total{kind="a"} 400' in text
+        assert 'jobs_total{kind="b"} 2.5' in text
+        assert 'job_seconds_bucket{le="0.1"} 4' in text
+        assert 'job_seconds_bucket{le="1"} 4' in text
+        assert 'job_seconds_bucket{le="+Inf"} 8' in text
+        assert 'job_seconds_count 8' in text
+        # Dead threads were folded into the base shard
+        assert len(counter._shards) == 1
+
+    def test_histogram_observe_swaps_in_new_state_instead_of_mutating(self):
+        from metrics import MetricsRegistry
+        registry = MetricsRegistry()
+        hist = registry.histogram('step_seconds', 'Step time', buckets=(0.1, 1.0))
+        hist.observe(0.1)
+        # What a concurrent scrape may be reading: it must stay a consistent (buckets, sum, count)
+        seen = hist._shard()[()]
+        hist.observe(5)
+        assert seen == ((1, 0, 0), 0.1, 1)
+        assert hist._collect()[()] == [[1, 0, 1], 5.1, 2]
+
+
+class TestSQLProfiler:
+    def test_fingerprints_group_literals_and_capture_slow_plans(self, tmp_path):
+        from sql_profiler import QueryProfiler, connect, fingerprint
+        assert fingerprint("SELECT * FROM t WHERE id = 42 AND name = 'x''y'") == "SELECT * FROM t WHERE id = ? AND name = ?"
+        assert fingerprint("SELECT 1 FROM t WHERE id IN (?, ?,?)") == "SELECT ? FROM t WHERE id IN (?+)"
+
+        profiler = QueryProfiler(slow_threshold=0.0, route_fn=lambda: 'test-route')
+        conn = connect(str(tmp_path / 'profiled.db'))
+        conn.profiler = profiler
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, kind TEXT)")
+        conn.executemany("INSERT INTO items (kind) VALUES (?)", [('a',), ('b',), ('a',)])
+        for kind in ('a', 'b'):
+            conn.execute("SELECT * FROM items WHERE kind = ?", (kind,)).fetchall()
+        conn.close()
+        profiler.wait_for_plans()  # captured off the request path
+
+        top = {entry['fingerprint']: entry for entry in profiler.top(limit=10, sort='count')}
+        select = top["SELECT * FROM items WHERE kind = ?"]
+        assert select['db'] == 'profiled'
+        assert select['count'] == 2
+        assert select['rows'] == 3
+        assert select['routes'] == {'test-route': 2}
+        assert any('SCAN' in step for step in select['plan'])
+        slow = profiler.slow_queries()
+        assert slow[0]['fingerprint'] == "SELECT * FROM items WHERE kind = ?"
+        assert profiler.summary()['statements'] == 4
+
+    def test_plan_capture_leaves_the_callers_transaction_alone(self, tmp_path):
+        from sql_profiler import QueryProfiler, connect
+        profiler = QueryProfiler(slow_threshold=0.0)
+        conn = connect(str(tmp_path / 'plans.db'))
+        conn.profiler = profiler
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, kind TEXT)")
+        conn.execute("INSERT INTO items (kind) VALUES ('a')")
+        assert conn.in_transaction
+        conn.execute("SELECT * FROM items WHERE kind = ?", ('a',)).fetchall()
+        profiler.wait_for_plans()
+        assert conn.in_transaction  # still the caller's open transaction, nothing run on it
+        conn.rollback()
+        assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+        select = [e for e in profiler.top() if e['fingerprint'] == "SELECT * FROM items WHERE kind = ?"][0]
+        assert any('SCAN' in step for step in select['plan'])
+        conn.close()
+
+    def test_disabled_profiler_still_feeds_the_query_histogram(self, tmp_path):
+        from sql_profiler import QueryProfiler, connect
+        observed = []
+        profiler = QueryProfiler(enabled=False, observer=lambda db, seconds: observed.append(db))
+        conn = connect(str(tmp_path / 'quiet.db'))
+        conn.profiler = profiler
+        conn.execute("CREATE TABLE items (kind TEXT)")
+        conn.executemany("INSERT INTO items (kind) VALUES (?)", [('a',), ('b',)])
+        conn.close()
+        assert observed == ['quiet', 'quiet']
+        assert profiler.summary()['statements'] == 0
+
+    def test_lead_store_statements_are_profiled(self, tmp_path):
+        import app as app_module
+        store = app_module.LeadPipelineStore(str(tmp_path / 'profiled_leads.db'))
+        app_module.sql_profiler.reset()
+        store.list_leads(limit=5)
+        fingerprints = [entry['fingerprint'] for entry in app_module.sql_profiler.top(limit=50)
+                        if entry['db'] == 'profiled_leads']
+        assert "SELECT * FROM leads ORDER BY updated_at DESC LIMIT ? OFFSET ?" in fingerprints
+        store.close()
+
+
+class TestStartupProfile:
+    def test_fast_boot_defers_init_until_first_run(self):
+        from boot_profile import BootProfiler
+        calls = []
+        profiler = BootProfiler(fast=True)
+        profiler.mark('imports')
+        profiler.run_or_defer('skills', lambda: calls.append('skills'))
+        profiler.run_or_defer('broken', lambda: 1 / 0)
+        assert calls == []
+        assert profiler.report()['deferred_pending'] == ['skills', 'broken']
+
+        profiler.run_deferred()
+        profiler.run_deferred()
+        report = profiler.report()
+        assert calls == ['skills']
+        assert report['deferred_pending'] == []
+        assert set(report['deferred_ms']) == {'skills', 'broken'}
+        assert 'division by zero' in report['deferred_errors']['broken']
+        assert profiler.deferred_done.is_set()
+
+    def test_normal_boot_runs_inline_and_times_each_phase(self):
+        from boot_profile import BootProfiler
+        profiler = BootProfiler()
+        profiler.mark('imports')
+        assert profiler.run_or_defer('skills', lambda: 'loaded') == 'loaded'
+        profiler.finish()
+        report = profiler.report()
+        assert list(report['phases_ms']) == ['imports', 'skills']
+        assert report['import_ms'] >= 0
+        assert profiler.deferred_done.is_set()
+
+    def test_health_reports_startup_phases(self, client):
+        data = json.loads(client.get('/health').data)
+        assert data['startup']['deferred_pending'] == []
+        assert 'imports' in data['startup']['phases_ms']
+
 
 class TestSecurity:
     def test_404_returns_json(self, client):
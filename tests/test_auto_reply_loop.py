@@ -0,0 +1,130 @@
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import auto_reply_loop
+from outbound_http import OutboundHTTP
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    monkeypatch.setattr(auto_reply_loop, "LOG_DIR", str(tmp_path / "logs"))
+    monkeypatch.setattr(auto_reply_loop, "STATUS_DIR", str(tmp_path / "status"))
+    monkeypatch.setattr(auto_reply_loop, "SCOUT_SCRIPT", str(tmp_path / "no_scout.py"))
+    db_path = str(tmp_path / "leads.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE leads (id INTEGER PRIMARY KEY, status TEXT)")
+    conn.commit()
+    conn.close()
+    p = auto_reply_loop.AutoReplyPipeline(db_path, draft_concurrency=4, http=OutboundHTTP())
+    yield p
+    p.stop()
+    p.close()
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_stage_times_each_step_and_rolls_back_a_failed_one(pipeline):
+    def ok_step():
+        time.sleep(0.02)
+        return True, 3
+
+    def failing_step():
+        pipeline.conn.execute("INSERT INTO leads (status) VALUES ('HALF_WRITTEN')")
+        raise RuntimeError("draft API down")
+
+    ok = pipeline._stage("draft", ok_step)
+    assert (ok.ok, ok.items) == (True, 3)
+    assert ok.as_dict()["ms"] >= 20
+
+    failed = pipeline._stage("send", failing_step)
+    assert (failed.ok, failed.items, failed.error) == (False, 0, "draft API down")
+    assert not pipeline.conn.in_transaction
+    assert pipeline.conn.execute("SELECT COUNT(*) FROM leads").fetchone()[0] == 0
+
+
+def test_run_cycle_continues_past_a_failed_stage_and_reports_timings(pipeline, monkeypatch):
+    monkeypatch.setattr(auto_reply_loop.fetch_godaddy_leads, "get_godaddy_conversations", lambda: [{"id": "c1"}])
+    monkeypatch.setattr(auto_reply_loop.fetch_godaddy_leads, "get_new_leads", lambda conversations, conn=None: conversations)
+    monkeypatch.setattr(auto_reply_loop.fetch_godaddy_leads, "insert_leads_to_db", lambda leads, conn=None: len(leads))
+
+    def draft_leads(conn=None, limit=10):
+        raise RuntimeError("awaiting-response query failed")
+
+    monkeypatch.setattr(auto_reply_loop.reply_generator, "get_awaiting_response_leads", draft_leads)
+    ready = [{"id": i, "source_id": f"s{i}", "draft_response": "Hi"} for i in range(2)]
+    monkeypatch.setattr(auto_reply_loop.send_godaddy_reply, "get_ready_to_send_leads", lambda conn=None, limit=10: ready)
+    monkeypatch.setattr(auto_reply_loop.send_godaddy_reply, "send_godaddy_reply", lambda source_id, draft: True)
+    monkeypatch.setattr(auto_reply_loop.send_godaddy_reply, "mark_sent", lambda lead_id, conn=None: True)
+    monkeypatch.setattr(pipeline, "sync", lambda: (True, 0))
+
+    assert pipeline.run_cycle("test") is True
+    stages = pipeline.stage_ms()
+    assert list(stages) == ["fetch", "draft", "send", "sync"]
+    assert stages["fetch"]["items"] == 1
+    assert stages["draft"]["ok"] is False and "query failed" in stages["draft"]["error"]
+    assert (stages["send"]["ok"], stages["send"]["items"]) == (True, 2)
+    assert all(stage["ms"] >= 0 for stage in stages.values())
+
+
+def test_map_keeps_input_order_while_running_concurrently():
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def work(n):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05 - n * 0.01)  # later items finish first
+        with lock:
+            active[0] -= 1
+        return n * n
+
+    results = list(auto_reply_loop.AutoReplyPipeline._map(work, [0, 1, 2, 3, 4], workers=4))
+    assert results == [(n, n * n) for n in range(5)]
+    assert peak[0] > 1
+    assert list(auto_reply_loop.AutoReplyPipeline._map(work, [2, 1], workers=1)) == [(2, 4), (1, 1)]
+
+
+def test_serve_forever_runs_on_db_change_trigger_and_interval_respecting_min_gap(pipeline, monkeypatch):
+    cycles = []
+    monkeypatch.setattr(pipeline, "run_cycle", lambda reason: cycles.append((reason, time.monotonic())))
+    runner = threading.Thread(target=pipeline.serve_forever,
+                              kwargs={"interval": 1.0, "min_gap": 0.3, "poll": 0.01}, daemon=True)
+    runner.start()
+    _wait_for(lambda: len(cycles) == 1)
+    assert cycles[0][0] == "interval"  # first cycle on start
+
+    # Another process commits: picked up through PRAGMA data_version, but not before min_gap
+    other = sqlite3.connect(pipeline.db_path)
+    other.execute("INSERT INTO leads (status) VALUES ('NEW')")
+    other.commit()
+    other.close()
+    _wait_for(lambda: len(cycles) == 2)
+    assert cycles[1][0] == "db change"
+    assert cycles[1][1] - cycles[0][1] >= 0.3
+
+    pipeline.trigger()
+    _wait_for(lambda: len(cycles) == 3)
+    assert cycles[2][0] == "trigger"
+    assert cycles[2][1] - cycles[1][1] >= 0.3
+
+    # Nothing else happens: the interval starts the next one
+    _wait_for(lambda: len(cycles) == 4)
+    assert cycles[3][0] == "interval"
+    assert cycles[3][1] - cycles[2][1] >= 1.0
+
+    pipeline.stop()
+    runner.join(2)
+    assert not runner.is_alive()
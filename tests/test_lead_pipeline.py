@@ -1,6 +1,8 @@
 import json
 import os
 import sys
+import threading
+import time
 
 import pytest
 
@@ -416,10 +418,13 @@ def test_build_godaddy_sync_event_maps_contact_form_fields():
 
 def test_lead_board_live_sync_includes_sync_summary(client, monkeypatch):
     app_module.Config.GODADDY_LIVE_SYNC_ENABLED = True
+    worker = app_module.GoDaddyLiveSyncWorker(max_age=300)
+    monkeypatch.setattr(app_module, "godaddy_live_sync", worker)
+    bridge_done = threading.Event()
     monkeypatch.setattr(
         app_module,
         "sync_godaddy_live_conversations",
-        lambda max_pages=None, page_size=None: {
+        lambda max_pages=None, page_size=None: bridge_done.wait(5) and {
             "success": True,
             "source": app_module.LEAD_SOURCE["GODADDY_CHAT"],
             "checked_at": "2026-03-20T10:00:00Z",
@@ -436,9 +441,19 @@ def test_lead_board_live_sync_includes_sync_summary(client, monkeypatch):
         },
     )
 
+    # A cold cache is served empty while the bridge runs in the background
+    cold = client.get("/api/leads/board?limit=20&stale_after_hours=48&sync_live=1").get_json()
+    assert cold["live_sync"]["syncing"] is True
+    assert cold["live_sync"]["upstream_count"] == 0
+    bridge_done.set()
+    deadline = time.time() + 5
+    while worker.is_stale() and time.time() < deadline:
+        time.sleep(0.01)
+
     board_res = client.get("/api/leads/board?limit=20&stale_after_hours=48&sync_live=1")
     assert board_res.status_code == 200
     body = board_res.get_json()
+    assert body["live_sync"]["syncing"] is False
     assert body["live_sync"]["success"] is True
     assert body["live_sync"]["upstream_count"] == 1
     assert body["reconciliation"]["upstream_count"] == 1
@@ -477,3 +492,477 @@ def test_reconcile_endpoint_detects_missing_and_newer_upstream_activity(client):
     assert reconciliation["missing_count"] == 1
     assert reconciliation["mismatch_count"] == 1
     assert reconciliation["missing_leads"][0]["is_missing_from_pipeline"] is True
+
+
+def test_lead_store_reuses_thread_local_connection(tmp_path):
+    store = app_module.LeadPipelineStore(str(tmp_path / "pool_test.db"))
+    store.upsert_lead(app_module.LEAD_SOURCE["MANUAL"], "Pool", "pool@example.com", "", None, "", "")
+    store.get_lead_by_identity("pool@example.com", None, None)
+
+    with store._connect() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+    stats = store.pool_stats()
+    assert stats["opens"] == 1
+    assert stats["reuses"] >= 3
+    assert stats["open_connections"] == 1
+    store.close()
+
+
+def test_lead_store_pooled_close_rolls_back_open_transaction(tmp_path):
+    store = app_module.LeadPipelineStore(str(tmp_path / "pool_rollback.db"))
+    conn = store._connect()
+    conn.execute(
+        "INSERT INTO clients (id, status, created_at) VALUES (?, ?, ?)",
+        ("c-1", "intake", app_module.utcnow_iso()),
+    )
+    conn.close()
+    assert store.count_clients() == 0
+    assert store._connect() is conn
+    store.close()
+
+
+def test_load_lead_contexts_matches_per_lead_queries(tmp_path):
+    store = app_module.LeadPipelineStore(str(tmp_path / "contexts.db"))
+    source = app_module.LEAD_SOURCE["MANUAL"]
+    first, _ = store.upsert_lead(source, "First", "first@example.com", "", None, "", "")
+    second, _ = store.upsert_lead(source, "Second", "second@example.com", "", None, "", "")
+    for i in range(7):
+        store.insert_event(first["id"], source, f"evt-{i}", "message", {"i": i}, None)
+    draft = store.create_draft(first["id"], "m", "v1", "Subj", "<p>x</p>", "x", 0.9, [], [])
+    store.insert_outbound_message(first["id"], draft["id"], "sent", sent_at=app_module.utcnow_iso())
+
+    contexts = store.load_lead_contexts([first["id"], second["id"]], event_limit=5)
+
+    assert len(contexts[first["id"]]["events"]) == 5
+    assert all(e["lead_id"] == first["id"] and "_rn" not in e for e in contexts[first["id"]]["events"])
+    assert contexts[first["id"]]["draft"] == store.get_latest_draft(first["id"])
+    assert contexts[first["id"]]["outbound"] == store.get_latest_outbound_message(first["id"])
+    assert contexts[second["id"]] == {"events": [], "draft": None, "outbound": None}
+    store.close()
+
+
+def test_async_webhook_ingest_queues_dedupes_and_drains(client, monkeypatch):
+    monkeypatch.setattr(app_module.Config, "LEAD_WEBHOOK_ASYNC", True)
+    payload = {
+        "event_id": "outlook-async-001",
+        "responses": [
+            {"name": "full_name", "value": "Queued Lead"},
+            {"name": "email", "value": "queued@example.com"},
+        ],
+    }
+    headers = {"X-Outlook-Token": "outlook-test-token"}
+
+    first = client.post("/api/webhooks/outlook-form", json=payload, headers=headers)
+    assert first.status_code == 202
+    assert first.get_json()["status"] == "queued"
+    second = client.post("/api/webhooks/outlook-form", json=payload, headers=headers)
+    assert second.status_code == 202
+    assert second.get_json()["duplicate"] is True
+
+    metrics = client.get("/api/webhooks/ingest/metrics", headers=_admin_headers()).get_json()
+    assert metrics["depth"] == 1
+
+    assert app_module.ingest_workers.run_pending() == 1
+    lead = app_module.lead_store.get_lead_by_identity("queued@example.com", None, None)
+    assert lead is not None and lead["name"] == "Queued Lead"
+
+    metrics = client.get("/api/webhooks/ingest/metrics", headers=_admin_headers()).get_json()
+    assert metrics["depth"] == 0
+    assert metrics["by_status"] == {"done": 1}
+
+    replay = client.post("/api/webhooks/outlook-form", json=payload, headers=headers)
+    assert replay.get_json()["duplicate"] is True
+    assert replay.get_json()["lead_id"] == lead["id"]
+
+
+def test_enqueue_ingest_race_between_worker_processes_is_a_duplicate(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "ingest_race.db")
+    worker_a = app_module.LeadPipelineStore(db_path)
+    worker_b = app_module.LeadPipelineStore(db_path)
+    normalized = {"source": "OUTLOOK_FORM", "source_event_id": "retry-001"}
+    real_lookup = worker_a._queued_ingest
+
+    def lookup_then_lose_the_race(conn, source, source_event_id):
+        # Worker B queues the provider's retry right after worker A's duplicate check
+        monkeypatch.setattr(worker_a, "_queued_ingest", real_lookup)
+        job_b, created_b = worker_b.enqueue_ingest(normalized, {"attempt": 2})
+        assert created_b is True
+        return None
+
+    monkeypatch.setattr(worker_a, "_queued_ingest", lookup_then_lose_the_race)
+    job_a, created_a = worker_a.enqueue_ingest(normalized, {"attempt": 1})
+    assert created_a is False
+    assert job_a["source_event_id"] == "retry-001" and job_a["status"] == "queued"
+    assert worker_a.ingest_queue_metrics()["depth"] == 1
+    worker_a.close()
+    worker_b.close()
+
+
+def test_ingest_job_failure_is_retried_then_marked_failed(client, monkeypatch):
+    monkeypatch.setattr(app_module.Config, "LEAD_WEBHOOK_ASYNC", True)
+    monkeypatch.setattr(app_module.Config, "LEAD_INGEST_MAX_ATTEMPTS", 1)
+
+    def boom(normalized, event):
+        raise RuntimeError("upsert exploded")
+
+    monkeypatch.setitem(app_module.INGEST_HANDLERS, "outlook_form", boom)
+    res = client.post(
+        "/api/webhooks/outlook-form",
+        json={"event_id": "outlook-async-fail", "email": "fail@example.com"},
+        headers={"X-Outlook-Token": "outlook-test-token"},
+    )
+    assert res.status_code == 202
+    app_module.ingest_workers.run_pending()
+    metrics = app_module.lead_store.ingest_queue_metrics()
+    assert metrics["by_status"] == {"failed": 1}
+    assert metrics["depth"] == 0
+
+
+def test_async_godaddy_repeat_event_still_marks_lead_replied(client, monkeypatch):
+    monkeypatch.setattr(app_module.Config, "LEAD_WEBHOOK_ASYNC", True)
+    payload = {
+        "event_id": "gd-async-001",
+        "conversation": {"id": "conv-async", "contact_id": "contact-async"},
+        "contact": {"name": "Async Replier", "email": "replier@example.com"},
+        "message": {"id": "msg-async", "text": "Can I get pricing?", "created_at": "2026-03-18T18:00:00Z"},
+    }
+    headers = {"X-GoDaddy-Token": "godaddy-test-token"}
+
+    first = client.post("/api/webhooks/godaddy", json=payload, headers=headers)
+    assert first.get_json()["status"] == "queued"
+    # A repeat while the first delivery is still queued is only a duplicate
+    pending = client.post("/api/webhooks/godaddy", json=payload, headers=headers)
+    assert pending.get_json()["duplicate"] is True
+    assert app_module.ingest_workers.run_pending() == 1
+    lead = app_module.lead_store.get_lead_by_identity("replier@example.com", None, None)
+    assert lead["status"] != app_module.LEAD_STATUS["REPLIED"]
+
+    repeat = client.post("/api/webhooks/godaddy", json=payload, headers=headers)
+    assert repeat.status_code == 202
+    assert repeat.get_json()["lead_id"] == lead["id"]
+    lead = app_module.lead_store.get_lead_by_id(lead["id"])
+    assert lead["status"] == app_module.LEAD_STATUS["REPLIED"]
+
+
+def test_sent_log_store_imports_jsonl_once_and_keeps_counters(tmp_path):
+    legacy = tmp_path / "sent-log.jsonl"
+    legacy.write_text(
+        '{"ts":"2026-03-24T23:28:34Z","type":"sms","to":"+1","lead_id":"lead-a","channel":"dialpad","trigger":"x"}\n'
+        '{"ts":"2026-03-25T10:00:00Z","type":"email","to":"a@example.com","lead_id":"lead-a","channel":"outlook"}\n',
+        encoding="utf-8",
+    )
+    store = app_module.LeadPipelineStore(str(tmp_path / "sentlog.db"))
+    assert store.import_sent_log_jsonl(str(legacy)) == 2
+    assert store.import_sent_log_jsonl(str(legacy)) == 0
+
+    store.append_sent_log({"ts": "2026-03-25T12:00:00Z", "type": "email", "to": "b@example.com",
+                           "lead_id": "lead-b", "channel": "outlook"})
+
+    assert store.list_sent_log(lead_id="lead-a")[0]["trigger"] == "x"
+    assert store.sent_log_total() == 3
+    assert store.sent_log_channel_counts() == {"dialpad": 1, "outlook": 2}
+    from datetime import date
+    assert store.sent_log_daily_counts(entry_type="email") == {date(2026, 3, 25): 2}
+    assert store.sent_log_lead_summary("lead-a") == {"count": 2, "last_ts": "2026-03-25T10:00:00Z"}
+    assert sorted(store.sent_log_lead_ids()) == ["lead-a", "lead-b"]
+    store.close()
+
+
+def test_sent_log_import_race_and_null_channel(client, tmp_path, monkeypatch):
+    legacy = tmp_path / "sent-log.jsonl"
+    legacy.write_text('{"ts":"2026-03-25T10:00:00Z","type":"email","lead_id":"lead-a","channel":"outlook"}\n',
+                      encoding="utf-8")
+    # Another worker on the same DB imports first: this one gets 0 rather than a conflict
+    first = app_module.LeadPipelineStore(str(tmp_path / "shared.db"))
+    second = app_module.LeadPipelineStore(str(tmp_path / "shared.db"))
+    assert first.import_sent_log_jsonl(str(legacy)) == 1
+    assert second.import_sent_log_jsonl(str(legacy)) == 0
+
+    second.append_sent_log({"ts": "2026-03-25T11:00:00Z", "type": "email", "lead_id": "lead-b", "channel": None})
+    second.append_sent_log({"ts": "2026-03-25T12:00:00Z", "type": "email", "lead_id": "lead-c", "channel": None})
+    with second._connect() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM sent_log WHERE channel IS NULL").fetchone()[0] == 2
+        assert conn.execute("SELECT COUNT(*) FROM sent_log_daily_counts WHERE channel = 'None'").fetchone()[0] == 0
+    assert second.sent_log_channel_counts() == {"outlook": 1, "unknown": 2}
+    first.close()
+    second.close()
+
+    # A failing legacy import does not drop the entry being appended
+    monkeypatch.setattr(app_module, "OUTBOUND_SENT_LOG", str(tmp_path / "mirror.jsonl"))
+
+    def broken_import(path):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(app_module.lead_store, "import_sent_log_jsonl", broken_import)
+    assert app_module._append_sent_log({"ts": "2026-03-25T13:00:00Z", "type": "sms", "lead_id": "lead-d"}) is True
+    assert app_module.lead_store.list_sent_log(lead_id="lead-d")[0]["type"] == "sms"
+
+
+def test_lead_counters_track_every_writer_and_rebuild(tmp_path):
+    import sqlite3
+
+    db_path = tmp_path / "counters.db"
+    store = app_module.LeadPipelineStore(str(db_path))
+    a, _ = store.upsert_lead("MANUAL", "A", "a@example.com", None, None, "q", "")
+    b, _ = store.upsert_lead("GODADDY_CHAT", "B", "b@example.com", None, None, "q", "")
+    store.upsert_lead("MANUAL", "A again", "a@example.com", None, None, "q", "")
+    store.set_lead_status(a["id"], app_module.LEAD_STATUS["DRAFT_CREATED"])
+    store.update_lead(b["id"], source="MANUAL")
+    store.archive_lead(b["id"])
+
+    # Writers that bypass the store (ingest scripts) are counted too
+    raw = sqlite3.connect(str(db_path))
+    raw.execute(
+        "INSERT INTO leads (id, source, status, created_at, updated_at) VALUES ('ext-1', 'OUTLOOK_FORM', ?, 'x', 'x')",
+        (app_module.LEAD_STATUS["INQUIRY_RECEIVED"],),
+    )
+    raw.commit()
+    raw.close()
+
+    metrics = store.status_metrics()
+    assert metrics["total_leads"] == 3
+    assert {r["source"]: r["count"] for r in metrics["by_source"]} == {"MANUAL": 2, "OUTLOOK_FORM": 1}
+    assert {r["status"]: r["count"] for r in metrics["by_status"]} == {
+        app_module.LEAD_STATUS["DRAFT_CREATED"]: 1,
+        app_module.LEAD_STATUS["ARCHIVED"]: 1,
+        app_module.LEAD_STATUS["INQUIRY_RECEIVED"]: 1,
+    }
+    assert store.verify_lead_counters()["ok"] is True
+
+    with store._connect() as conn:
+        conn.execute("UPDATE lead_counters SET count = 99 WHERE dimension = 'total'")
+    report = store.verify_lead_counters()
+    assert report["ok"] is False
+    assert report["drift"] == [{"dimension": "total", "value": "", "counter": 99, "actual": 3}]
+    store.rebuild_lead_counters()
+    assert store.verify_lead_counters()["ok"] is True
+    store.close()
+
+
+def test_outbound_log_endpoints_read_from_store(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(app_module, "OUTBOUND_SENT_LOG", str(tmp_path / "sent-log.jsonl"))
+    res = client.post("/api/outbound/log", json={
+        "type": "email", "to": "x@example.com", "lead_id": "lead-x", "channel": "outlook",
+    })
+    assert res.status_code == 201
+
+    log = client.get("/api/outbound/log?lead_id=lead-x").get_json()
+    assert log["count"] == 1 and log["entries"][0]["to"] == "x@example.com"
+    summary = client.get("/api/outbound/summary").get_json()
+    assert summary["total"] == 1
+    assert summary["today"] == 1
+    assert summary["by_channel"] == {"outlook": 1}
+    assert (tmp_path / "sent-log.jsonl").read_text(encoding="utf-8").count("\n") == 1
+
+
+class _FakeWorksheet:
+    def __init__(self, rows):
+        self.rows = [list(r) for r in rows]
+        self.calls = []
+
+    def col_values(self, col):
+        self.calls.append(("col_values", col))
+        return [r[col - 1] if len(r) >= col else "" for r in self.rows]
+
+    def append_rows(self, rows, value_input_option=None):
+        self.calls.append(("append_rows", len(rows)))
+        first = len(self.rows) + 1
+        self.rows.extend([list(r) for r in rows])
+        return {"updates": {"updatedRange": f"Sheet1!A{first}:L{len(self.rows)}"}}
+
+    def batch_update(self, data):
+        self.calls.append(("batch_update", len(data)))
+        for item in data:
+            col = ord(item["range"][0]) - 64
+            row = int(item["range"][1:])
+            self.rows[row - 1].extend([""] * (col - len(self.rows[row - 1])))
+            self.rows[row - 1][col - 1] = item["values"][0][0]
+
+
+def test_lead_sheet_writer_indexes_rows_and_batches_writes():
+    sheet = _FakeWorksheet([
+        ["Date", "Name", "Email", "Phone"],
+        ["2026-03-01", "Old", "old@example.com", "+15550001"],
+    ])
+    writer = app_module.LeadSheetWriter(open_worksheet=lambda: sheet, flush_interval=60, index_ttl=300)
+
+    writer.append_lead_row(["2026-03-02", "New", "new@example.com", "", "", "", "", "INQUIRY_RECEIVED"],
+                           email="new@example.com")
+    # Update for a row that is still pending is folded into the append itself
+    assert writer.update_lead_cells("new@example.com", {8: "REPLIED"})
+    assert writer.update_lead_cells("OLD@example.com", {7: "2026-03-03", 8: "REPLIED"})
+    assert writer.update_lead_cells("+15550001", {12: 2})
+    assert writer.update_lead_cells("missing@example.com", {8: "X"}) is False
+
+    assert writer.flush()
+    assert [c[0] for c in sheet.calls] == ["col_values", "col_values", "append_rows", "batch_update"]
+    assert sheet.rows[2][7] == "REPLIED"
+    assert sheet.rows[1][6:8] == ["2026-03-03", "REPLIED"] and sheet.rows[1][11] == 2
+
+    # Appended row is now in the index without another sheet scan
+    assert writer.update_lead_cells("new@example.com", {9: "YES"})
+    writer.flush()
+    assert sheet.rows[2][8] == "YES"
+    assert writer.stats["index_loads"] == 1
+
+
+def test_lead_sheet_writer_keeps_buffered_writes_when_flush_fails():
+    sheet = _FakeWorksheet([
+        ["Date", "Name", "Email", "Phone"],
+        ["2026-03-01", "Old", "old@example.com", "+15550001"],
+    ])
+    real_append = sheet.append_rows
+    failures = [RuntimeError("429 quota exceeded")]
+
+    def flaky_append(rows, value_input_option=None):
+        if failures:
+            raise failures.pop()
+        return real_append(rows, value_input_option=value_input_option)
+
+    sheet.append_rows = flaky_append
+    writer = app_module.LeadSheetWriter(open_worksheet=lambda: sheet, flush_interval=60, index_ttl=300)
+    writer.append_lead_row(["2026-03-02", "New", "new@example.com"], email="new@example.com")
+    assert writer.update_lead_cells("old@example.com", {8: "REPLIED"})
+
+    assert writer.flush() is False
+    assert writer.stats["failed_flushes"] == 1
+    assert len(sheet.rows) == 2
+    # Queued after the failure: the newer value must win over the restored one
+    assert writer.update_lead_cells("old@example.com", {8: "CONSULTATION_BOOKED"})
+
+    assert writer.flush() is True
+    assert sheet.rows[2][:3] == ["2026-03-02", "New", "new@example.com"]
+    assert sheet.rows[1][7] == "CONSULTATION_BOOKED"
+    assert writer.flush() is True and len(sheet.rows) == 3
+
+
+def test_godaddy_live_sync_worker_caches_snapshots_and_uses_incremental_cursor(client, monkeypatch):
+    conversations = [
+        {"id": "conv-a", "newest_message_timestamp": "2026-03-20T10:00:00Z", "subject": "A", "customer": {"name": "Ann", "email": "ann@example.com"}},
+        {"id": "conv-b", "newest_message_timestamp": "2026-03-20T11:00:00Z", "subject": "B", "customer": {"name": "Bob", "email": "bob@example.com"}},
+    ]
+    calls = []
+
+    def fake_fetch(max_pages=None, page_size=None, since=None):
+        calls.append(since)
+        return {"success": True, "fetched_at": "2026-03-20T12:00:00Z", "conversations": [dict(c) for c in conversations], "messages": {}}
+
+    monkeypatch.setattr(app_module, "_fetch_godaddy_live_payload", fake_fetch)
+    worker = app_module.GoDaddyLiveSyncWorker(max_age=300, full_every=10)
+    monkeypatch.setattr(app_module, "godaddy_live_sync", worker)
+
+    first = worker.refresh()
+    assert first["ingested_count"] == 2
+    assert first["newest_message_timestamp"] == "2026-03-20T11:00:00Z"
+
+    second = worker.refresh()
+    assert calls[-1] == "2026-03-20T11:00:00Z"
+    assert second["incremental"] is True
+    assert second["unchanged_count"] == 2
+    assert second["ingested_count"] + second["duplicate_count"] == 0
+
+    conversations[0]["newest_message_timestamp"] = "2026-03-20T12:30:00Z"
+    third = worker.refresh()
+    assert third["unchanged_count"] == 1
+    assert third["ingested_count"] + third["duplicate_count"] == 1
+    assert worker.snapshot()["newest_message_timestamp"] == "2026-03-20T12:30:00Z"
+
+    app_module.Config.GODADDY_LIVE_SYNC_ENABLED = True
+    fetches_before_board = len(calls)
+    board = client.get("/api/leads/board?limit=20&sync_live=1").get_json()
+    assert len(calls) == fetches_before_board
+    assert board["live_sync"]["cached"] is True
+    assert board["live_sync"]["stale"] is False
+    assert board["live_sync"]["upstream_count"] == 2
+    assert board["reconciliation"]["upstream_count"] == 2
+
+
+def _next_sse_frame(frames):
+    return next(frames).decode()
+
+
+def test_event_stream_pushes_lead_deltas_and_replays_after_reconnect(client, monkeypatch):
+    monkeypatch.setattr(app_module.Config, "STREAM_HEARTBEAT_SECONDS", 1)
+    res = client.get("/api/stream?topics=lead:new,lead:updated", buffered=False)
+    assert res.mimetype == "text/event-stream"
+    frames = iter(res.response)
+    assert _next_sse_frame(frames).startswith("retry:")
+
+    lead = _create_manual_lead(client, email="stream@example.com")
+    frame = _next_sse_frame(frames)
+    assert "event: lead:new" in frame
+    payload = json.loads(frame.split("data: ", 1)[1])
+    assert payload["data"]["leadId"] == lead["id"]
+    assert payload["data"]["status"] == app_module.LEAD_STATUS["INQUIRY_RECEIVED"]
+    event_id = int(frame.split("id: ", 1)[1].split("\n", 1)[0])
+    res.close()
+
+    patched = client.patch(
+        f"/api/leads/{lead['id']}",
+        json={"name": "Streamed Lead"},
+        headers=_admin_headers(),
+    )
+    assert patched.status_code == 200
+
+    resumed = client.get("/api/stream?topics=lead:updated", headers={"Last-Event-ID": str(event_id)}, buffered=False)
+    resumed_frames = iter(resumed.response)
+    _next_sse_frame(resumed_frames)
+    replayed = _next_sse_frame(resumed_frames)
+    assert "event: lead:updated" in replayed
+    assert json.loads(replayed.split("data: ", 1)[1])["data"]["name"] == "Streamed Lead"
+    resumed.close()
+    assert app_module.event_hub.stats()["subscribers"] == 0
+
+
+def test_scheduler_lease_allows_one_leader_and_fails_over(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_module, "lead_store", app_module.LeadPipelineStore(str(tmp_path / "lease.db")))
+    worker_a = app_module.SchedulerLeader(name="test-scheduler", ttl=30)
+    worker_b = app_module.SchedulerLeader(name="test-scheduler", ttl=30)
+    runs = []
+    job_a = worker_a.leader_only(lambda: runs.append("a"))
+    job_b = worker_b.leader_only(lambda: runs.append("b"))
+
+    assert worker_a.try_acquire() is True
+    assert worker_b.try_acquire() is False
+    assert worker_a.try_acquire() is True  # renewal keeps the lease
+    job_a()
+    job_b()
+    assert runs == ["a"]
+    assert worker_b.skipped_runs == 1
+
+    # Leader stops renewing: once the lease expires the other worker takes over
+    with app_module.lead_store._connect() as conn:
+        conn.execute("UPDATE scheduler_leases SET expires_at = 0 WHERE name = 'test-scheduler'")
+    assert worker_b.try_acquire() is True
+    assert worker_a.try_acquire() is False
+    job_a()
+    job_b()
+    assert runs == ["a", "b"]
+    assert app_module.lead_store.get_lease("test-scheduler")["holder"] == worker_b.holder
+
+    worker_b.stop()
+    assert app_module.lead_store.get_lease("test-scheduler") is None
+
+
+def test_bulk_draft_generation_drafts_undrafted_leads_in_batches(client, monkeypatch):
+    monkeypatch.setattr(app_module, "draft_generator", app_module.DraftBatchGenerator(workers=3, commit_batch=2))
+    ids = [_create_manual_lead(client, email=f"bulk{i}@example.com", source_event_id=f"bulk-{i}")["id"] for i in range(4)]
+    assert client.post(f"/api/leads/{ids[0]}/draft").status_code == 200
+
+    res = client.post("/api/leads/drafts/bulk", json={"limit": 10}, headers=_admin_headers())
+    assert res.status_code == 200
+    summary = res.get_json()
+    assert summary["drafted"] == 3
+    assert summary["fallbacks"] == 0
+    for lead_id in ids[1:]:
+        lead = app_module.lead_store.get_lead_by_id(lead_id)
+        assert lead["status"] == app_module.LEAD_STATUS["DRAFT_CREATED"]
+        assert app_module.lead_store.get_latest_draft(lead_id)["state"] == "drafted"
+
+    again = client.post("/api/leads/drafts/bulk", json={}, headers=_admin_headers()).get_json()
+    assert again["drafted"] == 0
+    metrics = app_module.draft_generator.metrics()
+    assert metrics["runs"] == 2
+    assert metrics["drafted"] == 3
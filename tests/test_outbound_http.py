@@ -0,0 +1,69 @@
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from outbound_http import OutboundHTTP
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_sessions_are_shared_per_host_and_reuse_connections(local_server):
+    http = OutboundHTTP()
+    for _ in range(5):
+        assert http.get(f"{local_server}/ping").json() == {"ok": True}
+
+    assert http.session_for(f"{local_server}/a") is http.session_for(f"{local_server}/b")
+    stats = http.stats()[local_server]
+    assert stats["requests"] == 5
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == 4
+    http.close()
+
+
+def test_env_host_policy_overrides_code_defaults(monkeypatch):
+    monkeypatch.setenv("OUTBOUND_HOST_POLICIES", '{"api.example.com": {"timeout": 42}}')
+    http = OutboundHTTP()
+    http.configure_host("api.example.com", timeout=5, retries=0)
+
+    policy = http.policy_for("https://api.example.com/v1/things")
+    assert policy.timeout == 42
+    assert policy.retries == 0
+    assert http.policy_for("https://other.example.com").timeout == http.default_policy.timeout
+
+
+def test_read_retries_can_be_disabled_separately():
+    http = OutboundHTTP()
+    policy = http.configure_host("api.example.com", retries=1, read_retries=0, status_forcelist=(429, 503), retry_post=True)
+    retry = policy.build_retry()
+    assert (retry.connect, retry.read, retry.status) == (1, 0, 1)
+    assert "POST" in retry.allowed_methods
+    assert retry.status_forcelist == (429, 503)
+    assert http.configure_host("other.example.com", retries=2).build_retry().read == 2
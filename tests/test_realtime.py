@@ -0,0 +1,97 @@
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from outbound_http import OutboundHTTP
+from realtime import DashboardEmitter
+
+
+class _DashboardHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server.received.set()
+        server.release.wait(5)
+        if self.path == "/api/realtime/emit/batch" and not server.batch_enabled:
+            status = 404
+        else:
+            status = 200
+            server.posts.append((self.path, body))
+        payload = b"{}"
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def dashboard():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _DashboardHandler)
+    server.posts = []
+    server.batch_enabled = True
+    server.received = threading.Event()
+    server.release = threading.Event()
+    server.release.set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.release.set()
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_burst_is_coalesced_into_one_batch_over_one_connection(dashboard):
+    http = OutboundHTTP()
+    emitter = DashboardEmitter(_url(dashboard), http=http, max_batch=50, flush_interval=0.2)
+    for i in range(20):
+        emitter.emit("lead:new", f"lead {i}", {"i": i})
+    assert emitter.flush(5)
+
+    assert [path for path, _ in dashboard.posts] == ["/api/realtime/emit/batch"]
+    assert [e["data"]["i"] for e in dashboard.posts[0][1]["events"]] == list(range(20))
+    stats = emitter.stats()
+    assert stats["emitted"] == 20
+    assert stats["batches"] == 1
+    assert stats["batched_events"] == 20
+    assert http.stats()[_url(dashboard)]["connections_opened"] == 1
+    emitter.close()
+    http.close()
+
+
+def test_full_buffer_drops_oldest_and_falls_back_without_batch_endpoint(dashboard):
+    dashboard.batch_enabled = False
+    dashboard.release.clear()
+    http = OutboundHTTP()
+    emitter = DashboardEmitter(_url(dashboard), http=http, capacity=3, flush_interval=0)
+
+    emitter.emit("kpi:updated", "first")
+    assert dashboard.received.wait(5)  # dispatcher is now blocked on the first POST
+    for i in range(5):
+        emitter.emit("kpi:updated", f"burst {i}")
+    dashboard.release.set()
+    assert emitter.flush(5)
+
+    messages = [body["message"] for path, body in dashboard.posts if path == "/api/realtime/emit"]
+    assert messages == ["first", "burst 2", "burst 3", "burst 4"]
+    stats = emitter.stats()
+    assert stats["dropped"] == 2
+    assert stats["emitted"] == 4
+    assert stats["batch_endpoint"] is False
+    emitter.close()
+    http.close()
@@ -0,0 +1,153 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+openpyxl = pytest.importorskip("openpyxl")
+
+import reply_generator
+import send_godaddy_reply
+import sync_db_to_spreadsheet as sync_module
+
+
+@pytest.fixture
+def sync(tmp_path, monkeypatch):
+    db_path = tmp_path / "leads.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        """CREATE TABLE leads (
+            id TEXT PRIMARY KEY, name TEXT, email TEXT, phone TEXT, source TEXT, status TEXT,
+            initial_question TEXT, program_interest TEXT, notes TEXT, created_at TEXT, updated_at TEXT,
+            draft_response TEXT, sent_at TEXT
+        )"""
+    )
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(sync_module, "DB_PATH", str(db_path))
+    monkeypatch.setattr(sync_module, "SPREADSHEET_PATH", str(tmp_path / "leads.xlsx"))
+    monkeypatch.setattr(sync_module, "STATE_PATH", str(tmp_path / "leads.xlsx.sync.json"))
+    return sync_module
+
+
+def _upsert(sync, lead_id, status="INQUIRY_RECEIVED", updated_at="2026-03-01T10:00:00", created_at=None):
+    conn = sqlite3.connect(sync.DB_PATH)
+    conn.execute(
+        """INSERT INTO leads (id, name, email, phone, source, status, created_at, updated_at)
+           VALUES (?, ?, ?, '', 'GODADDY', ?, ?, ?)
+           ON CONFLICT(id) DO UPDATE SET status = excluded.status, updated_at = excluded.updated_at""",
+        (lead_id, f"Lead {lead_id}", f"{lead_id}@example.com", status, created_at or updated_at, updated_at),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _sheet_rows(sync):
+    ws = openpyxl.load_workbook(sync.SPREADSHEET_PATH)[sync.SHEET_NAME]
+    return {
+        row[sync.COL["email"]].value: (row[0].row, row[sync.COL["status"]].value)
+        for row in ws.iter_rows(min_row=2)
+        if row[sync.COL["email"]].value
+    }
+
+
+def test_first_sync_creates_the_spreadsheet_and_a_rerun_is_a_no_op(sync):
+    _upsert(sync, "a", created_at="2026-03-01T09:00:00")
+    _upsert(sync, "b", created_at="2026-03-02T09:00:00")
+
+    created = sync.sync_to_spreadsheet()
+    assert (created["mode"], created["written"]) == ("full", 2)
+    # Newest first under the header row
+    assert _sheet_rows(sync) == {"b@example.com": (2, "Awaiting Response"), "a@example.com": (3, "Awaiting Response")}
+
+    signature = sync._spreadsheet_signature()
+    rerun = sync.sync_to_spreadsheet()
+    assert (rerun["mode"], rerun["written"]) == ("incremental", 0)
+    assert sync._spreadsheet_signature() == signature
+
+
+def test_changed_lead_is_rewritten_in_place(sync):
+    _upsert(sync, "a", created_at="2026-03-01T09:00:00")
+    _upsert(sync, "b", created_at="2026-03-02T09:00:00")
+    sync.sync_to_spreadsheet()
+
+    _upsert(sync, "a", status="PROGRAM_INFO_SENT", updated_at="2026-03-05T10:00:00")
+    result = sync.sync_to_spreadsheet()
+    assert (result["mode"], result["written"], result["added"]) == ("incremental", 1, 0)
+    assert _sheet_rows(sync)["a@example.com"] == (3, "Program Info Sent")
+
+
+def test_archived_lead_frees_its_row_for_the_next_new_lead(sync):
+    _upsert(sync, "a", created_at="2026-03-01T09:00:00")
+    _upsert(sync, "b", created_at="2026-03-02T09:00:00")
+    sync.sync_to_spreadsheet()
+
+    _upsert(sync, "b", status="ARCHIVED", updated_at="2026-03-05T10:00:00")
+    archived = sync.sync_to_spreadsheet()
+    assert (archived["mode"], archived["removed"]) == ("incremental", 1)
+    assert _sheet_rows(sync) == {"a@example.com": (3, "Awaiting Response")}
+
+    _upsert(sync, "c", updated_at="2026-03-06T10:00:00")
+    added = sync.sync_to_spreadsheet()
+    assert (added["mode"], added["added"]) == ("incremental", 1)
+    assert _sheet_rows(sync)["c@example.com"][0] == 2
+
+
+def test_edit_outside_the_sync_forces_a_full_rewrite(sync):
+    _upsert(sync, "a")
+    sync.sync_to_spreadsheet()
+
+    wb = openpyxl.load_workbook(sync.SPREADSHEET_PATH)
+    wb[sync.SHEET_NAME].cell(row=2, column=sync.COL["status"] + 1).value = "Edited by hand"
+    wb[sync.SHEET_NAME].cell(row=9, column=1).value = "stray note"
+    wb.save(sync.SPREADSHEET_PATH)
+
+    result = sync.sync_to_spreadsheet()
+    assert result["mode"] == "full"
+    assert _sheet_rows(sync) == {"a@example.com": (2, "Awaiting Response")}
+    assert openpyxl.load_workbook(sync.SPREADSHEET_PATH)[sync.SHEET_NAME].cell(row=9, column=1).value is None
+    assert sync.sync_to_spreadsheet()["mode"] == "incremental"
+
+
+def test_row_that_fails_to_write_is_left_out_of_the_row_map(sync, monkeypatch):
+    _upsert(sync, "a", created_at="2026-03-01T09:00:00")
+    sync.sync_to_spreadsheet()
+    _upsert(sync, "b", created_at="2026-03-02T09:00:00")
+
+    real_values = sync.lead_row_values
+
+    def failing_values(lead):
+        if lead["id"] == "b":
+            raise ValueError("bad cell value")
+        return real_values(lead)
+
+    monkeypatch.setattr(sync, "lead_row_values", failing_values)
+    result = sync.sync_to_spreadsheet(full=True)
+    assert (result["mode"], result["written"]) == ("full", 1)
+    state = sync.load_sync_state()
+    assert list(state["rows"]) == ["a"] and state["free_rows"] == [2]
+    assert _sheet_rows(sync) == {"a@example.com": (3, "Awaiting Response")}
+
+    # Still unmapped, so the next run writes it into the row it failed to fill
+    monkeypatch.setattr(sync, "lead_row_values", real_values)
+    retry = sync.sync_to_spreadsheet()
+    assert (retry["mode"], retry["added"]) == ("incremental", 1)
+    assert _sheet_rows(sync)["b@example.com"] == (2, "Awaiting Response")
+
+
+def test_draft_and_send_status_changes_reach_the_sheet(sync):
+    _upsert(sync, "a", created_at="2026-03-01T09:00:00")
+    _upsert(sync, "b", created_at="2026-03-02T09:00:00")
+    sync.sync_to_spreadsheet()
+
+    # The auto-reply stages update status on their own connection, just before the sync stage
+    conn = sqlite3.connect(sync.DB_PATH)
+    assert reply_generator.store_draft_response("a", "Thanks for reaching out.", conn=conn)
+    assert send_godaddy_reply.mark_sent("b", conn=conn)
+    conn.close()
+
+    result = sync.sync_to_spreadsheet()
+    assert (result["mode"], result["written"]) == ("incremental", 2)
+    assert _sheet_rows(sync) == {"b@example.com": (2, "Program Info Sent"), "a@example.com": (3, "Response Sent")}
@@ -0,0 +1,177 @@
+import os
+import sys
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from outbound_http import OutboundHTTP
+from webhooks import (
+    DeliveryPolicy, WebhookEmitter, WebhookEvent, WebhookOutbox, WebhookRegistry, WebhookSigner, payload_matches
+)
+
+
+class _SubscriberHandler(BaseHTTPRequestHandler):
+    """/ok/* answers 200, /slow/* after 0.4s, /down/* 503 and /reject/* 400"""
+
+    protocol_version = "HTTP/1.1"
+    received = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.received.append((self.path, self.headers.get("X-Webhook-Signature"), body))
+        if self.path.startswith("/slow"):
+            time.sleep(0.4)
+        status = 503 if self.path.startswith("/down") else 400 if self.path.startswith("/reject") else 200
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def subscriber():
+    _SubscriberHandler.received = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SubscriberHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _emitter(tmp_path, urls, **policy):
+    registry = WebhookRegistry(str(tmp_path / "registry.db"))
+    for url in urls:
+        registry.register(url, ["lead.new"])
+    policy = DeliveryPolicy(**{"timeout": 2, "base_delay": 0.01, "max_delay": 0.02, **policy})
+    outbox = WebhookOutbox(str(tmp_path / "outbox.db"))
+    return WebhookEmitter(registry, WebhookSigner("test-secret"), outbox=outbox, policy=policy, http=OutboundHTTP())
+
+
+def _event():
+    return WebhookEvent(event_type="lead.new", timestamp="2026-01-01T00:00:00", data={"lead_id": "L1"}, event_id="e1")
+
+
+def test_fan_out_is_concurrent_and_signs_the_exact_body(tmp_path, subscriber):
+    emitter = _emitter(tmp_path, [f"{subscriber}/slow/{i}" for i in range(4)])
+    started = time.monotonic()
+    result = emitter.emit(_event())
+    elapsed = time.monotonic() - started
+
+    assert result["delivered"] == 4
+    assert elapsed < 1.2  # four 0.4s subscribers in parallel, not back to back
+    signer = WebhookSigner("test-secret")
+    assert all(signer.verify(body.decode(), signature) for _, signature, body in _SubscriberHandler.received)
+    stats = emitter.stats()
+    assert stats["outbox"] == {"delivered": 4}
+    assert stats["subscribers"][f"{subscriber}/slow/0"]["success_rate"] == 1.0
+    assert stats["subscribers"][f"{subscriber}/slow/0"]["p50_ms"] >= 400
+    emitter.close()
+
+
+def test_failures_back_off_then_dead_letter(tmp_path, subscriber):
+    emitter = _emitter(tmp_path, [f"{subscriber}/down", f"{subscriber}/reject", f"{subscriber}/ok"], max_attempts=3)
+    emitter._ensure_retry_loop = lambda: None  # drive retries by hand
+    result = emitter.emit(_event())
+    outcomes = {r["url"].rsplit("/", 1)[-1]: r["outcome"] for r in result["results"]}
+    assert outcomes == {"down": "pending", "reject": "dead", "ok": "delivered"}
+
+    for _ in range(2):
+        time.sleep(0.05)
+        assert emitter.retry_due() == 1
+
+    dead = {d["url"].rsplit("/", 1)[-1]: d for d in emitter.outbox.dead_letters()}
+    assert dead["down"]["attempts"] == 3
+    assert dead["down"]["last_status_code"] == 503
+    assert dead["reject"]["attempts"] == 1
+    assert [a["status_code"] for a in emitter.outbox.attempts(dead["down"]["id"])] == [503, 503, 503]
+    down = emitter.stats()["subscribers"][f"{subscriber}/down"]
+    assert (down["attempts"], down["failures"], down["dead_lettered"]) == (3, 3, 1)
+
+    assert emitter.outbox.requeue(dead["down"]["id"])
+    assert emitter.retry_due() == 1
+    assert len(emitter.outbox.attempts(dead["down"]["id"])) == 4
+    emitter.close()
+
+
+def test_first_attempt_left_waiting_past_its_lease_is_not_sent_twice(tmp_path, subscriber):
+    emitter = _emitter(tmp_path, [f"{subscriber}/ok"])
+    emitter._ensure_retry_loop = lambda: None
+    # As if the first attempt sat in the pool queue until its lease expired
+    [stale] = emitter.outbox.enqueue(_event(), [f"{subscriber}/ok"], "{}", "sig", lease=0)
+    assert emitter.outbox.counts() == {"in_flight": 1}
+
+    assert emitter.retry_due() == 1  # the retry loop takes the expired claim over
+    assert emitter._attempt(stale)["outcome"] == "reclaimed"
+    assert len(_SubscriberHandler.received) == 1
+    assert emitter.outbox.counts() == {"delivered": 1}
+
+
+def test_in_flight_deliveries_are_skipped_until_their_lease_expires(tmp_path):
+    outbox = WebhookOutbox(str(tmp_path / "outbox.db"))
+    [delivery] = outbox.enqueue(_event(), ["https://a.example/hook"], "{}", "sig", lease=60)
+    assert outbox.claim_due(limit=10, lease=60) == []
+    assert outbox.start_attempt(delivery["id"], delivery["claim_token"], lease=60)
+
+    outbox.record_attempt(delivery["id"], 1, 503, 0.01, "HTTP 503", "pending", next_attempt_at=time.time())
+    [claimed] = outbox.claim_due(limit=10, lease=60)
+    assert outbox.claim_due(limit=10, lease=60) == []
+    assert not outbox.start_attempt(delivery["id"], delivery["claim_token"], lease=60)
+    assert outbox.start_attempt(claimed["id"], claimed["claim_token"], lease=60)
+
+
+def test_backoff_grows_exponentially_with_jitter():
+    policy = DeliveryPolicy(base_delay=2, max_delay=60)
+    for attempt, ceiling in ((1, 2), (2, 4), (3, 8), (10, 60)):
+        delays = [policy.backoff(attempt) for _ in range(50)]
+        assert all(ceiling / 2 <= d <= ceiling for d in delays)
+        assert len(set(delays)) > 1
+
+
+def test_registry_is_shared_between_instances_and_cache_invalidates(tmp_path):
+    first = WebhookRegistry(str(tmp_path / "registry.db"), check_interval=0)
+    second = WebhookRegistry(str(tmp_path / "registry.db"), check_interval=0)
+    first.register("https://a.example/hook", ["lead.new"])
+    assert second.get_webhooks_for_event("lead.new") == ["https://a.example/hook"]
+
+    first.register("https://b.example/hook", ["lead.new", "alert.new"])
+    first.register("https://a.example/hook", ["lead.new"])  # idempotent
+    assert second.get_webhooks_for_event("lead.new") == ["https://a.example/hook", "https://b.example/hook"]
+    second.unregister("https://a.example/hook")
+    assert first.get_webhooks_for_event("lead.new") == ["https://b.example/hook"]
+    assert first.list_all() == {"alert.new": ["https://b.example/hook"], "lead.new": ["https://b.example/hook"]}
+
+
+def test_env_webhook_url_is_only_added_when_missing(tmp_path, monkeypatch):
+    monkeypatch.setenv("WEBHOOK_URL", "https://env.example/hook")
+    first = WebhookRegistry(str(tmp_path / "registry.db"), check_interval=0)
+    first.register("https://env.example/hook", ["lead.new"], filters={"source": "website"})
+    assert first.get_webhooks_for_event("lead.new", {"source": "website"}) == ["https://env.example/hook"]
+    version = first._version
+
+    # Another worker starting up must neither reset the filters nor invalidate caches
+    WebhookRegistry(str(tmp_path / "registry.db"), check_interval=0)
+    assert first.get_webhooks_for_event("lead.new", {"source": "phone"}) == []
+    assert first._version == version
+
+
+def test_subscriber_filters_select_on_event_data(tmp_path):
+    registry = WebhookRegistry(str(tmp_path / "registry.db"))
+    registry.register("https://all.example/hook", ["lead.new"])
+    registry.register("https://web.example/hook", ["lead.new"], filters={"source": ["website", "referral"]})
+    registry.register("https://vip.example/hook", ["lead.new"], filters={"lead.tier": "vip"})
+
+    assert registry.get_webhooks_for_event("lead.new", {"source": "website"}) == [
+        "https://all.example/hook", "https://web.example/hook"]
+    assert registry.get_webhooks_for_event("lead.new", {"source": "other", "lead": {"tier": "vip"}}) == [
+        "https://all.example/hook", "https://vip.example/hook"]
+    assert len(registry.get_webhooks_for_event("lead.new")) == 3
+    assert payload_matches(None, {}) and not payload_matches({"a": 1}, None)
+    with pytest.raises(ValueError):
+        registry.register("https://bad.example/hook", ["lead.new"], filters=["source"])
@@ -1,14 +1,35 @@
-"""Webhook Management and Event Emitter for Trifecta AI Agent"""
+"""Webhook Management and Event Emitter for Trifecta AI Agent
+
+Subscriptions live in SQLite (WebhookRegistry) so every worker shares them.
+Every delivery (one event to one subscriber URL) is written to a SQLite
+outbox before it is attempted, together with a row per attempt. The first
+attempt for each subscriber runs concurrently over pooled keep-alive sessions;
+failures are retried by a background loop with exponential backoff plus
+jitter and dead-lettered after `max_attempts`. Rejections that retrying
+cannot fix (4xx other than 408/429) are dead-lettered straight away.
+"""
 import os
 import json
 import hmac
+import time
+import uuid
+import random
+import sqlite3
 import hashlib
+import threading
 import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
 from datetime import datetime
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 
+from outbound_http import get_http
+
+# Same data directory as the lead DB: /home/data survives redeploys on Azure App Service
+_DEFAULT_DB_DIR = '/home/data' if os.environ.get('WEBSITE_SITE_NAME') else os.path.dirname(os.path.abspath(__file__))
+
 # Event Types
 class EventType(Enum):
     """Supported webhook event types"""
@@ -35,34 +56,140 @@ class WebhookEvent:
         return asdict(self)
 
 
+def _lookup(data: Any, path: str) -> Any:
+    """Resolve a dotted path ("lead.source") in a nested payload; a missing key gives None."""
+    for part in path.split('.'):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(part)
+    return data
+
+
+def payload_matches(filters: Optional[Dict[str, Any]], data: Optional[Dict[str, Any]]) -> bool:
+    """True when every filter matches: {"source": "website", "program": ["28-day", "14-day"]}.
+
+    A list means "any of these values". Keys may be dotted paths into nested data.
+    """
+    if not filters:
+        return True
+    for path, expected in filters.items():
+        actual = _lookup(data or {}, path)
+        if isinstance(expected, list):
+            if actual not in expected:
+                return False
+        elif actual != expected:
+            return False
+    return True
+
+
 class WebhookRegistry:
-    """In-memory webhook URL registry"""
+    """SQLite-backed webhook subscriptions, cached per event type
+
+    Subscriptions are rows keyed on (url, event_type), indexed by event type,
+    so every worker process sees the same set. Lookups are served from an
+    in-memory cache that is dropped on local writes, and when another process
+    has bumped the registry version (checked at most every `check_interval`
+    seconds).
+    """
     
-    def __init__(self):
-        self.webhooks: Dict[str, List[str]] = {}
+    def __init__(self, db_path: Optional[str] = None, check_interval: Optional[float] = None, timeout: float = 5.0):
+        self.db_path = db_path or os.environ.get('WEBHOOK_REGISTRY_DB', os.path.join(_DEFAULT_DB_DIR, 'webhook_registry.db'))
+        self.check_interval = check_interval if check_interval is not None else float(
+            os.environ.get('WEBHOOK_REGISTRY_CHECK_SECONDS', '1'))
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._cache: Dict[str, List[Dict[str, Any]]] = {}
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        with self._conn() as conn:
+            conn.executescript(
+                """CREATE TABLE IF NOT EXISTS webhook_subscriptions (
+                    url TEXT NOT NULL,
+                    event_type TEXT NOT NULL,
+                    filters TEXT,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (url, event_type)
+                );
+                CREATE INDEX IF NOT EXISTS idx_webhook_subscriptions_event ON webhook_subscriptions(event_type);
+                CREATE TABLE IF NOT EXISTS webhook_registry_version (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    version INTEGER NOT NULL
+                );
+                INSERT OR IGNORE INTO webhook_registry_version (id, version) VALUES (1, 0);"""
+            )
         self._load_from_env()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
     
     def _load_from_env(self):
-        """Load webhook URLs from environment variables"""
+        """Subscribe WEBHOOK_URL to every event type it is not subscribed to yet
+
+        Existing rows (and filters set on them through the API) are left alone,
+        and the version only moves when something was added, so a worker start
+        does not drop every other worker's cache.
+        """
         webhook_url = os.environ.get('WEBHOOK_URL')
-        if webhook_url:
-            self.register(webhook_url)
+        if not webhook_url:
+            return
+        now = time.time()
+        with self._conn() as conn:
+            added = 0
+            for event_type in self.get_event_types():
+                added += conn.execute(
+                    "INSERT OR IGNORE INTO webhook_subscriptions (url, event_type, filters, created_at) VALUES (?, ?, NULL, ?)",
+                    (webhook_url, event_type, now)
+                ).rowcount
+            if added:
+                self._bump_version(conn)
+
+    def _bump_version(self, conn: sqlite3.Connection):
+        conn.execute("UPDATE webhook_registry_version SET version = version + 1 WHERE id = 1")
+        with self._lock:
+            self._cache.clear()
+            self._version = None
+
+    def _fresh_cache(self) -> Dict[str, List[Dict[str, Any]]]:
+        """The cache, emptied first if another process changed the registry since it was filled."""
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval or self._version is None:
+            version = self._conn().execute("SELECT version FROM webhook_registry_version WHERE id = 1").fetchone()[0]
+            with self._lock:
+                if version != self._version:
+                    self._cache.clear()
+                    self._version = version
+                self._checked_at = now
+        return self._cache
     
-    def register(self, webhook_url: str, event_types: Optional[List[str]] = None) -> Dict:
-        """Register a webhook URL for specific event types"""
+    def register(self, webhook_url: str, event_types: Optional[List[str]] = None,
+                 filters: Optional[Dict[str, Any]] = None) -> Dict:
+        """Register a webhook URL for specific event types (re-registering replaces its filters)"""
         if event_types is None:
             event_types = [e.value for e in EventType]
+        if filters is not None and not isinstance(filters, dict):
+            raise ValueError('filters must be an object of field -> value (or list of values)')
         
-        for event_type in event_types:
-            if event_type not in self.webhooks:
-                self.webhooks[event_type] = []
-            if webhook_url not in self.webhooks[event_type]:
-                self.webhooks[event_type].append(webhook_url)
+        encoded = json.dumps(filters, sort_keys=True) if filters else None
+        now = time.time()
+        with self._conn() as conn:
+            conn.executemany(
+                """INSERT INTO webhook_subscriptions (url, event_type, filters, created_at) VALUES (?, ?, ?, ?)
+                   ON CONFLICT(url, event_type) DO UPDATE SET filters = excluded.filters""",
+                [(webhook_url, event_type, encoded, now) for event_type in event_types]
+            )
+            self._bump_version(conn)
         
         return {
             "status": "registered",
             "webhook_url": webhook_url,
-            "event_types": event_types
+            "event_types": event_types,
+            "filters": filters or {}
         }
     
     def unregister(self, webhook_url: str, event_types: Optional[List[str]] = None) -> Dict:
@@ -70,23 +197,58 @@ class WebhookRegistry:
         if event_types is None:
             event_types = [e.value for e in EventType]
         
-        for event_type in event_types:
-            if event_type in self.webhooks and webhook_url in self.webhooks[event_type]:
-                self.webhooks[event_type].remove(webhook_url)
+        with self._conn() as conn:
+            conn.executemany(
+                "DELETE FROM webhook_subscriptions WHERE url = ? AND event_type = ?",
+                [(webhook_url, event_type) for event_type in event_types]
+            )
+            self._bump_version(conn)
         
         return {
             "status": "unregistered",
             "webhook_url": webhook_url,
             "event_types": event_types
         }
+
+    def subscribers(self, event_type: str) -> List[Dict[str, Any]]:
+        """Subscriptions ({url, filters}) for one event type, from the cache when it is current"""
+        cache = self._fresh_cache()
+        subs = cache.get(event_type)
+        if subs is None:
+            version = self._version
+            rows = self._conn().execute(
+                "SELECT url, filters FROM webhook_subscriptions WHERE event_type = ? ORDER BY created_at, url",
+                (event_type,)
+            ).fetchall()
+            subs = [{'url': url, 'filters': json.loads(filters) if filters else {}} for url, filters in rows]
+            with self._lock:
+                # Skip caching if a write invalidated the cache while we were reading
+                if version is not None and self._version == version:
+                    cache[event_type] = subs
+        return subs
     
-    def get_webhooks_for_event(self, event_type: str) -> List[str]:
-        """Get all registered webhooks for a specific event type"""
-        return self.webhooks.get(event_type, [])
+    def get_webhooks_for_event(self, event_type: str, data: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Get all registered webhooks for a specific event type (whose filters match `data`, if given)"""
+        subs = self.subscribers(event_type)
+        if data is None:
+            return [sub['url'] for sub in subs]
+        return [sub['url'] for sub in subs if payload_matches(sub['filters'], data)]
     
     def list_all(self) -> Dict:
         """List all registered webhooks"""
-        return self.webhooks
+        webhooks: Dict[str, List[str]] = {}
+        for event_type, url in self._conn().execute(
+                "SELECT event_type, url FROM webhook_subscriptions ORDER BY event_type, created_at, url"):
+            webhooks.setdefault(event_type, []).append(url)
+        return webhooks
+
+    def list_subscriptions(self) -> List[Dict[str, Any]]:
+        """Every (url, event_type) subscription with its filters"""
+        rows = self._conn().execute(
+            "SELECT url, event_type, filters, created_at FROM webhook_subscriptions ORDER BY url, event_type"
+        ).fetchall()
+        return [{'url': url, 'event_type': event_type, 'filters': json.loads(filters) if filters else {},
+                 'created_at': created_at} for url, event_type, filters, created_at in rows]
     
     def get_event_types(self) -> List[str]:
         """Get all available event types"""
@@ -114,17 +276,236 @@ class WebhookSigner:
         return hmac.compare_digest(expected_signature, signature)
 
 
+@dataclass
+class DeliveryPolicy:
+    """Timeout, concurrency and retry schedule for webhook deliveries"""
+    timeout: float = float(os.environ.get('WEBHOOK_TIMEOUT', '10'))
+    workers: int = int(os.environ.get('WEBHOOK_WORKERS', '8'))
+    max_attempts: int = int(os.environ.get('WEBHOOK_MAX_ATTEMPTS', '6'))
+    base_delay: float = float(os.environ.get('WEBHOOK_RETRY_BASE_SECONDS', '5'))
+    max_delay: float = float(os.environ.get('WEBHOOK_RETRY_MAX_SECONDS', '900'))
+    stats_window: int = 200  # latencies kept per subscriber
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to wait after failed attempt number `attempt` (1-based): capped exponential, half jittered."""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+
+def _retryable(status: Optional[int]) -> bool:
+    """Connection errors, timeouts, 408, 429 and 5xx may succeed later; other 4xx will not."""
+    return status is None or status in (408, 429) or status >= 500
+
+
+class WebhookOutbox:
+    """SQLite record of every delivery and attempt; the retry queue and dead-letter store"""
+
+    def __init__(self, db_path: str, timeout: float = 5.0):
+        self.db_path = db_path
+        self.timeout = timeout
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(
+                """CREATE TABLE IF NOT EXISTS webhook_deliveries (
+                    id TEXT PRIMARY KEY,
+                    event_id TEXT,
+                    event_type TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    signature TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL,
+                    claim_token TEXT,
+                    last_status_code INTEGER,
+                    last_error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_webhook_deliveries_due ON webhook_deliveries(status, next_attempt_at);
+                CREATE TABLE IF NOT EXISTS webhook_attempts (
+                    id INTEGER PRIMARY KEY,
+                    delivery_id TEXT NOT NULL,
+                    attempt INTEGER NOT NULL,
+                    attempted_at REAL NOT NULL,
+                    status_code INTEGER,
+                    latency_ms REAL,
+                    error TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_webhook_attempts_delivery ON webhook_attempts(delivery_id);"""
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, event: 'WebhookEvent', urls: List[str], payload: str, signature: str,
+                lease: float) -> List[Dict[str, Any]]:
+        """Record one delivery per URL, claimed ('in_flight') by the caller for its first attempt."""
+        now = time.time()
+        token = str(uuid.uuid4())
+        rows = [{
+            'id': str(uuid.uuid4()), 'event_id': event.event_id, 'event_type': event.event_type, 'url': url,
+            'payload': payload, 'signature': signature, 'attempts': 0, 'claim_token': token,
+        } for url in urls]
+        with self._conn() as conn:
+            conn.executemany(
+                """INSERT INTO webhook_deliveries (id, event_id, event_type, url, payload, signature, status,
+                       attempts, next_attempt_at, claim_token, created_at, updated_at)
+                   VALUES (:id, :event_id, :event_type, :url, :payload, :signature, 'in_flight', 0, :lease,
+                           :claim_token, :now, :now)""",
+                [{**row, 'lease': now + lease, 'now': now} for row in rows]
+            )
+        return rows
+
+    def claim_due(self, limit: int, lease: float) -> List[Dict[str, Any]]:
+        """Claim pending deliveries whose retry time has come.
+
+        Claimed rows go 'in_flight' under a new claim token until `lease`
+        seconds from now. In-flight rows are skipped until their lease runs
+        out, which only happens when the worker holding them died.
+        """
+        now = time.time()
+        token = str(uuid.uuid4())
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = [dict(r) for r in conn.execute(
+                """SELECT id, event_id, event_type, url, payload, signature, attempts FROM webhook_deliveries
+                   WHERE status IN ('pending', 'in_flight') AND next_attempt_at <= ?
+                   ORDER BY next_attempt_at LIMIT ?""",
+                (now, limit)
+            ).fetchall()]
+            conn.executemany(
+                "UPDATE webhook_deliveries SET status = 'in_flight', next_attempt_at = ?, claim_token = ? WHERE id = ?",
+                [(now + lease, token, row['id']) for row in rows]
+            )
+        for row in rows:
+            row['claim_token'] = token
+        return rows
+
+    def start_attempt(self, delivery_id: str, claim_token: str, lease: float) -> bool:
+        """Renew the lease as the attempt starts. False if the claim was lost (re-claimed after expiring)."""
+        with self._conn() as conn:
+            updated = conn.execute(
+                """UPDATE webhook_deliveries SET next_attempt_at = ?
+                   WHERE id = ? AND claim_token = ? AND status = 'in_flight'""",
+                (time.time() + lease, delivery_id, claim_token)
+            ).rowcount
+        return bool(updated)
+
+    def record_attempt(self, delivery_id: str, attempt: int, status_code: Optional[int], latency: float,
+                       error: Optional[str], outcome: str, next_attempt_at: Optional[float] = None):
+        """Log one attempt and move the delivery to `outcome` ('delivered', 'pending' or 'dead'), releasing its claim."""
+        now = time.time()
+        with self._conn() as conn:
+            conn.execute(
+                """INSERT INTO webhook_attempts (delivery_id, attempt, attempted_at, status_code, latency_ms, error)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (delivery_id, attempt, now, status_code, round(latency * 1000, 1), error)
+            )
+            conn.execute(
+                """UPDATE webhook_deliveries SET status = ?, attempts = ?, next_attempt_at = ?, claim_token = NULL,
+                       last_status_code = ?, last_error = ?, updated_at = ? WHERE id = ?""",
+                (outcome, attempt, next_attempt_at, status_code, error, now, delivery_id)
+            )
+
+    def next_due_at(self) -> Optional[float]:
+        row = self._conn().execute(
+            "SELECT MIN(next_attempt_at) FROM webhook_deliveries WHERE status IN ('pending', 'in_flight')").fetchone()
+        return row[0]
+
+    def dead_letters(self, limit: int = 50) -> List[Dict[str, Any]]:
+        rows = self._conn().execute(
+            """SELECT id, event_id, event_type, url, attempts, last_status_code, last_error, created_at, updated_at
+               FROM webhook_deliveries WHERE status = 'dead' ORDER BY updated_at DESC LIMIT ?""", (limit,)
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def attempts(self, delivery_id: str) -> List[Dict[str, Any]]:
+        rows = self._conn().execute(
+            "SELECT attempt, attempted_at, status_code, latency_ms, error FROM webhook_attempts"
+            " WHERE delivery_id = ? ORDER BY id", (delivery_id,)).fetchall()
+        return [dict(r) for r in rows]
+
+    def requeue(self, delivery_id: str) -> bool:
+        """Give a dead-lettered delivery a fresh set of attempts, starting now."""
+        with self._conn() as conn:
+            updated = conn.execute(
+                """UPDATE webhook_deliveries SET status = 'pending', attempts = 0, next_attempt_at = ?, updated_at = ?
+                   WHERE id = ? AND status = 'dead'""", (time.time(), time.time(), delivery_id)
+            ).rowcount
+        return bool(updated)
+
+    def counts(self) -> Dict[str, int]:
+        rows = self._conn().execute("SELECT status, COUNT(*) FROM webhook_deliveries GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+
+@dataclass
+class SubscriberStats:
+    """Per-subscriber attempt outcomes and latencies in this process"""
+    attempts: int = 0
+    successes: int = 0
+    failures: int = 0
+    dead_lettered: int = 0
+    latencies: deque = field(default_factory=lambda: deque(maxlen=200))
+
+    def as_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+
+        def pct(p):
+            return round(ordered[min(len(ordered) - 1, int(p / 100.0 * len(ordered)))] * 1000, 1) if ordered else None
+
+        return {
+            'attempts': self.attempts,
+            'successes': self.successes,
+            'failures': self.failures,
+            'dead_lettered': self.dead_lettered,
+            'success_rate': round(self.successes / self.attempts, 4) if self.attempts else None,
+            'p50_ms': pct(50),
+            'p95_ms': pct(95),
+        }
+
+
 class WebhookEmitter:
-    """Emit webhook events to registered URLs"""
+    """Emit webhook events to registered URLs through the outbox"""
     
-    def __init__(self, registry: WebhookRegistry, signer: WebhookSigner):
+    def __init__(self, registry: WebhookRegistry, signer: WebhookSigner, outbox: Optional[WebhookOutbox] = None,
+                 policy: Optional[DeliveryPolicy] = None, http=None):
         self.registry = registry
         self.signer = signer
-        self.timeout = 10  # seconds
+        self.policy = policy or DeliveryPolicy()
+        self.timeout = self.policy.timeout  # seconds
+        self.outbox = outbox or WebhookOutbox(
+            os.environ.get('WEBHOOK_OUTBOX_DB', os.path.join(_DEFAULT_DB_DIR, 'webhook_outbox.db')))
+        self.http = http or get_http()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, self.policy.workers), thread_name_prefix='webhook')
+        self._stats: Dict[str, SubscriberStats] = {}
+        self._stats_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._retry_thread: Optional[threading.Thread] = None
+
+    @property
+    def _lease(self) -> float:
+        # Renewed when an attempt starts, and long enough that a running attempt finishes within it
+        return self.policy.timeout * 3 + 5
     
-    def emit(self, event: WebhookEvent) -> Dict[str, Any]:
-        """Emit a webhook event to all registered URLs"""
-        webhooks = self.registry.get_webhooks_for_event(event.event_type)
+    def emit(self, event: WebhookEvent, wait: bool = True) -> Dict[str, Any]:
+        """Emit a webhook event to all registered URLs
+
+        First attempts run concurrently. With wait=True the call returns once
+        they have all finished (so at most about one timeout), otherwise it
+        returns as soon as the deliveries are in the outbox.
+        """
+        webhooks = self.registry.get_webhooks_for_event(event.event_type, event.data)
         
         if not webhooks:
             return {
@@ -135,33 +516,19 @@ class WebhookEmitter:
         
         payload = json.dumps(event.to_dict())
         signature = self.signer.sign(payload)
-        
-        results = []
-        for webhook_url in webhooks:
-            try:
-                response = requests.post(
-                    webhook_url,
-                    json=event.to_dict(),
-                    headers={
-                        "X-Webhook-Signature": signature,
-                        "X-Webhook-Event": event.event_type,
-                        "Content-Type": "application/json"
-                    },
-                    timeout=self.timeout
-                )
-                results.append({
-                    "url": webhook_url,
-                    "status": response.status_code,
-                    "success": response.status_code < 400
-                })
-            except requests.RequestException as e:
-                results.append({
-                    "url": webhook_url,
-                    "status": "error",
-                    "error": str(e),
-                    "success": False
-                })
-        
+        deliveries = self.outbox.enqueue(event, webhooks, payload, signature, self._lease)
+        futures = [self._pool.submit(self._attempt, delivery) for delivery in deliveries]
+
+        if not wait:
+            return {
+                "status": "queued",
+                "event_type": event.event_type,
+                "total": len(deliveries),
+                "delivery_ids": [d['id'] for d in deliveries]
+            }
+
+        wait_futures(futures)
+        results = [future.result() for future in futures]
         return {
             "status": "emitted",
             "event_type": event.event_type,
@@ -170,6 +537,128 @@ class WebhookEmitter:
             "results": results
         }
 
+    def _attempt(self, delivery: Dict[str, Any]) -> Dict[str, Any]:
+        """POST one delivery once and record the outcome (delivered, retry later or dead)."""
+        attempt = delivery['attempts'] + 1
+        url = delivery['url']
+        if not self.outbox.start_attempt(delivery['id'], delivery['claim_token'], self._lease):
+            # Sat in the pool queue past its lease and was claimed again by the retry loop
+            return {"url": url, "delivery_id": delivery['id'], "status": "reclaimed", "success": False,
+                    "attempt": attempt, "outcome": "reclaimed"}
+        status_code, error = None, None
+        started = time.perf_counter()
+        try:
+            response = self.http.post(
+                url,
+                data=delivery['payload'].encode('utf-8'),  # the exact bytes that were signed
+                headers={
+                    "X-Webhook-Signature": delivery['signature'],
+                    "X-Webhook-Event": delivery['event_type'],
+                    "X-Webhook-Delivery": delivery['id'],
+                    "X-Webhook-Attempt": str(attempt),
+                    "Content-Type": "application/json"
+                },
+                timeout=self.policy.timeout
+            )
+            status_code = response.status_code
+            if status_code >= 400:
+                error = f"HTTP {status_code}"
+        except requests.RequestException as e:
+            error = str(e)
+        latency = time.perf_counter() - started
+
+        success = error is None
+        next_attempt_at = None
+        if success:
+            outcome = 'delivered'
+        elif _retryable(status_code) and attempt < self.policy.max_attempts:
+            outcome = 'pending'
+            next_attempt_at = time.time() + self.policy.backoff(attempt)
+        else:
+            outcome = 'dead'
+        self.outbox.record_attempt(delivery['id'], attempt, status_code, latency, error, outcome, next_attempt_at)
+        self._observe(url, success, latency, outcome == 'dead')
+        if outcome == 'pending':
+            self._ensure_retry_loop()
+            self._wake.set()
+
+        result = {
+            "url": url,
+            "delivery_id": delivery['id'],
+            "status": status_code if status_code is not None else "error",
+            "success": success,
+            "attempt": attempt,
+            "outcome": outcome
+        }
+        if error and status_code is None:
+            result["error"] = error
+        return result
+
+    def _observe(self, url: str, success: bool, latency: float, dead: bool):
+        with self._stats_lock:
+            stats = self._stats.get(url)
+            if stats is None:
+                stats = self._stats[url] = SubscriberStats(latencies=deque(maxlen=self.policy.stats_window))
+            stats.attempts += 1
+            stats.latencies.append(latency)
+            if success:
+                stats.successes += 1
+            else:
+                stats.failures += 1
+            if dead:
+                stats.dead_lettered += 1
+
+    def retry_due(self) -> int:
+        """Attempt every delivery whose backoff has elapsed; returns how many were attempted."""
+        due = self.outbox.claim_due(limit=max(1, self.policy.workers) * 4, lease=self._lease)
+        if due:
+            wait_futures([self._pool.submit(self._attempt, delivery) for delivery in due])
+        return len(due)
+
+    def _ensure_retry_loop(self):
+        if self._retry_thread is None:
+            with self._stats_lock:
+                if self._retry_thread is None:
+                    self._retry_thread = threading.Thread(target=self._retry_loop, name='webhook-retry', daemon=True)
+                    self._retry_thread.start()
+
+    def _retry_loop(self):
+        while not self._stop.is_set():
+            # Cleared before looking at the outbox, so a wake-up from a new failure is never lost
+            self._wake.clear()
+            try:
+                if self.retry_due():
+                    continue
+                next_due = self.outbox.next_due_at()
+            except Exception:
+                next_due = None
+            # Sleep until the earliest retry is due (re-checked at least every 30s for other workers' rows)
+            delay = 30.0 if next_due is None else min(30.0, max(0.05, next_due - time.time()))
+            self._wake.wait(delay)
+
+    def start(self):
+        """Start the retry loop now, e.g. to resume deliveries left pending by a restart."""
+        self._ensure_retry_loop()
+
+    def notify(self):
+        """Wake the retry loop to look at the outbox now (e.g. after a requeue)."""
+        self._ensure_retry_loop()
+        self._wake.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            subscribers = {url: stats.as_dict() for url, stats in self._stats.items()}
+        return {
+            'outbox': self.outbox.counts(),
+            'max_attempts': self.policy.max_attempts,
+            'subscribers': subscribers,
+        }
+
+    def close(self):
+        self._stop.set()
+        self._wake.set()
+        self._pool.shutdown(wait=False)
+
 
 # Global instances
 _registry: Optional[WebhookRegistry] = None
@@ -198,4 +687,5 @@ def get_emitter() -> WebhookEmitter:
     global _emitter
     if _emitter is None:
         _emitter = WebhookEmitter(get_registry(), get_signer())
+        _emitter.start()
     return _emitter